@@ -1,3 +1,4 @@
+from concurrent.futures import Future
 from typing import Optional, Callable, Union
 
 import panel
@@ -24,7 +25,18 @@ class CorpusLoader(Viewer):
                  include_meta_loader: bool = False,
                  include_oni_loader: bool = False,
                  build_dtms: bool = False,
-                 run_logger: bool = False, **params):
+                 run_logger: bool = False,
+                 use_mmap: bool = False,
+                 file_cache_size: Optional[int] = None,
+                 watch_files: bool = False,
+                 index_cache_dir: Optional[str] = None,
+                 parse_executor: str = 'serial',
+                 max_workers: Optional[int] = None,
+                 reuse_parsed_files: bool = False,
+                 spill_dir: Optional[str] = None,
+                 memory_budget: Optional[int] = None,
+                 string_storage: str = 'python',
+                 deduplication: str = 'none', **params):
         """
         :param root_directory: The root directory that the file selector will search for files to load. The argument must be a string. The directory may be non-existent at initialisation time, but no files will be displayed until it exists.
         :type root_directory: str
@@ -36,10 +48,35 @@ class CorpusLoader(Viewer):
         :type build_dtms: bool
         :param run_logger: If True, a log will be kept in the atap_corpus_loader directory. False by default
         :type run_logger: bool
+        :param use_mmap: If True, files on disk will be memory mapped when read rather than copied into memory. Reduces peak memory usage when loading large files. False by default
+        :type use_mmap: bool
+        :param file_cache_size: The maximum number of file references kept in the file cache. Loaded files are never evicted from the cache. If None, the cache is unbounded. None by default
+        :type file_cache_size: Optional[int]
+        :param watch_files: If True, the root directory is watched for changes in the background (using inotify where available) and the file selector is only refreshed when files are added, removed, or modified. If a directory cannot be watched, such as when the inotify watch limit is reached, the directories are instead checked for changes on each refresh. False by default
+        :type watch_files: bool
+        :param index_cache_dir: If provided, the directory listings and zip archive contents found under root_directory are persisted in an index within this directory. New sessions using the same directory only validate the persisted index rather than re-reading the whole tree. The directory can be shared between users and processes. None by default
+        :type index_cache_dir: Optional[str]
+        :param parse_executor: The way in which files are parsed when loading files and building a corpus. 'serial' parses files one at a time, 'thread' parses files in parallel using a pool of threads, and 'process' parses files in parallel using a pool of processes, which is fastest for CPU-bound formats such as DOCX and ODT. The order of documents in the corpus is the same for all options. 'serial' by default
+        :type parse_executor: str
+        :param max_workers: The number of threads or processes used when parse_executor is 'thread' or 'process'. If None, the number of CPUs is used. None by default
+        :type max_workers: Optional[int]
+        :param reuse_parsed_files: If True, the parsed contents of the files used to build a corpus are kept in memory, so that building again only parses the files that have been added or changed, or whose selected data labels or data types have changed. The kept contents are a second copy of the parsed files held in addition to the built corpus, so enabling this roughly doubles the memory used by each build. The memory of the kept contents is reported by get_memory_usage and counted against memory_budget. If memory_budget is provided, the kept contents are limited to the budget left by the built corpora after each build, and the least recently used files are dropped first. Otherwise, the kept contents are not bounded. False by default
+        :type reuse_parsed_files: bool
+        :param spill_dir: If provided, corpora are built out-of-core: the parsed corpus files are streamed to Arrow files within this directory in chunks and joined with the metadata chunk by chunk, so the parsed files and the linked rows are never all held in memory while the files are read. The metadata files are read into memory. The built corpus is still held in memory: creating it copies the memory mapped result and converts each document to a Python string, so the corpus must fit in memory and the documents are briefly held twice while it is created. Requires the pyarrow package, which is installed with the arrow extra. Parsed files are not reused when building out-of-core. None by default
+        :type spill_dir: Optional[str]
+        :param memory_budget: If provided, the maximum bytes of memory used by the corpora built in this session. Before each build, the memory used by the built corpora and any parsed files kept for reuse is added to an estimate of the memory of the new corpus made from the size of the loaded files. A build that would exceed the budget is built out-of-core if spill_dir is provided, and is refused otherwise. When both are provided, builds within the budget are built in memory. None by default
+        :type memory_budget: Optional[int]
+        :param string_storage: The storage used for the values of text columns, including the document column. 'python' stores each value as a Python string, while 'pyarrow' stores the values of each column in contiguous Arrow buffers, which avoids the overhead of a Python object per value in the built corpus. Files are still parsed into Python strings before being converted, so 'pyarrow' raises the peak memory used while building a corpus and only modestly reduces the memory held by the built corpus. 'pyarrow' requires the pyarrow package, which is installed with the arrow extra. 'python' by default
+        :type string_storage: str
+        :param deduplication: The way in which duplicate documents are handled when building a corpus. 'none' keeps all documents. 'drop' skips corpus files whose contents are the same as an earlier file of the same type without parsing them, and removes rows whose document is the same as an earlier row, e.g. repeated rows of a CSV file. 'flag' keeps all documents and adds a 'duplicate' data label that is True for each document that is the same as an earlier document. The first of each set of duplicates is kept. 'none' by default
+        :type deduplication: str
         :param params: passed onto the panel.viewable.Viewer super-class
         """
         super().__init__(**params)
-        self.controller: Controller = Controller(root_directory, build_dtms, run_logger)
+        self.controller: Controller = Controller(root_directory, build_dtms, run_logger, use_mmap, file_cache_size,
+                                                watch_files, index_cache_dir, parse_executor, max_workers,
+                                                reuse_parsed_files, spill_dir, memory_budget, string_storage,
+                                                deduplication)
         self.view: ViewWrapperWidget = ViewWrapperWidget(self.controller, include_meta_loader, include_oni_loader)
 
     def __panel__(self):
@@ -82,6 +119,57 @@ class CorpusLoader(Viewer):
         """
         self.controller.trigger_event(event_type, *callback_args)
 
+    def build_corpus_async(self, corpus_name: str) -> Future:
+        """
+        Builds a corpus from the loaded files and the selected headers on a worker thread, so a long build does not block
+        the Panel server. Progress is shown by the build progress bar and the BUILD event is triggered when the corpus is
+        built. Only one build runs at a time, and a running build can be stopped using cancel_build.
+        :param corpus_name: the name of the corpus to build
+        :return: a Future holding True if the corpus was built and False otherwise
+        :rtype: Future
+        """
+        return self.controller.build_corpus_async(corpus_name)
+
+    def cancel_build(self) -> bool:
+        """
+        Stops the build started by build_corpus_async before it parses its next file or chunk. The loaded files are left
+        unchanged, so the corpus can be built again.
+        :return: True if a build was running and has been asked to stop, False otherwise
+        :rtype: bool
+        """
+        return self.controller.cancel_build()
+
+    def is_building(self) -> bool:
+        """
+        A corpus cannot be built while another build is running, and files cannot be loaded or unloaded during a build.
+        :return: True if a corpus is being built, False otherwise
+        :rtype: bool
+        """
+        return self.controller.is_building()
+
+    def close(self):
+        """
+        Shuts down the workers used to infer the headers of loaded files and stops watching the root directory for
+        changes. The loader can still be used afterwards, in which case the workers are created again when needed, but
+        the root directory is no longer watched.
+        """
+        self.controller.close()
+
+    def build_preview(self, sample_rows: int = 100, sample_files: int = 100) -> Optional[DataFrameCorpus]:
+        """
+        Builds a small corpus from a sample of the loaded files using the selected headers, datatypes, and link, so
+        mistakes in the selections can be found before a full build. The first sample_rows rows of each tabular file are
+        read, along with a sample of sample_files of the single document files. The same files are sampled each time.
+        The preview corpus is not added to the built corpora and does not trigger the BUILD event.
+        :param sample_rows: the maximum number of rows read from each tabular file. 100 by default
+        :type sample_rows: int
+        :param sample_files: the maximum number of single document files read. 100 by default
+        :type sample_files: int
+        :return: the preview corpus, or None if it could not be built
+        :rtype: Optional[DataFrameCorpus]
+        """
+        return self.controller.build_preview(sample_rows, sample_files)
+
     def get_latest_corpus(self) -> Optional[DataFrameCorpus]:
         """
         :return: the last DataFrameCorpus object that was built. If none have been built, returns None.
@@ -115,6 +203,48 @@ class CorpusLoader(Viewer):
         """
         return self.controller.get_mutable_corpora()
 
+    def get_file_cache_stats(self) -> dict[str, Optional[int]]:
+        """
+        Returns the statistics of the file reference cache of the active loader, which can be used to tune file_cache_size.
+        The dictionary contains the keys 'size', 'max_size', 'hits', 'misses', and 'evictions'.
+        :return: a dictionary of the file cache statistics
+        :rtype: dict[str, Optional[int]]
+        """
+        return self.controller.get_file_cache_stats()
+
+    def get_memory_usage(self) -> dict[str, int]:
+        """
+        Returns the deep memory usage of each built corpus, including its DTMs. A corpus cloned from another corpus
+        shares the data of its root corpus, so only the memory of its mask is counted.
+        If reuse_parsed_files is True, the memory of the parsed files kept for reuse is included under the key
+        '_parsed_file_cache'.
+        :return: a dictionary that maps corpus names to their memory usage in bytes
+        :rtype: dict[str, int]
+        """
+        return self.controller.get_memory_usage()
+
+    def get_deduplication_report(self) -> Optional[dict]:
+        """
+        Returns the number of duplicate documents found by the most recent corpus build when deduplication is enabled.
+        The dictionary contains the keys 'mode', 'duplicate_files', and 'duplicate_rows'. 'duplicate_files' is the number
+        of corpus files skipped before parsing, and 'duplicate_rows' is the number of rows removed or flagged after parsing.
+        :return: a dictionary of the duplicates found, or None if the most recent build did not deduplicate
+        :rtype: Optional[dict]
+        """
+        return self.controller.get_deduplication_report()
+
+    def get_build_metrics(self) -> Optional[dict]:
+        """
+        Returns the metrics of the most recent corpus build, which may still be in progress, for diagnosing slow builds.
+        The dictionary contains the keys 'total_seconds', 'stages', 'files_read', 'bytes_read', 'rows_produced', and
+        'files_per_second'. The 'stages' value maps the name of each stage of the build, e.g. 'parse_files', 'dtypes',
+        'link', 'rename', 'create_corpus', 'dtm', and 'callbacks', to a dictionary with the keys 'seconds' and 'count'.
+        The metrics of each build are also written to the log.
+        :return: a dictionary of the build metrics, or None if no corpus has been built
+        :rtype: Optional[dict]
+        """
+        return self.controller.get_build_metrics()
+
     def get_logs(self) -> str:
         """
         Returns the log history as read from the log file as a string.
@@ -1,23 +1,32 @@
 import logging
 import traceback
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
 from logging.handlers import RotatingFileHandler
 from io import BytesIO
 from os.path import abspath, join, dirname
-from typing import Optional, Callable, Literal, Union
+from threading import Event, Lock
+from time import sleep
+from typing import Optional, Callable, Literal, Union, Iterator
 
 import atap_corpus
 from atap_corpus._types import TCorpora
 from atap_corpus.corpus.corpus import DataFrameCorpus
+from bokeh.document import Document
 from pandas import DataFrame
+from panel import state
 from panel.widgets import Tqdm
 
 from atap_corpus_loader.controller.CorpusExportService import CorpusExportService
 from atap_corpus_loader.controller.GoogleDownloadService import GoogleDownloadService
 from atap_corpus_loader.controller.events import EventType, EventManager
 from atap_corpus_loader.controller.loader_service import LoaderService
+from atap_corpus_loader.controller.loader_service.BuildCancelledError import BuildCancelledError
 from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
 from atap_corpus_loader.controller.loader_service.FileLoaderService import FileLoaderService
-from atap_corpus_loader.controller.data_objects import FileReference, ViewCorpusInfo, CorpusHeader, DataType, UniqueNameCorpora
+from atap_corpus_loader.controller.data_objects import FileReference, ViewCorpusInfo, CorpusHeader, DataType, UniqueNameCorpora, \
+    FileFilter, LinkReport, BuildMetrics, DeduplicationReport, DeduplicationMode
+from atap_corpus_loader.controller.data_objects.BuildMetrics import measure_stage
 from atap_corpus_loader.controller.loader_service.OniLoaderService import OniLoaderService
 from atap_corpus_loader.controller.loader_service.file_loader_strategy.FileLoaderFactory import ValidFileType
 from atap_corpus_loader.view.notifications import NotifierService
@@ -25,6 +34,10 @@ from atap_corpus_loader.view.notifications import NotifierService
 
 class Controller:
     LOGGER_NAME: str = "corpus-loader"
+    # The key of the memory used by the parsed files kept for reuse in the result of get_memory_usage
+    PARSED_FILE_CACHE_KEY: str = "_parsed_file_cache"
+    # The seconds a link report requested by request_link_report waits for a newer request before it is computed
+    LINK_REPORT_DELAY: float = 0.3
     LOG_FILE_LOCATION: str = abspath(join(dirname(__file__), '..', 'log.txt'))
     """
     Provides methods for indirection between the corpus loading logic and the user interface
@@ -70,14 +83,32 @@ class Controller:
 
         return log_history
 
-    def __init__(self, root_directory: str, build_dtms: bool, run_logger: bool):
+    def __init__(self, root_directory: str, build_dtms: bool, run_logger: bool,
+                 use_mmap: bool = False, file_cache_size: Optional[int] = None, watch_files: bool = False,
+                 index_cache_dir: Optional[str] = None, parse_executor: str = 'serial',
+                 max_workers: Optional[int] = None, reuse_parsed_files: bool = False,
+                 spill_dir: Optional[str] = None, memory_budget: Optional[int] = None,
+                 string_storage: str = 'python', deduplication: str = 'none'):
         self.setup_logger(self.LOGGER_NAME, run_logger)
         self.build_dtms: bool = build_dtms
+        self.memory_budget: Optional[int] = memory_budget
 
-        self.file_loader_service: FileLoaderService = FileLoaderService(root_directory)
+        self.file_loader_service: FileLoaderService = FileLoaderService(root_directory, use_mmap, file_cache_size,
+                                                                        watch_files, index_cache_dir)
         self.oni_loader_service: OniLoaderService = OniLoaderService()
         self.google_download_service: GoogleDownloadService = GoogleDownloadService(root_directory)
         self.loader_service: LoaderService = self.file_loader_service
+        self.file_loader_service.set_executor_type(parse_executor, max_workers)
+        self.oni_loader_service.set_executor_type(parse_executor, max_workers)
+        # The parsed files kept for reuse can never use more memory than the budget
+        self.file_loader_service.set_reuse_parsed_files(reuse_parsed_files, memory_budget)
+        self.oni_loader_service.set_reuse_parsed_files(reuse_parsed_files, memory_budget)
+        self.file_loader_service.set_spill_directory(spill_dir)
+        self.oni_loader_service.set_spill_directory(spill_dir)
+        self.file_loader_service.set_string_storage(string_storage)
+        self.oni_loader_service.set_string_storage(string_storage)
+        self.file_loader_service.set_deduplication_mode(deduplication)
+        self.oni_loader_service.set_deduplication_mode(deduplication)
         self.corpus_export_service: CorpusExportService = CorpusExportService()
         self.notifier_service: NotifierService = NotifierService()
 
@@ -94,6 +125,21 @@ class Controller:
         self.build_tqdm = Tqdm(visible=False)
         self.export_tqdm = Tqdm(visible=False)
 
+        # Asynchronous builds run one at a time on a single worker thread, so they do not block the event loop
+        self.build_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="corpus-loader-build")
+        self.build_future: Optional[Future] = None
+        self.build_cancel_event: Optional[Event] = None
+        # Held while a build is submitted, so cancel_build cannot miss a build that has started but not been recorded
+        self.build_lock: Lock = Lock()
+        # Held while any build runs, so a synchronous build cannot run at the same time as another build
+        self.build_running_lock: Lock = Lock()
+        self.build_metrics: Optional[BuildMetrics] = None
+        # Link reports are computed on their own worker thread, so they do not block the event loop or wait for a build
+        self.link_report_executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1,
+                                                                           thread_name_prefix="corpus-loader-link-report")
+        # Incremented by each request_link_report call, so only the most recent request is computed and reported
+        self.link_report_generation: int = 0
+
     def display_error(self, error_msg: str):
         self.log(f"Error displayed: {error_msg}", logging.ERROR)
         self.notifier_service.notify_error(error_msg)
@@ -102,6 +148,10 @@ class Controller:
         self.log(f"Success displayed: {success_msg}", logging.INFO)
         self.notifier_service.notify_success(success_msg)
 
+    def display_info(self, info_msg: str):
+        self.log(f"Info displayed: {info_msg}", logging.INFO)
+        self.notifier_service.notify_info(info_msg)
+
     def register_event_callback(self, event_type: Union[str, EventType], callback: Callable, first: bool):
         self.event_manager.register_event_callback(event_type, callback, first)
 
@@ -136,6 +186,9 @@ class Controller:
             raise ValueError("loader_type specified must be either 'file' or 'oni'")
 
     def load_corpus_from_filepaths(self, filepath_ls: list[str], include_hidden: bool) -> bool:
+        if self.is_building():
+            self.display_error("Files cannot be loaded while a corpus is being built. Wait for the build to finish or cancel it")
+            return False
         self.log(f"Files loaded as corpus: {filepath_ls}", logging.DEBUG)
         self.build_tqdm.visible = True
         try:
@@ -153,6 +206,9 @@ class Controller:
         return True
 
     def load_meta_from_filepaths(self, filepath_ls: list[str], include_hidden: bool) -> bool:
+        if self.is_building():
+            self.display_error("Files cannot be loaded while a corpus is being built. Wait for the build to finish or cancel it")
+            return False
         self.log(f"Files loaded as meta: {filepath_ls}", logging.DEBUG)
         self.build_tqdm.visible = True
         try:
@@ -169,28 +225,62 @@ class Controller:
         self.build_tqdm.visible = False
         return True
 
-    def build_corpus(self, corpus_id: str) -> bool:
+    def build_corpus(self, corpus_id: str, cancel_event: Optional[Event] = None) -> bool:
+        if self.is_building():
+            self.display_error("A corpus is already being built. Wait for the build to finish or cancel it")
+            return False
+        return self._run_build(corpus_id, cancel_event)
+
+    def _run_build(self, corpus_id: str, cancel_event: Optional[Event]) -> bool:
+        if not self.build_running_lock.acquire(blocking=False):
+            self.display_error("A corpus is already being built. Wait for the build to finish or cancel it")
+            return False
+        try:
+            build_metrics: BuildMetrics = BuildMetrics()
+            self.build_metrics = build_metrics
+            with build_metrics.activate():
+                success: bool = self._build_corpus(corpus_id, cancel_event)
+            self.log(f"build_corpus method: {build_metrics}", logging.INFO)
+        finally:
+            self.build_running_lock.release()
+
+        return success
+
+    def _run_build_in_session(self, session_doc: Optional[Document], corpus_id: str, cancel_event: Event) -> bool:
+        """
+        Runs the build on the build worker thread within the Panel session that submitted it, so notifications are
+        shown to that session. Executed within a copy of the submitting context, so the session is not kept by the worker.
+        """
+        state.curdoc = session_doc
+        return self._run_build(corpus_id, cancel_event)
+
+    def _build_corpus(self, corpus_id: str, cancel_event: Optional[Event]) -> bool:
         self.log(f"build_corpus method: Building corpus with name: {corpus_id}", logging.DEBUG)
-        if self.is_meta_added():
-            if (self.corpus_link_header is None) or (self.meta_link_header is None):
-                self.display_error("Cannot build without link headers set. Select a corpus header and a meta header as linking headers in the dropdowns")
-                return False
         if self.corpora.get(corpus_id) is not None:
             # Check for name uniqueness before build process
             self.display_error(f"Corpus with name '{corpus_id}' already exists. Select a different name")
             return False
-        if self.text_header is None:
-            # Check that the text header has been set
-            self.display_error("No document label set. Select a document label from the dropdown.")
+        if not self._check_build_headers():
             return False
+        out_of_core: Optional[bool] = None
+        if self.memory_budget is not None:
+            out_of_core = self._get_budgeted_build_mode()
+            if out_of_core is None:
+                return False
 
         self.build_tqdm.visible = True
         try:
             corpus = self.loader_service.build_corpus(corpus_id, self.corpus_headers,
                                                       self.meta_headers, self.text_header,
                                                       self.corpus_link_header, self.meta_link_header,
-                                                      self.build_tqdm)
+                                                      self.build_tqdm, cancel_event, out_of_core)
             self.log("build_corpus method: corpus built", logging.DEBUG)
+            self._display_deduplication_report()
+        except BuildCancelledError as e:
+            self.log("build_corpus method: corpus build cancelled", logging.DEBUG)
+            self.display_info(str(e))
+            self.build_tqdm.visible = False
+            return False
         except FileLoadError as e:
             self.log("Exception while building corpus: " + traceback.format_exc(), logging.ERROR)
             self.display_error(str(e))
@@ -211,9 +301,15 @@ class Controller:
             self.build_tqdm.visible = False
             return False
 
+        if self.memory_budget is not None:
+            # The parsed files kept for reuse are limited to the budget left by the built corpora
+            budget_left: int = max(0, self.memory_budget - self.corpora.get_total_memory_usage())
+            self.loader_service.trim_parsed_file_cache(budget_left)
+
         if self.build_dtms:
             try:
-                corpus.add_dtm(atap_corpus.parts.dtm.DTM.from_docs_with_vectoriser(corpus.docs()), 'tokens')
+                with measure_stage('dtm'):
+                    corpus.add_dtm(atap_corpus.parts.dtm.DTM.from_docs_with_vectoriser(corpus.docs()), 'tokens')
                 self.log("build_corpus method: corpus dtm created", logging.DEBUG)
             except Exception as e:
                 self.log("Exception while building DTM: " + traceback.format_exc(), logging.ERROR)
@@ -221,14 +317,175 @@ class Controller:
                 self.build_tqdm.visible = False
                 return False
 
-        self.event_manager.trigger_callbacks(EventType.BUILD, corpus)
-        self.event_manager.trigger_callbacks(EventType.UPDATE)
+        with measure_stage('callbacks'):
+            self.event_manager.trigger_callbacks(EventType.BUILD, corpus)
+            self.event_manager.trigger_callbacks(EventType.UPDATE)
 
         self.build_tqdm.visible = False
         self.log("build_corpus method: corpus building complete", logging.DEBUG)
 
         return True
 
+    def _check_build_headers(self) -> bool:
+        """
+        Checks that the headers required to build a corpus have been selected, displaying an error if not.
+        :return: True if the corpus can be built with the selected headers, False otherwise
+        :rtype: bool
+        """
+        if self.is_meta_added():
+            if (self.corpus_link_header is None) or (self.meta_link_header is None):
+                self.display_error("Cannot build without link headers set. Select a corpus header and a meta header as linking headers in the dropdowns")
+                return False
+        if self.text_header is None:
+            # Check that the text header has been set
+            self.display_error("No document label set. Select a document label from the dropdown.")
+            return False
+        return True
+
+    def build_preview(self, sample_rows: int, sample_files: int) -> Optional[DataFrameCorpus]:
+        """
+        Builds a small corpus from a sample of the loaded files using the selected headers, without adding it to the
+        built corpora. Errors in the selected headers, e.g. a datatype the values cannot be cast to, are displayed as they
+        would be by build_corpus.
+        :param sample_rows: the maximum number of rows read from each tabular file
+        :param sample_files: the maximum number of single document files read
+        :return: the preview corpus, or None if it could not be built
+        :rtype: Optional[DataFrameCorpus]
+        """
+        self.log("build_preview method: Building corpus preview", logging.DEBUG)
+        if self.is_building():
+            self.display_error("A corpus is being built. Wait for the build to finish before previewing")
+            return None
+        if not self._check_build_headers():
+            return None
+
+        try:
+            preview_corpus: DataFrameCorpus = self.loader_service.build_preview(self.corpus_headers, self.meta_headers,
+                                                                                self.text_header,
+                                                                                self.corpus_link_header,
+                                                                                self.meta_link_header, self.build_tqdm,
+                                                                                sample_rows, sample_files)
+        except FileLoadError as e:
+            self.log("Exception while building corpus preview: " + traceback.format_exc(), logging.ERROR)
+            self.display_error(str(e))
+            return None
+        except Exception as e:
+            self.log("Exception while building corpus preview: " + traceback.format_exc(), logging.ERROR)
+            self.display_error(f"Unexpected error building corpus preview: {e}")
+            return None
+        self.log(f"build_preview method: preview built with {len(preview_corpus)} documents", logging.DEBUG)
+
+        return preview_corpus
+
+    def _get_budgeted_build_mode(self) -> Optional[bool]:
+        """
+        Compares the memory used by the built corpora and the estimated memory of the build with the memory budget.
+        A build that would exceed the budget is built out-of-core if a spill directory is set, and is refused otherwise.
+        :return: False if the build fits within the budget, True if it must be built out-of-core, or None if it is refused
+        :rtype: Optional[bool]
+        """
+        memory_used: int = self.corpora.get_total_memory_usage() + self._get_parsed_file_cache_memory_usage()
+        build_estimate: int = self.loader_service.estimate_build_memory()
+        self.log(f"build_corpus method: corpora memory usage: {memory_used} bytes, build estimate: {build_estimate} bytes, "
+                 f"memory budget: {self.memory_budget} bytes", logging.DEBUG)
+        if memory_used + build_estimate <= self.memory_budget:
+            return False
+        if self.loader_service.get_spill_directory() is not None:
+            self.log("build_corpus method: memory budget exceeded, building out-of-core", logging.INFO)
+            return True
+
+        self.display_error(f"Building this corpus would use an estimated {build_estimate / 1e6:.1f} MB of memory, "
+                           f"exceeding the memory budget of {self.memory_budget / 1e6:.1f} MB, of which "
+                           f"{memory_used / 1e6:.1f} MB is used by the built corpora and the parsed files kept for reuse. "
+                           f"Delete a corpus or load fewer files")
+        return None
+
+    def _display_deduplication_report(self):
+        deduplication_report: Optional[DeduplicationReport] = self.loader_service.get_deduplication_report()
+        if deduplication_report is None:
+            return
+        self.log(f"build_corpus method: {deduplication_report}", logging.INFO)
+        num_duplicates: int = deduplication_report.get_num_duplicates()
+        if num_duplicates == 0:
+            return
+        if deduplication_report.mode == DeduplicationMode.FLAG:
+            self.display_info(f"{num_duplicates} duplicate documents flagged")
+        else:
+            self.display_info(f"{num_duplicates} duplicate documents removed")
+
+    def get_deduplication_report(self) -> Optional[dict]:
+        deduplication_report: Optional[DeduplicationReport] = self.loader_service.get_deduplication_report()
+        if deduplication_report is None:
+            return None
+        return deduplication_report.to_dict()
+
+    def build_corpus_async(self, corpus_id: str) -> Future:
+        """
+        Builds the corpus on the build worker thread rather than the calling thread. Only one build runs at a time.
+        The progress of the build is shown by the build progress bar, and the BUILD event is triggered from the worker
+        thread once the corpus is built. The build runs within the Panel session of the caller, so its notifications are
+        shown to that session. The build can be stopped using cancel_build.
+        :param corpus_id: the name of the corpus to build
+        :return: a Future holding the result of build_corpus, True if the corpus was built and False otherwise
+        :rtype: Future
+        """
+        with self.build_lock:
+            if self.is_building():
+                self.display_error("A corpus is already being built. Wait for the build to finish or cancel it")
+                rejected_future: Future = Future()
+                rejected_future.set_result(False)
+                return rejected_future
+
+            self.build_cancel_event = Event()
+            self.build_future = self.build_executor.submit(copy_context().run, self._run_build_in_session,
+                                                           state.curdoc, corpus_id, self.build_cancel_event)
+            return self.build_future
+
+    def _is_building_async(self) -> bool:
+        return (self.build_future is not None) and (not self.build_future.done())
+
+    def is_building(self) -> bool:
+        return self._is_building_async() or self.build_running_lock.locked()
+
+    def cancel_build(self) -> bool:
+        """
+        Requests that the build started by build_corpus_async stops. The build stops before parsing its next file or
+        chunk and the loaded files are left unchanged.
+        :return: True if a build was running and has been asked to stop, False otherwise
+        :rtype: bool
+        """
+        with self.build_lock:
+            if not self._is_building_async():
+                return False
+            self.log("cancel_build method: cancelling corpus build", logging.DEBUG)
+            self.build_cancel_event.set()
+            return True
+
+    def close(self):
+        """
+        Releases the workers and file watcher held by the loader services. The loader can still be used afterwards, in
+        which case the workers are created again when needed.
+        """
+        self.log("close method: closing loader services", logging.DEBUG)
+        self.file_loader_service.close()
+        self.oni_loader_service.close()
+
+    def get_build_metrics(self) -> Optional[dict]:
+        if self.build_metrics is None:
+            return None
+        return self.build_metrics.to_dict()
+
+    def _get_parsed_file_cache_memory_usage(self) -> int:
+        return (self.file_loader_service.get_parsed_file_cache_memory_usage() +
+                self.oni_loader_service.get_parsed_file_cache_memory_usage())
+
+    def get_memory_usage(self) -> dict[str, int]:
+        memory_usage: dict[str, int] = {corpus.name: self.corpora.get_memory_usage(corpus.name)
+                                        for corpus in self.corpora.items()}
+        if self.loader_service.is_reusing_parsed_files():
+            memory_usage[self.PARSED_FILE_CACHE_KEY] = self._get_parsed_file_cache_memory_usage()
+        return memory_usage
+
     def get_corpora_info(self) -> list[ViewCorpusInfo]:
         corpora_info: list[ViewCorpusInfo] = []
 
@@ -255,7 +512,9 @@ class Controller:
             if not corpus_df.empty:
                 first_row_data = [str(x) for x in corpus_df.iloc[0]]
 
-            corpora_info.append(ViewCorpusInfo(name, num_rows, parent_name, headers, dtypes, first_row_data))
+            memory_bytes: int = self.corpora.get_memory_usage(corpus.name)
+
+            corpora_info.append(ViewCorpusInfo(name, num_rows, parent_name, headers, dtypes, first_row_data, memory_bytes))
 
         return corpora_info
 
@@ -296,7 +555,18 @@ class Controller:
 
         return file_counts
 
+    def _check_unload_allowed(self):
+        """
+        :raises FileLoadError: if a corpus is being built, as the build is still reading the loaded files
+        """
+        if self.is_building():
+            raise FileLoadError("Files cannot be unloaded while a corpus is being built. Wait for the build to finish or cancel it")
+
     def unload_filepaths(self, filepath_ls: list[str]):
+        """
+        :raises FileLoadError: if a corpus is being built
+        """
+        self._check_unload_allowed()
         for filepath in filepath_ls:
             self.loader_service.remove_meta_filepath(filepath)
             self.loader_service.remove_corpus_filepath(filepath)
@@ -312,6 +582,10 @@ class Controller:
         self.event_manager.trigger_callbacks(EventType.UNLOAD)
 
     def unload_all(self):
+        """
+        :raises FileLoadError: if a corpus is being built
+        """
+        self._check_unload_allowed()
         self.log("All files unloaded", logging.DEBUG)
         self.loader_service.remove_all_files()
 
@@ -344,6 +618,67 @@ class Controller:
     def get_meta_link_header(self) -> Optional[CorpusHeader]:
         return self.meta_link_header
 
+    def get_link_report(self) -> Optional[LinkReport]:
+        return self._compute_link_report(self._get_link_report_args())
+
+    def _get_link_report_args(self) -> Optional[tuple]:
+        """
+        Copies the selected headers and loaded files that the link report is computed from, so a report computed on
+        the link report worker thread does not read them while they are changed by the caller's thread.
+        :return: the loader service and the arguments of its get_link_report method, or None if either linking label is not selected
+        :rtype: Optional[tuple]
+        """
+        if (self.corpus_link_header is None) or (self.meta_link_header is None):
+            return None
+        def copy_header(header: CorpusHeader) -> CorpusHeader:
+            return CorpusHeader(header.name, header.datatype, header.include)
+
+        loader_service: LoaderService = self.loader_service
+        return (loader_service, [copy_header(h) for h in self.corpus_headers], [copy_header(h) for h in self.meta_headers],
+                copy_header(self.corpus_link_header), copy_header(self.meta_link_header), self.build_tqdm,
+                loader_service.get_loaded_corpus_files(), loader_service.get_loaded_meta_files())
+
+    def _compute_link_report(self, link_report_args: Optional[tuple]) -> Optional[LinkReport]:
+        if link_report_args is None:
+            return None
+        loader_service, *report_args = link_report_args
+        try:
+            return loader_service.get_link_report(*report_args)
+        except FileLoadError as e:
+            self.log("Exception while reporting link: " + traceback.format_exc(), logging.ERROR)
+            self.display_error(str(e))
+            return None
+
+    def request_link_report(self, on_report: Callable[[Optional[LinkReport]], None]) -> Future:
+        """
+        Computes the link report on the link report worker thread, so reading the linking labels of the loaded files
+        does not block the event loop. The selected headers and loaded files are copied when the request is made, so
+        the report is computed from the selections at the time of the request. A request is only computed if no newer
+        request is made within LINK_REPORT_DELAY seconds, and on_report is only called for the most recent request.
+        on_report is called from the worker thread within the Panel session that made the request.
+        :param on_report: called with the result of get_link_report
+        :return: the Future of the request
+        :rtype: Future
+        """
+        self.link_report_generation += 1
+        return self.link_report_executor.submit(copy_context().run, self._report_link_in_session, state.curdoc,
+                                                self.link_report_generation, self._get_link_report_args(), on_report)
+
+    def _report_link_in_session(self, session_doc: Optional[Document], generation: int,
+                                link_report_args: Optional[tuple], on_report: Callable[[Optional[LinkReport]], None]):
+        state.curdoc = session_doc
+        sleep(self.LINK_REPORT_DELAY)
+        if generation != self.link_report_generation:
+            return
+        try:
+            link_report: Optional[LinkReport] = self._compute_link_report(link_report_args)
+        except Exception as e:
+            self.log("Exception while reporting link: " + traceback.format_exc(), logging.ERROR)
+            self.display_error(f"Unexpected error while reporting link: {e}")
+            return
+        if generation == self.link_report_generation:
+            on_report(link_report)
+
     def get_all_datatypes(self) -> list[str]:
         return [d.name for d in DataType]
 
@@ -416,6 +751,19 @@ class Controller:
     def retrieve_all_files(self, expand_archived: bool) -> list[FileReference]:
         return self.loader_service.get_all_files(expand_archived)
 
+    def iter_files(self, expand_archived: bool, file_filter: Optional[FileFilter] = None) -> Iterator[FileReference]:
+        return self.loader_service.iter_files(expand_archived, file_filter)
+
+    def retrieve_files_page(self, expand_archived: bool, offset: int, limit: Optional[int],
+                            file_filter: Optional[FileFilter] = None) -> list[FileReference]:
+        return self.loader_service.get_files_page(expand_archived, offset, limit, file_filter)
+
+    def has_file_changes(self) -> bool:
+        return self.loader_service.has_file_changes()
+
+    def get_file_cache_stats(self) -> dict[str, Optional[int]]:
+        return self.loader_service.file_ref_factory.get_cache_stats()
+
     def get_export_types(self) -> list[str]:
         return self.corpus_export_service.get_filetypes()
 
@@ -4,7 +4,7 @@ from zipfile import ZipFile
 
 import numpy as np
 from atap_corpus.corpus.corpus import DataFrameCorpus
-from pandas import DataFrame, ExcelWriter, Series
+from pandas import DataFrame, ExcelWriter, Series, StringDtype
 from panel.widgets import Tqdm
 
 """
@@ -41,7 +41,10 @@ class CorpusExportService:
 
     @staticmethod
     def _get_normalised_dataframe(corpus: DataFrameCorpus) -> DataFrame:
-        return corpus.to_dataframe().astype('string').fillna('')
+        df: DataFrame = corpus.to_dataframe()
+        # Text columns keep their string storage, so Arrow backed text is not converted to Python objects
+        non_text_columns: dict[str, str] = {col: 'string' for col, dtype in df.dtypes.items() if not isinstance(dtype, StringDtype)}
+        return df.astype(non_text_columns).fillna('')
 
     @staticmethod
     def export_csv(corpus: DataFrameCorpus, tqdm_obj: Tqdm) -> BytesIO:
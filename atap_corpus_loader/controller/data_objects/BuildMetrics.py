@@ -0,0 +1,124 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter
+from typing import Optional, Iterator, Union
+
+# The BuildMetrics recording the build running in the current context, if any
+_active_build_metrics: ContextVar[Optional['BuildMetrics']] = ContextVar('active_build_metrics', default=None)
+
+
+def get_active_build_metrics() -> Optional['BuildMetrics']:
+    """
+    :return: the BuildMetrics activated in the current context, or None if no build is being measured
+    :rtype: Optional[BuildMetrics]
+    """
+    return _active_build_metrics.get()
+
+
+@contextmanager
+def measure_stage(stage: str) -> Iterator[None]:
+    """
+    Records the time spent within the context against the named stage of the BuildMetrics activated in the current
+    context. Does nothing if no BuildMetrics is active, so can be used by code that also runs outside of builds.
+    :param stage: the name of the stage
+    """
+    build_metrics: Optional[BuildMetrics] = _active_build_metrics.get()
+    if build_metrics is None:
+        yield
+        return
+    with build_metrics.measure(stage):
+        yield
+
+
+class BuildMetrics:
+    """
+    Records the time spent in each stage of a corpus build, along with the number of files and bytes read, and the
+    number of rows produced. The time of a stage is accumulated over every time the stage is entered, and stages can be
+    nested, e.g. the dtypes stage is measured within the parse_files stage.
+    While activated, the BuildMetrics is available to all code in the current context through measure_stage and
+    get_active_build_metrics, so stages can be recorded without passing the BuildMetrics through every call.
+    Contexts are copied to the threads of a thread pool, so stages measured within thread workers are accumulated, and may
+    exceed the wall-clock time of the enclosing stage. Stages measured within process workers are not recorded.
+    """
+    def __init__(self):
+        self.stage_seconds: dict[str, float] = {}
+        self.stage_counts: dict[str, int] = {}
+        self.files_read: int = 0
+        self.bytes_read: int = 0
+        self.rows_produced: int = 0
+        self.total_seconds: float = 0.0
+        # Stages may be recorded concurrently by thread workers
+        self.lock: Lock = Lock()
+
+    @contextmanager
+    def activate(self) -> Iterator['BuildMetrics']:
+        """
+        Makes this the active BuildMetrics within the context, and records the total time spent within the context.
+        """
+        token = _active_build_metrics.set(self)
+        start_time: float = perf_counter()
+        try:
+            yield self
+        finally:
+            self.total_seconds += perf_counter() - start_time
+            _active_build_metrics.reset(token)
+
+    @contextmanager
+    def measure(self, stage: str) -> Iterator[None]:
+        """
+        Records the time spent within the context against the named stage.
+        :param stage: the name of the stage
+        """
+        start_time: float = perf_counter()
+        try:
+            yield
+        finally:
+            self.add_stage_time(stage, perf_counter() - start_time)
+
+    def add_stage_time(self, stage: str, seconds: float):
+        with self.lock:
+            self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+            self.stage_counts[stage] = self.stage_counts.get(stage, 0) + 1
+
+    def add_files_read(self, num_files: int, num_bytes: int):
+        with self.lock:
+            self.files_read += num_files
+            self.bytes_read += num_bytes
+
+    def set_rows_produced(self, rows_produced: int):
+        self.rows_produced = rows_produced
+
+    def get_files_per_second(self) -> Optional[float]:
+        """
+        :return: the number of files read per second spent in the parse_files stage, or None if no files were parsed
+        :rtype: Optional[float]
+        """
+        parse_seconds: float = self.stage_seconds.get('parse_files', 0.0)
+        if (self.files_read == 0) or (parse_seconds == 0.0):
+            return None
+        return self.files_read / parse_seconds
+
+    def to_dict(self) -> dict[str, Union[int, float, None, dict]]:
+        """
+        :return: the metrics as a dictionary with the keys 'total_seconds', 'stages', 'files_read', 'bytes_read', 'rows_produced', and 'files_per_second'. The 'stages' value maps each stage name to a dictionary with the keys 'seconds' and 'count'
+        :rtype: dict[str, Union[int, float, None, dict]]
+        """
+        with self.lock:
+            stages = {stage: {'seconds': seconds, 'count': self.stage_counts[stage]}
+                      for stage, seconds in self.stage_seconds.items()}
+        return {
+            'total_seconds': self.total_seconds,
+            'stages': stages,
+            'files_read': self.files_read,
+            'bytes_read': self.bytes_read,
+            'rows_produced': self.rows_produced,
+            'files_per_second': self.get_files_per_second()
+        }
+
+    def __repr__(self):
+        stages_str: str = ', '.join(f"{stage}: {seconds:.3f}s" for stage, seconds in self.stage_seconds.items())
+        files_per_second: Optional[float] = self.get_files_per_second()
+        rate_str: str = '' if files_per_second is None else f" ({files_per_second:.1f} files/s)"
+        return (f"BuildMetrics - total: {self.total_seconds:.3f}s, files read: {self.files_read}{rate_str}, "
+                f"bytes read: {self.bytes_read}, rows produced: {self.rows_produced}, stages: [{stages_str}]")
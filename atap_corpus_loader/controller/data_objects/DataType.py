@@ -1,4 +1,9 @@
 from enum import Enum
+from typing import Union
+
+from pandas import StringDtype
+
+from atap_corpus_loader.controller.data_objects.StringStorage import StringStorage
 
 
 class DataType(Enum):
@@ -11,3 +16,13 @@ class DataType(Enum):
     BOOLEAN = 'bool'
     DATETIME = 'datetime64[ns]'
     CATEGORY = 'category'
+
+    def get_dtype(self, string_storage: StringStorage = StringStorage.PYTHON) -> Union[str, StringDtype]:
+        """
+        :param string_storage: the storage used for the values of TEXT columns
+        :return: the pandas data type that columns of this data type are cast to
+        :rtype: Union[str, StringDtype]
+        """
+        if self == DataType.TEXT:
+            return StringDtype(string_storage.value)
+        return self.value
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class DeduplicationMode(Enum):
+    """
+    Describes how duplicate documents will be handled when building a corpus
+    NONE: duplicate documents are kept
+    DROP: corpus files with the same contents as an earlier file are not parsed, and rows whose document is the same as
+    an earlier row are removed
+    FLAG: all documents are kept, and rows whose document is the same as an earlier row are flagged as duplicates
+    """
+    NONE = 'none'
+    DROP = 'drop'
+    FLAG = 'flag'
@@ -0,0 +1,38 @@
+from atap_corpus_loader.controller.data_objects.DeduplicationMode import DeduplicationMode
+
+
+class DeduplicationReport:
+    """
+    A dataclass that summarises the duplicate documents found while building a corpus.
+    """
+    def __init__(self, mode: DeduplicationMode, num_duplicate_files: int, num_duplicate_rows: int):
+        """
+        :param mode: the way in which the duplicate documents were handled
+        :param num_duplicate_files: the number of corpus files not parsed as their contents duplicate an earlier file
+        :param num_duplicate_rows: the number of parsed rows whose document duplicates an earlier row, which were removed or flagged according to mode
+        """
+        self.mode: DeduplicationMode = mode
+        self.num_duplicate_files: int = num_duplicate_files
+        self.num_duplicate_rows: int = num_duplicate_rows
+
+    def get_num_duplicates(self) -> int:
+        """
+        :return: the total number of duplicate documents found, whether found before or after parsing
+        :rtype: int
+        """
+        return self.num_duplicate_files + self.num_duplicate_rows
+
+    def to_dict(self) -> dict[str, object]:
+        """
+        :return: the report as a dictionary with the keys 'mode', 'duplicate_files', and 'duplicate_rows'
+        :rtype: dict[str, object]
+        """
+        return {
+            'mode': self.mode.value,
+            'duplicate_files': self.num_duplicate_files,
+            'duplicate_rows': self.num_duplicate_rows
+        }
+
+    def __repr__(self):
+        return (f"DeduplicationReport - mode: {self.mode.value}, duplicate files: {self.num_duplicate_files}, "
+                f"duplicate rows: {self.num_duplicate_rows}")
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class ExecutorType(Enum):
+    """
+    Describes the ways in which files will be parsed when building a corpus
+    SERIAL: files are parsed one at a time on the calling thread
+    THREAD: files are parsed in parallel by a pool of threads. Suited to files whose parsing releases the GIL, e.g. CSV
+    PROCESS: files are parsed in parallel by a pool of processes. Suited to CPU-bound parsing, e.g. DOCX and ODT
+    """
+    SERIAL = 'serial'
+    THREAD = 'thread'
+    PROCESS = 'process'
@@ -0,0 +1,46 @@
+from fnmatch import fnmatch
+from os.path import basename
+from typing import Optional, Iterable
+
+
+class FileFilter:
+    """
+    Describes which files should be included in a file listing. The filter is applied to the path of each file before
+    a FileReference is created for it, so files that are filtered out never have a FileReference created.
+    The extension and hidden file checks are consistent with FileReference.get_extension and FileReference.is_hidden.
+    """
+    def __init__(self, file_types: Optional[Iterable[str]] = None, include_hidden: bool = True,
+                 glob_pattern: Optional[str] = None):
+        """
+        :param file_types: the file extensions to include (case-insensitive). If None, files of all types are included
+        :param include_hidden: if False, files whose filename begins with a '.' are excluded
+        :param glob_pattern: a pattern in the format accepted by fnmatch that the full path of a file must match. If None, no pattern is applied
+        """
+        self.file_types: Optional[set[str]] = None
+        if file_types is not None:
+            self.file_types = {file_type.upper() for file_type in file_types}
+        self.include_hidden: bool = include_hidden
+        self.glob_pattern: Optional[str] = glob_pattern
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(file_types={self.file_types}, include_hidden={self.include_hidden}, "
+                f"glob_pattern={self.glob_pattern!r})")
+
+    def matches(self, path: str) -> bool:
+        """
+        :param path: the path of the file to check
+        :return: True if the file at the provided path should be included in the listing, False otherwise
+        :rtype: bool
+        """
+        filename: str = basename(path)
+        if (not self.include_hidden) and filename.startswith('.'):
+            return False
+        if self.file_types is not None:
+            dot_idx: int = filename.rfind('.')
+            extension: str = '' if dot_idx == -1 else filename[dot_idx + 1:]
+            if extension.upper() not in self.file_types:
+                return False
+        if (self.glob_pattern is not None) and (not fnmatch(path, self.glob_pattern)):
+            return False
+
+        return True
@@ -1,49 +1,102 @@
 from abc import ABC, abstractmethod
-from io import BytesIO
-from os.path import join, dirname, basename
-from typing import Optional
-from zipfile import ZipFile, BadZipFile
+from collections import OrderedDict
+from hashlib import blake2b
+from io import BytesIO, BufferedIOBase
+from mmap import mmap, ACCESS_READ
+from os import fstat, sep, stat
+from os.path import join, dirname, basename, isfile
+from sys import intern
+from typing import Optional, Callable, Hashable
+from zipfile import BadZipFile
+
+from atap_corpus_loader.controller.data_objects.PersistentFileIndex import PersistentFileIndex
+from atap_corpus_loader.controller.data_objects.ReadOnlyBuffer import ReadOnlyBuffer
+from atap_corpus_loader.controller.data_objects.ZipArchiveIndex import ZipArchiveIndex
+
+# The read buffer size used for streams over files on disk
+STREAM_CHUNK_SIZE: int = 1024 * 1024
 
 
 class FileReference(ABC):
     """
     FileReference is an abstract class that provides methods for retrieving information about a file.
     A pathlib implementation would be insufficient due to application-specific attributes/methods, especially with subclasses of FileReference.
+    As a FileReference is kept for every file in the file system, instances are kept compact by using __slots__ and only
+    storing the path. The directory path and extension are derived and interned on first access, as they are shared
+    by many files, and the filename is derived from the path whenever it is requested.
     """
+    __slots__ = ('path', '_directory_path', '_extension')
+
     def __init__(self, path: str):
         self.path: str = path
-        self.path_hash: int = hash(self.path)
-        self.directory_path: str = dirname(path)
-        self.filename: str = basename(path)
-
-        self.filename_no_ext: str
-        self.extension: str
-        if '.' not in self.filename:
-            self.extension = ''
-            self.filename_no_ext = self.filename
-        else:
-            filename_dot_split = self.filename.split('.')
-            self.extension = filename_dot_split[-1]
-            self.filename_no_ext = '.'.join(filename_dot_split[:-1])
+        self._directory_path: Optional[str] = None
+        self._extension: Optional[str] = None
 
-        self.is_ref_archive = self.extension.lower() == 'zip'
+    @abstractmethod
+    def get_content_buffer(self) -> BufferedIOBase:
+        """
+        Provides a seekable binary file object which contains the contents of the file.
+        :return: The binary file object containing the file contents
+        :rtype: BufferedIOBase
+        """
+        raise NotImplementedError()
 
     @abstractmethod
-    def get_content_buffer(self) -> BytesIO:
+    def open_stream(self) -> BufferedIOBase:
         """
-        Provides a BytesIO object which contains the contents of the file.
-        :return: The BytesIO object containing the file contents
-        :rtype: BytesIO
+        Opens a binary stream over the contents of the file. Unlike get_content_buffer, the contents are read incrementally
+        as the stream is consumed rather than materialised in memory up front.
+        The stream should be closed after use, e.g. by using it as a context manager.
+        :return: The binary stream of the file contents
+        :rtype: BufferedIOBase
         """
         raise NotImplementedError()
 
+    def get_content_prefix(self, max_bytes: int) -> bytes:
+        """
+        Reads at most max_bytes from the start of the file, without reading the remainder of the file.
+        Used where only a sample of the file is required, e.g. when inferring headers.
+        :param max_bytes: the maximum number of bytes to read
+        :return: the first max_bytes of the file, or the whole file if it is shorter than max_bytes
+        :rtype: bytes
+        """
+        with self.open_stream() as stream:
+            return stream.read(max_bytes)
+
+    @abstractmethod
+    def get_fingerprint(self) -> Hashable:
+        """
+        Provides a value that identifies the current version of the file, which changes whenever the contents of the file
+        change. Used to cache values derived from the contents of the file, e.g. inferred headers.
+        :return: the hashable fingerprint of the file, which includes the path of the file
+        :rtype: Hashable
+        :raises OSError: if the file cannot be accessed
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def get_size(self) -> int:
+        """
+        :return: the size of the contents of the file in bytes
+        :rtype: int
+        :raises OSError: if the file cannot be accessed
+        """
+        raise NotImplementedError()
+
+    def release(self):
+        """
+        Releases any resources held for reading the contents of the file, e.g. memory maps.
+        Called when the file is no longer loaded. The FileReference remains usable after being released.
+        """
+        pass
+
     def __eq__(self, other):
         if not isinstance(other, FileReference):
             return False
-        return self.path_hash == other.path_hash
+        return hash(self.path) == hash(other.path)
 
     def __hash__(self):
-        return self.path_hash
+        return hash(self.path)
 
     def __str__(self):
         return self.get_path()
@@ -63,28 +116,37 @@ class FileReference(ABC):
         :return: the path to the immediate parent directory of the file
         :rtype: str
         """
-        return self.directory_path
+        if self._directory_path is None:
+            self._directory_path = intern(dirname(self.path))
+        return self._directory_path
 
     def get_filename(self) -> str:
         """
         :return: the filename of the file, including file extension
         :rtype: str
         """
-        return self.filename
+        return basename(self.path)
+
+    def _split_filename(self) -> tuple[str, str]:
+        filename: str = self.get_filename()
+        dot_idx: int = filename.rfind('.')
+        if dot_idx == -1:
+            return filename, ''
+        return filename[:dot_idx], filename[dot_idx + 1:]
 
     def get_filename_no_ext(self) -> str:
         """
         :return: the filename of the file, excluding file extension
         :rtype: str
         """
-        return self.filename_no_ext
+        return self._split_filename()[0]
 
     def is_hidden(self) -> bool:
         """
         :return: True if the filename begins with a '.', False otherwise
         :rtype: bool
         """
-        return self.filename.startswith('.')
+        return self.get_filename().startswith('.')
 
     def get_extension(self) -> str:
         """
@@ -92,7 +154,9 @@ class FileReference(ABC):
         If the filename is 'example.txt', this method will return 'txt'.
         :rtype: str
         """
-        return self.extension
+        if self._extension is None:
+            self._extension = intern(self._split_filename()[1])
+        return self._extension
 
     def is_archive(self) -> bool:
         """
@@ -101,7 +165,7 @@ class FileReference(ABC):
         :return: True if the file is an archive file (e.g. example.zip), False otherwise.
         :rtype: bool
         """
-        return self.is_ref_archive
+        return self.get_extension().lower() == 'zip'
 
     @staticmethod
     def is_zipped() -> bool:
@@ -117,33 +181,136 @@ class FileReference(ABC):
 class DiskFileReference(FileReference):
     """
     A general purpose object to hold information regarding a specific file in the file system.
-    Folder structure is preserved as a path-like string
+    Folder structure is preserved as a path-like string.
+    If use_mmap is True, the file contents are memory mapped rather than read into memory. The mapping is shared by all
+    buffers provided by get_content_buffer until the file changes on disk or the reference is released.
     """
-    def get_content_buffer(self) -> BytesIO:
+    __slots__ = ('use_mmap', 'content_map', 'content_map_stat')
+
+    def __init__(self, path: str, use_mmap: bool = False):
         """
-        Provides a BytesIO object which contains the contents of the file.
-        :return: The BytesIO object containing the file contents
-        :rtype: BytesIO
+        :param path: the path to the file
+        :param use_mmap: if True, provide the file contents through a read-only memory map instead of an in-memory copy
+        """
+        super().__init__(path)
+        self.use_mmap: bool = use_mmap
+        self.content_map: Optional[mmap] = None
+        self.content_map_stat: Optional[tuple[int, int]] = None
+
+    def get_content_buffer(self) -> BufferedIOBase:
+        """
+        Provides a binary file object which contains the contents of the file.
+        If use_mmap is True, the file object is a ReadOnlyBuffer over a memory map of the file, otherwise a BytesIO copy.
+        :return: The binary file object containing the file contents
+        :rtype: BufferedIOBase
         """
+        if self.use_mmap:
+            return self._get_mapped_buffer()
         with open(self.get_path(), 'rb') as bytes_f:
             buf = BytesIO(bytes_f.read())
         return buf
 
+    def open_stream(self) -> BufferedIOBase:
+        """
+        Opens a buffered binary stream over the file on disk.
+        If use_mmap is True, the stream is a ReadOnlyBuffer over the memory map of the file.
+        :return: The binary stream of the file contents
+        :rtype: BufferedIOBase
+        """
+        if self.use_mmap:
+            return self._get_mapped_buffer()
+        return open(self.get_path(), 'rb', buffering=STREAM_CHUNK_SIZE)
+
+    def get_content_prefix(self, max_bytes: int) -> bytes:
+        if self.use_mmap:
+            return super().get_content_prefix(max_bytes)
+        # The default buffer size is used, as the large stream buffer would read ahead beyond max_bytes
+        with open(self.get_path(), 'rb') as bytes_f:
+            return bytes_f.read(max_bytes)
+
+    def get_fingerprint(self) -> Hashable:
+        """
+        :return: the path, size, and modification time of the file
+        :rtype: Hashable
+        :raises OSError: if the file cannot be accessed
+        """
+        file_stat = stat(self.get_path())
+        return self.get_path(), file_stat.st_size, file_stat.st_mtime_ns
+
+    def get_size(self) -> int:
+        return stat(self.get_path()).st_size
+
+    def _get_mapped_buffer(self) -> ReadOnlyBuffer:
+        with open(self.get_path(), 'rb') as bytes_f:
+            file_stat = fstat(bytes_f.fileno())
+            curr_stat: tuple[int, int] = (file_stat.st_size, file_stat.st_mtime_ns)
+            if (self.content_map is None) or self.content_map.closed or (self.content_map_stat != curr_stat):
+                self.release()
+                if file_stat.st_size == 0:
+                    # Empty files cannot be memory mapped
+                    return ReadOnlyBuffer(b'')
+                self.content_map = mmap(bytes_f.fileno(), 0, access=ACCESS_READ)
+                self.content_map_stat = curr_stat
+
+        return ReadOnlyBuffer(self.content_map)
+
+    def release(self):
+        """
+        Closes the memory map of the file, if one is open.
+        If buffers over the memory map are still in use, the memory map is instead closed once they are garbage collected.
+        """
+        if self.content_map is None:
+            return
+        try:
+            self.content_map.close()
+        except BufferError:
+            pass
+        self.content_map = None
+        self.content_map_stat = None
+
+    def __getstate__(self):
+        # The memory map cannot be pickled, e.g. when sent to a process pool, so it is recreated when next read.
+        # The slot state is built explicitly, as object.__getstate__ is not available before Python 3.11
+        slot_state: dict = {slot: getattr(self, slot) for cls in type(self).__mro__
+                            for slot in getattr(cls, '__slots__', ()) if hasattr(self, slot)}
+        slot_state['content_map'] = None
+        slot_state['content_map_stat'] = None
+        return slot_state
+
+    def __setstate__(self, state: dict):
+        for slot, value in state.items():
+            setattr(self, slot, value)
+
 
 class ZipFileReference(FileReference):
     """
-    ZipFileReference refers to a zip file and provides an implementation of get_content_buffer that accounts for the zip format
+    ZipFileReference refers to a zip file and provides an implementation of get_content_buffer that accounts for the zip format.
+    The directory path of a zipped file is the path of the zip file, which is shared with the ZipArchiveIndex.
     """
-    def __init__(self, zip_file: ZipFile, zip_file_path: str, internal_path: str):
+    __slots__ = ('archive_index',)
+
+    def __init__(self, archive_index: ZipArchiveIndex, zip_file_path: str, internal_path: str):
         """
-        :param zip_file: the ZipFile object corresponding to the zip file that holds this zipped file. This allows multiple zipped files to share the same ZipFile object
+        :param archive_index: the ZipArchiveIndex corresponding to the zip file that holds this zipped file. This allows multiple zipped files to share the same ZipFile handle
         :param zip_file_path: the path to the zip file that holds this zipped file. This can be absolute or relative to the root_directory specified in CorpusLoader
         :param internal_path: the path within the zip file to this zipped file
         """
         super().__init__(join(zip_file_path, internal_path))
-        self.zip_file = zip_file
-        self.directory_path: str = zip_file_path
-        self.internal_directory: str = dirname(internal_path)
+        self.archive_index: ZipArchiveIndex = archive_index
+
+    def get_directory_path(self) -> str:
+        """
+        :return: the path to the zip file that holds this zipped file
+        :rtype: str
+        """
+        return self.archive_index.zip_file_path
+
+    def get_internal_path(self) -> str:
+        """
+        :return: the path within the zip file to this zipped file
+        :rtype: str
+        """
+        return self.path[len(self.get_directory_path()):].lstrip(sep)
 
     def get_content_buffer(self) -> BytesIO:
         """
@@ -151,12 +318,38 @@ class ZipFileReference(FileReference):
         :return: The BytesIO object containing the file contents
         :rtype: BytesIO
         """
-        internal_path = join(self.internal_directory, self.filename)
-        with self.zip_file.open(internal_path, force_zip64=True) as zip_f:
+        with self.open_stream() as zip_f:
             buf = BytesIO(zip_f.read())
 
         return buf
 
+    def open_stream(self) -> BufferedIOBase:
+        """
+        Opens a stream that decompresses the zipped file incrementally as it is read.
+        :return: The binary stream of the file contents
+        :rtype: BufferedIOBase
+        """
+        return self.archive_index.open_member(self.get_internal_path())
+
+    def get_fingerprint(self) -> Hashable:
+        """
+        The CRC-32 of the contents stored in the central directory of the archive is used as a content hash, so the
+        fingerprint is unchanged when other members of the archive are modified.
+        :return: the path, size, and CRC-32 of the zipped file
+        :rtype: Hashable
+        :raises OSError: if the archive cannot be accessed
+        """
+        file_size, crc = self.archive_index.get_member_checksum(self.get_internal_path())
+        return self.get_path(), file_size, crc
+
+    def get_size(self) -> int:
+        """
+        :return: the uncompressed size of the zipped file in bytes
+        :rtype: int
+        """
+        file_size, _ = self.archive_index.get_member_checksum(self.get_internal_path())
+        return file_size
+
     @staticmethod
     def is_zipped() -> bool:
         return True
@@ -167,41 +360,176 @@ class RemoteFileReference(FileReference):
     RemoteFileReference refers to a file held over a network.
     The set_content_buffer methods provides a way for clients of this class to handle the retrieval of file contents from the network.
     """
+    __slots__ = ('content', 'content_digest')
+
     def __init__(self, path: str):
         super().__init__(path)
-        self.content_buffer: Optional[BytesIO] = None
+        self.content: Optional[bytes] = None
+        self.content_digest: Optional[bytes] = None
 
     def set_content_buffer(self, content_buffer: BytesIO):
-        content_buffer.seek(0)
-        self.content_buffer = content_buffer
+        self.content = content_buffer.getvalue()
+        self.content_digest = None
 
-    def get_content_buffer(self) -> BytesIO:
+    def get_content_buffer(self) -> BufferedIOBase:
         """
-        Provides a BytesIO object which contains the contents of the file.
-        :return: The BytesIO object containing the file contents
-        :rtype: BytesIO
+        Provides a read-only binary file object which contains the contents of the file.
+        The retrieved contents are shared rather than copied.
+        :return: The binary file object containing the file contents
+        :rtype: BufferedIOBase
+        """
+        if self.content is None:
+            return ReadOnlyBuffer(b'')
+        return ReadOnlyBuffer(self.content)
+
+    def open_stream(self) -> BufferedIOBase:
+        """
+        Opens a read-only stream over the retrieved contents of the file.
+        :return: The binary stream of the file contents
+        :rtype: BufferedIOBase
+        """
+        return self.get_content_buffer()
+
+    def get_content_prefix(self, max_bytes: int) -> bytes:
+        if self.content is None:
+            return b''
+        return self.content[:max_bytes]
+
+    def get_fingerprint(self) -> Hashable:
         """
-        if self.content_buffer is None:
-            return BytesIO()
-        self.content_buffer.seek(0)
-        return BytesIO(self.content_buffer.read())
+        The hash of the retrieved contents is computed when first requested after the contents are set.
+        :return: the path and a hash of the retrieved contents of the file
+        :rtype: Hashable
+        """
+        if (self.content_digest is None) and (self.content is not None):
+            self.content_digest = blake2b(self.content, digest_size=16).digest()
+        return self.get_path(), self.content_digest
+
+    def get_size(self) -> int:
+        """
+        :return: the size of the retrieved contents in bytes, or 0 if the contents have not been retrieved
+        :rtype: int
+        """
+        if self.content is None:
+            return 0
+        return len(self.content)
 
 
 class FileReferenceFactory:
     """
     Implements the Flyweight pattern to mitigate the overhead of re-creating FileReference objects, as the files within
     the file system are expected to change far less frequently than FileReference objects are referred to.
-    An add-only cache for FileReference objects is maintained in the form of a dictionary which maps full_path strings
-    to the corresponding FileReference object.
+    The cache for FileReference objects is maintained in the form of an ordered dictionary which maps full_path strings
+    to the corresponding FileReference object, ordered from least to most recently used.
+    If max_cache_size is provided, the least recently used FileReference objects are evicted once the cache exceeds
+    that size. FileReference objects for which is_pinned returns True (e.g. loaded files) are never evicted.
+    If a PersistentFileIndex is provided, the member listings of zip archives are persisted across sessions.
     """
-    def __init__(self):
-        self.file_ref_cache: dict[str, FileReference] = {}
+    def __init__(self, use_mmap: bool = False, max_cache_size: Optional[int] = None,
+                 is_pinned: Optional[Callable[[FileReference], bool]] = None,
+                 persistent_index: Optional[PersistentFileIndex] = None):
+        """
+        :param use_mmap: if True, DiskFileReference objects created by the factory will memory map file contents
+        :param max_cache_size: the maximum number of unpinned FileReference objects held in the cache. If None, the cache is unbounded
+        :param is_pinned: a function that returns True if the provided FileReference must not be evicted from the cache
+        :param persistent_index: the PersistentFileIndex used to seed and persist zip archive member listings. If None, listings are not persisted
+        """
+        if (max_cache_size is not None) and (max_cache_size < 0):
+            raise ValueError(f"max_cache_size must be a non-negative integer or None, instead got {max_cache_size}")
+        self.use_mmap: bool = use_mmap
+        self.max_cache_size: Optional[int] = max_cache_size
+        self.is_pinned: Callable[[FileReference], bool] = is_pinned if is_pinned is not None else lambda ref: False
+        self.file_ref_cache: OrderedDict[str, FileReference] = OrderedDict()
+        self.zip_index_cache: dict[str, ZipArchiveIndex] = {}
+        self.persistent_index: Optional[PersistentFileIndex] = persistent_index
+
+        self.cache_hits: int = 0
+        self.cache_misses: int = 0
+        self.cache_evictions: int = 0
 
     def clear_cache(self):
         """
-        Resets the cache to an empty dictionary
+        Resets the cache to an empty dictionary and closes the handles of all indexed zip archives
+        """
+        self.file_ref_cache = OrderedDict()
+        for archive_index in self.zip_index_cache.values():
+            archive_index.close()
+        self.zip_index_cache = {}
+
+    def get_cache_stats(self) -> dict[str, Optional[int]]:
+        """
+        :return: a dictionary of the cache size, maximum size, and the number of hits, misses, and evictions of the cache
+        :rtype: dict[str, Optional[int]]
+        """
+        return {
+            "size": len(self.file_ref_cache),
+            "max_size": self.max_cache_size,
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "evictions": self.cache_evictions
+        }
+
+    def _get_cached_ref(self, path: str) -> Optional[FileReference]:
+        cached_ref: Optional[FileReference] = self.file_ref_cache.get(path)
+        if cached_ref is None:
+            self.cache_misses += 1
+        else:
+            self.cache_hits += 1
+            self.file_ref_cache.move_to_end(path)
+
+        return cached_ref
+
+    def _add_cached_ref(self, path: str, file_ref: FileReference):
+        self.file_ref_cache[path] = file_ref
+        self.file_ref_cache.move_to_end(path)
+        self._evict_refs()
+
+    def _evict_refs(self):
+        if self.max_cache_size is None:
+            return
+        # Pinned references are moved to the most recently used end, so each reference is checked at most once
+        checks_remaining: int = len(self.file_ref_cache)
+        while (len(self.file_ref_cache) > self.max_cache_size) and (checks_remaining > 0):
+            checks_remaining -= 1
+            path, file_ref = next(iter(self.file_ref_cache.items()))
+            if self.is_pinned(file_ref):
+                self.file_ref_cache.move_to_end(path)
+                continue
+            del self.file_ref_cache[path]
+            file_ref.release()
+            self.cache_evictions += 1
+
+    def invalidate_path(self, path: str):
+        """
+        Releases the resources held for the file at the provided path, as the file has been modified or removed.
+        The cached reference is discarded unless it is pinned, in which case it will re-read the file when next accessed.
         """
-        self.file_ref_cache = {}
+        cached_ref: Optional[FileReference] = self.file_ref_cache.get(path)
+        if cached_ref is not None:
+            cached_ref.release()
+            if not self.is_pinned(cached_ref):
+                del self.file_ref_cache[path]
+        archive_index: Optional[ZipArchiveIndex] = self.zip_index_cache.get(path)
+        if archive_index is not None:
+            # The central directory is re-read when the archive is next accessed
+            archive_index.close()
+
+    @staticmethod
+    def _split_archive_path(path: str) -> Optional[tuple[str, str]]:
+        """
+        Splits the path of a file within a zip archive into the path of the archive and the path within the archive.
+        :return: a tuple of the archive path and the internal path, or None if the path does not refer to a zipped file
+        :rtype: Optional[tuple[str, str]]
+        """
+        archive_suffix: str = '.zip' + sep
+        suffix_idx: int = path.find(archive_suffix)
+        while suffix_idx != -1:
+            zip_file_path: str = path[:suffix_idx + len('.zip')]
+            if isfile(zip_file_path):
+                return zip_file_path, path[suffix_idx + len(archive_suffix):]
+            suffix_idx = path.find(archive_suffix, suffix_idx + 1)
+
+        return None
 
     def get_file_refs_from_path(self, path: str, expand_archived: bool) -> list[FileReference]:
         file_refs: list[FileReference]
@@ -219,10 +547,22 @@ class FileReferenceFactory:
         return file_refs
 
     def get_file_ref(self, path: str) -> FileReference:
-        cached_ref: Optional[FileReference] = self.file_ref_cache.get(path)
+        cached_ref: Optional[FileReference] = self._get_cached_ref(path)
         if cached_ref is None:
-            cached_ref = DiskFileReference(path)
-            self.file_ref_cache[path] = cached_ref
+            archive_split: Optional[tuple[str, str]] = None
+            if not isfile(path):
+                # The reference to a zipped file may have been evicted from the cache
+                archive_split = self._split_archive_path(path)
+            if archive_split is None:
+                cached_ref = DiskFileReference(path, self.use_mmap)
+            else:
+                zip_file_path, internal_path = archive_split
+                try:
+                    archive_index: ZipArchiveIndex = self.get_zip_archive_index(zip_file_path)
+                    cached_ref = ZipFileReference(archive_index, zip_file_path, internal_path)
+                except BadZipFile:
+                    cached_ref = DiskFileReference(path, self.use_mmap)
+            self._add_cached_ref(path, cached_ref)
 
         return cached_ref
 
@@ -234,31 +574,67 @@ class FileReferenceFactory:
         :return: a list of FileReference objects corresponding to the files within the zip archive
         :rtype: list[FileReference]
         """
-        zip_file = ZipFile(zip_file_path)
+        archive_index: ZipArchiveIndex = self.get_zip_archive_index(zip_file_path)
 
         file_refs: list[FileReference] = []
-        for info in zip_file.infolist():
-            if info.is_dir():
-                continue
-            zip_ref: FileReference = self._get_single_zip_file_ref(zip_file, zip_file_path, info.filename)
+        for internal_path in archive_index.get_member_paths():
+            zip_ref: FileReference = self._get_single_zip_file_ref(archive_index, zip_file_path, internal_path)
             file_refs.append(zip_ref)
 
         return file_refs
 
-    def _get_single_zip_file_ref(self, zip_file: ZipFile, zip_file_path: str, internal_path: str) -> ZipFileReference:
+    def get_zip_archive_index(self, zip_file_path: str) -> ZipArchiveIndex:
+        """
+        Provides the cached ZipArchiveIndex of the zip archive, re-reading the central directory of the archive only if
+        the archive has been modified since it was last read.
+        :param zip_file_path: the path to the zip archive
+        :return: the up-to-date ZipArchiveIndex of the archive
+        :rtype: ZipArchiveIndex
+        :raises BadZipFile: if the archive is malformed
+        """
+        archive_index: Optional[ZipArchiveIndex] = self.zip_index_cache.get(zip_file_path)
+        if archive_index is None:
+            archive_index = ZipArchiveIndex(zip_file_path)
+            if self.persistent_index is not None:
+                persisted_archive = self.persistent_index.load_archive(zip_file_path)
+                if persisted_archive is not None:
+                    archive_index.seed(*persisted_archive)
+            self.zip_index_cache[zip_file_path] = archive_index
+        try:
+            is_reread: bool = archive_index.refresh()
+        except (BadZipFile, OSError):
+            archive_index.close()
+            del self.zip_index_cache[zip_file_path]
+            raise
+        if is_reread and (self.persistent_index is not None):
+            self.persistent_index.save_archive(zip_file_path, archive_index.get_archive_stat(),
+                                               archive_index.get_member_paths())
+
+        return archive_index
+
+    def get_zip_member_ref(self, archive_index: ZipArchiveIndex, internal_path: str) -> ZipFileReference:
+        """
+        :param archive_index: the ZipArchiveIndex of the archive holding the file
+        :param internal_path: the path within the archive of the file
+        :return: the cached ZipFileReference of the file within the archive
+        :rtype: ZipFileReference
+        """
+        return self._get_single_zip_file_ref(archive_index, archive_index.zip_file_path, internal_path)
+
+    def _get_single_zip_file_ref(self, archive_index: ZipArchiveIndex, zip_file_path: str, internal_path: str) -> ZipFileReference:
         full_path: str = join(zip_file_path, internal_path)
-        cached_ref: Optional[ZipFileReference] = self.file_ref_cache.get(full_path)
+        cached_ref: Optional[ZipFileReference] = self._get_cached_ref(full_path)
         if cached_ref is None:
-            cached_ref = ZipFileReference(zip_file, zip_file_path, internal_path)
-            self.file_ref_cache[full_path] = cached_ref
+            cached_ref = ZipFileReference(archive_index, zip_file_path, internal_path)
+            self._add_cached_ref(full_path, cached_ref)
 
         return cached_ref
 
     def get_oni_file_ref(self, path: str) -> RemoteFileReference:
-        cached_ref: Optional[FileReference] = self.file_ref_cache.get(path)
+        cached_ref: Optional[FileReference] = self._get_cached_ref(path)
         if (cached_ref is None) or (type(cached_ref) is not RemoteFileReference):
             cached_ref = RemoteFileReference(path)
-            self.file_ref_cache[path] = cached_ref
+            self._add_cached_ref(path, cached_ref)
         cached_ref: RemoteFileReference
 
         return cached_ref
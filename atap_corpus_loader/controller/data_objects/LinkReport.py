@@ -0,0 +1,41 @@
+class LinkReport:
+    """
+    A dataclass that summarises how the corpus link label matches the metadata link label, provided to the view so that
+    the link can be checked before the corpus is built.
+    """
+    def __init__(self, num_corpus_rows: int, num_matched_rows: int, num_meta_rows: int, num_meta_keys: int,
+                 num_duplicate_meta_keys: int, num_linked_rows: int):
+        """
+        :param num_corpus_rows: the number of corpus rows
+        :param num_matched_rows: the number of corpus rows whose link key is found in the metadata
+        :param num_meta_rows: the number of metadata rows
+        :param num_meta_keys: the number of distinct link keys in the metadata
+        :param num_duplicate_meta_keys: the number of metadata link keys held by more than one metadata row
+        :param num_linked_rows: the number of rows the built corpus will hold
+        """
+        self.num_corpus_rows: int = num_corpus_rows
+        self.num_matched_rows: int = num_matched_rows
+        self.num_meta_rows: int = num_meta_rows
+        self.num_meta_keys: int = num_meta_keys
+        self.num_duplicate_meta_keys: int = num_duplicate_meta_keys
+        self.num_linked_rows: int = num_linked_rows
+
+    def get_match_rate(self) -> float:
+        """
+        :return: the proportion of corpus rows whose link key is found in the metadata, between 0 and 1
+        :rtype: float
+        """
+        if self.num_corpus_rows == 0:
+            return 0.0
+        return self.num_matched_rows / self.num_corpus_rows
+
+    def is_one_to_one(self) -> bool:
+        """
+        :return: True if each matched corpus row links to exactly one metadata row, so linking does not multiply rows
+        :rtype: bool
+        """
+        return self.num_duplicate_meta_keys == 0
+
+    def __repr__(self):
+        return (f"LinkReport - matched: {self.num_matched_rows}/{self.num_corpus_rows}, "
+                f"duplicate metadata keys: {self.num_duplicate_meta_keys}, linked rows: {self.num_linked_rows}")
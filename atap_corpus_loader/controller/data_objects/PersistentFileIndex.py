@@ -0,0 +1,152 @@
+import json
+import logging
+import sqlite3
+from os import makedirs
+from os.path import join, abspath
+from threading import Lock
+from typing import Optional
+
+
+class PersistentFileIndex:
+    """
+    Persists directory listings and zip archive member listings in an SQLite database within a cache directory, so that
+    they can be shared across sessions and processes. A new session is seeded with the persisted listings, which only
+    need to be validated against the modification times of the directories and archives rather than re-read.
+    The index is a cache: if the database cannot be read or written, a warning is logged and the index is disabled.
+    """
+    DB_FILENAME: str = "file_index.sqlite3"
+    SCHEMA_VERSION: int = 1
+    LOGGER_NAME: str = "corpus-loader"
+    # The number of seconds to wait for another process to release a lock on the database
+    LOCK_TIMEOUT: float = 10.0
+
+    def __init__(self, cache_directory: str):
+        """
+        :param cache_directory: the directory to hold the database file. Created if it does not exist
+        """
+        self.db_path: str = abspath(join(cache_directory, self.DB_FILENAME))
+        self.lock: Lock = Lock()
+        self.connection: Optional[sqlite3.Connection] = None
+        try:
+            makedirs(cache_directory, exist_ok=True)
+            self.connection = sqlite3.connect(self.db_path, timeout=self.LOCK_TIMEOUT, check_same_thread=False)
+            self._setup_schema()
+        except (sqlite3.Error, OSError) as e:
+            self._disable(e)
+
+    def _setup_schema(self):
+        with self.connection:
+            schema_version: int = self.connection.execute("PRAGMA user_version").fetchone()[0]
+            if schema_version != self.SCHEMA_VERSION:
+                self.connection.execute("DROP TABLE IF EXISTS directories")
+                self.connection.execute("DROP TABLE IF EXISTS archives")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS directories ("
+                                    "root TEXT NOT NULL, dir_path TEXT NOT NULL, dev INTEGER NOT NULL, "
+                                    "ino INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, file_paths TEXT NOT NULL, "
+                                    "subdir_paths TEXT NOT NULL, PRIMARY KEY (root, dir_path))")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS archives ("
+                                    "zip_path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+                                    "member_paths TEXT NOT NULL)")
+            self.connection.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _disable(self, error: Exception):
+        logger = logging.getLogger(self.LOGGER_NAME)
+        logger.warning(f"Persistent file index at {self.db_path} disabled: {error}")
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except sqlite3.Error:
+                pass
+        self.connection = None
+
+    def is_enabled(self) -> bool:
+        """
+        :return: True if the database is available, False if the index has been disabled
+        :rtype: bool
+        """
+        return self.connection is not None
+
+    def load_directories(self, root_directory: str) -> list[tuple[str, tuple[int, int], int, list[str], list[str]]]:
+        """
+        :param root_directory: the root directory of the DirectoryIndex the listings were saved by
+        :return: a list of tuples of the directory path, the device and inode numbers, the modification time, the file paths, and the subdirectory paths of each persisted directory
+        :rtype: list[tuple[str, tuple[int, int], int, list[str], list[str]]]
+        """
+        with self.lock:
+            if self.connection is None:
+                return []
+            try:
+                rows = self.connection.execute("SELECT dir_path, dev, ino, mtime_ns, file_paths, subdir_paths "
+                                               "FROM directories WHERE root = ?", (root_directory,)).fetchall()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return []
+
+        return [(dir_path, (dev, ino), mtime_ns, json.loads(file_paths), json.loads(subdir_paths))
+                for dir_path, dev, ino, mtime_ns, file_paths, subdir_paths in rows]
+
+    def save_directories(self, root_directory: str,
+                         updated_dirs: list[tuple[str, tuple[int, int], int, list[str], list[str]]],
+                         removed_dir_paths: list[str]):
+        """
+        :param root_directory: the root directory of the DirectoryIndex saving the listings
+        :param updated_dirs: a list of tuples in the format provided by load_directories of the directories that have been added or re-listed
+        :param removed_dir_paths: the paths of the directories that no longer exist
+        """
+        updated_rows = [(root_directory, dir_path, dir_id[0], dir_id[1], mtime_ns,
+                         json.dumps(file_paths), json.dumps(subdir_paths))
+                        for dir_path, dir_id, mtime_ns, file_paths, subdir_paths in updated_dirs]
+        removed_rows = [(root_directory, dir_path) for dir_path in removed_dir_paths]
+        with self.lock:
+            if self.connection is None:
+                return
+            try:
+                with self.connection:
+                    self.connection.executemany("DELETE FROM directories WHERE root = ? AND dir_path = ?", removed_rows)
+                    self.connection.executemany("INSERT OR REPLACE INTO directories VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                                updated_rows)
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def load_archive(self, zip_file_path: str) -> Optional[tuple[tuple[int, int], list[str]]]:
+        """
+        :param zip_file_path: the path to the zip archive
+        :return: a tuple of the size and modification time of the archive, and the paths of the files within the archive, or None if the archive has not been persisted
+        :rtype: Optional[tuple[tuple[int, int], list[str]]]
+        """
+        with self.lock:
+            if self.connection is None:
+                return None
+            try:
+                row = self.connection.execute("SELECT size, mtime_ns, member_paths FROM archives WHERE zip_path = ?",
+                                              (zip_file_path,)).fetchone()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+        if row is None:
+            return None
+
+        size, mtime_ns, member_paths = row
+        return (size, mtime_ns), json.loads(member_paths)
+
+    def save_archive(self, zip_file_path: str, archive_stat: tuple[int, int], member_paths: list[str]):
+        """
+        :param zip_file_path: the path to the zip archive
+        :param archive_stat: the size and modification time of the archive when the member paths were read
+        :param member_paths: the paths of the files within the archive
+        """
+        with self.lock:
+            if self.connection is None:
+                return
+            try:
+                with self.connection:
+                    self.connection.execute("INSERT OR REPLACE INTO archives VALUES (?, ?, ?, ?)",
+                                            (zip_file_path, archive_stat[0], archive_stat[1], json.dumps(member_paths)))
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
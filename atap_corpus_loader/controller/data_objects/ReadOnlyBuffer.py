@@ -0,0 +1,108 @@
+from io import BufferedIOBase, SEEK_SET, SEEK_CUR, SEEK_END, UnsupportedOperation
+from mmap import mmap
+from typing import Optional, Union
+
+
+class ReadOnlyBuffer(BufferedIOBase):
+    """
+    A seekable, read-only binary file object over an existing buffer, such as bytes or a memory map.
+    Unlike BytesIO, the underlying data is never copied when the buffer is constructed. Each ReadOnlyBuffer maintains its
+    own read position, so many ReadOnlyBuffer objects can safely share the same underlying data.
+    """
+    def __init__(self, data: Union[bytes, mmap]):
+        """
+        :param data: the underlying data to read from. Must support the buffer protocol and the find method, e.g. bytes or mmap
+        """
+        super().__init__()
+        self.data: Optional[Union[bytes, mmap]] = data
+        self.view: Optional[memoryview] = memoryview(data)
+        self.pos: int = 0
+
+    def _check_open(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed buffer")
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    def write(self, *_):
+        raise UnsupportedOperation("ReadOnlyBuffer does not support writing")
+
+    def getbuffer(self) -> memoryview:
+        """
+        :return: a read-only memoryview of the underlying data. No copy of the data is made
+        :rtype: memoryview
+        """
+        self._check_open()
+        return self.view[:]
+
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._check_open()
+        total_len: int = len(self.view)
+        if (size is None) or (size < 0):
+            end = total_len
+        else:
+            end = min(self.pos + size, total_len)
+        if end <= self.pos:
+            return b''
+        chunk: bytes = self.view[self.pos:end].tobytes()
+        self.pos = end
+        return chunk
+
+    def read1(self, size: Optional[int] = -1) -> bytes:
+        return self.read(size)
+
+    def readinto(self, buffer) -> int:
+        self._check_open()
+        out_view = memoryview(buffer).cast('B')
+        num_bytes: int = max(0, min(len(out_view), len(self.view) - self.pos))
+        out_view[:num_bytes] = self.view[self.pos:self.pos + num_bytes]
+        self.pos += num_bytes
+        return num_bytes
+
+    def readinto1(self, buffer) -> int:
+        return self.readinto(buffer)
+
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        self._check_open()
+        total_len: int = len(self.view)
+        newline_idx: int = self.data.find(b'\n', self.pos)
+        end: int = total_len if newline_idx == -1 else newline_idx + 1
+        if (size is not None) and (size >= 0):
+            end = min(end, self.pos + size)
+        if end <= self.pos:
+            return b''
+        line: bytes = self.view[self.pos:end].tobytes()
+        self.pos = end
+        return line
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        self._check_open()
+        if whence == SEEK_SET:
+            new_pos = offset
+        elif whence == SEEK_CUR:
+            new_pos = self.pos + offset
+        elif whence == SEEK_END:
+            new_pos = len(self.view) + offset
+        else:
+            raise ValueError(f"Invalid whence value: {whence}")
+        if new_pos < 0:
+            raise ValueError(f"Negative seek position: {new_pos}")
+        self.pos = new_pos
+        return self.pos
+
+    def tell(self) -> int:
+        self._check_open()
+        return self.pos
+
+    def close(self):
+        # The memoryview is not released here as views handed out by getbuffer may still be in use
+        self.data = None
+        self.view = None
+        super().close()
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class StringStorage(Enum):
+    """
+    Describes the ways in which the values of TEXT columns will be stored when building a corpus
+    PYTHON: each value is stored as a separate Python str object
+    PYARROW: the values of each column are stored in contiguous Arrow buffers, avoiding a Python object per value in the
+    built corpus. Files are parsed into Python strings before being converted, so the peak memory of a build is higher.
+    Requires the pyarrow package
+    """
+    PYTHON = 'python'
+    PYARROW = 'pyarrow'
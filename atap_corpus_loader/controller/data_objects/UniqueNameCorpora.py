@@ -1,8 +1,9 @@
 import logging
-from typing import Optional, Iterable
+from typing import Optional, Iterable, Hashable
 
 from atap_corpus._types import TCorpus
 from atap_corpus.corpus.base import BaseCorpora, BaseCorpus
+from atap_corpus.corpus.corpus import DataFrameCorpus
 from atap_corpus.utils import format_dunder_str
 
 
@@ -11,11 +12,15 @@ class UniqueNameCorpora(BaseCorpora):
     UniqueNameCorpora is a container for BaseCorpus objects that ensures all corpus objects have unique names within the Corpora.
     Additionally, while stored within the Corpora, the rename method of the BaseCorpus objects is replaced with a rename method
     that ensures the new name is unique.
+    The deep memory usage of each corpus is measured when first requested and cached until the columns or DTMs of the
+    corpus change.
     """
     def __init__(self, logger_name: str, corpus: Optional[BaseCorpus | Iterable[BaseCorpus]] = None):
         super().__init__(corpus)
         logger = logging.getLogger(logger_name)
         self._collection = dict()
+        # Maps the corpus name to the key of the corpus state measured and its memory usage in bytes
+        self._memory_usage: dict[str, tuple[Hashable, int]] = dict()
         if corpus is None:
             return
         elif isinstance(corpus, Iterable):
@@ -38,6 +43,8 @@ class UniqueNameCorpora(BaseCorpora):
         old_name = corpus.name
         corpus._name = name
         self._collection[name] = self._collection.pop(old_name)
+        if old_name in self._memory_usage:
+            self._memory_usage[name] = self._memory_usage.pop(old_name)
 
     def add(self, corpus: TCorpus):
         """ Adds a Corpus into the Corpora. Corpus name is used as the name for get(), remove().
@@ -62,6 +69,7 @@ class UniqueNameCorpora(BaseCorpora):
         try:
             self._collection[name].rename = self._collection[name].__ORIG_RENAME
             del self._collection[name]
+            self._memory_usage.pop(name, None)
         except KeyError:
             return
 
@@ -89,6 +97,58 @@ class UniqueNameCorpora(BaseCorpora):
         Clears the Corpora of all corpus objects.
         """
         self._collection = dict()
+        self._memory_usage = dict()
+
+    @staticmethod
+    def _get_memory_key(corpus: TCorpus) -> Hashable:
+        dtms = getattr(corpus, 'dtms', {})
+        return id(corpus), len(corpus), tuple(getattr(corpus, 'metas', ())), tuple(dtms.keys())
+
+    @staticmethod
+    def _measure_memory_usage(corpus: TCorpus) -> int:
+        """
+        A root corpus holds its DataFrame and DTMs, so their deep memory usage is measured. A corpus cloned from another
+        corpus shares the data of its root, so only the memory of its mask is measured. Corpus objects other than
+        DataFrameCorpus objects are not measured.
+        """
+        if not isinstance(corpus, DataFrameCorpus):
+            return 0
+        if not corpus.is_root:
+            return int(corpus._mask.memory_usage(deep=True))
+
+        memory_usage: int = int(corpus._df.memory_usage(deep=True).sum())
+        for dtm in getattr(corpus, 'dtms', {}).values():
+            matrix = dtm.matrix
+            memory_usage += sum(getattr(matrix, part).nbytes for part in ('data', 'indices', 'indptr') if hasattr(matrix, part))
+        return memory_usage
+
+    def get_memory_usage(self, name: str) -> Optional[int]:
+        """
+        Returns the deep memory usage of the corpus with the provided name, including its DTMs.
+        Data that is memory mapped, such as a corpus built out-of-core, is included in the memory usage.
+        :param name: name of the corpus
+        :type name: str
+        :return: the memory usage of the corpus in bytes, or None if no corpus exists with the name
+        :rtype: Optional[int]
+        """
+        corpus: Optional[TCorpus] = self._collection.get(name)
+        if corpus is None:
+            return None
+        memory_key: Hashable = self._get_memory_key(corpus)
+        cached: Optional[tuple[Hashable, int]] = self._memory_usage.get(name)
+        if (cached is not None) and (cached[0] == memory_key):
+            return cached[1]
+
+        memory_usage: int = self._measure_memory_usage(corpus)
+        self._memory_usage[name] = (memory_key, memory_usage)
+        return memory_usage
+
+    def get_total_memory_usage(self) -> int:
+        """
+        :return: the sum of the memory usage of the corpus objects in the Corpora, in bytes
+        :rtype: int
+        """
+        return sum(self.get_memory_usage(name) for name in list(self._collection.keys()))
 
     def __len__(self) -> int:
         """
@@ -0,0 +1,198 @@
+from io import BufferedIOBase
+from os import stat, cpu_count
+from threading import RLock, local
+from typing import Optional
+from zipfile import ZipFile, ZipInfo
+
+
+class _HandleLease:
+    """
+    Holds the ZipFile handle leased by a thread, and returns it to the ZipArchiveIndex when the thread ends or leases a
+    handle of a newer version of the archive.
+    """
+    __slots__ = ('archive_index', 'handle', 'generation')
+
+    def __init__(self, archive_index: 'ZipArchiveIndex', handle: ZipFile, generation: int):
+        self.archive_index: ZipArchiveIndex = archive_index
+        self.handle: ZipFile = handle
+        self.generation: int = generation
+
+    def __del__(self):
+        self.archive_index._return_handle(self.handle, self.generation)
+
+
+class ZipArchiveIndex:
+    """
+    Holds the parsed central directory of a zip archive (the paths of the files within it) and a pool of ZipFile handles
+    that are shared by the ZipFileReference objects of the archive.
+    Parsing the central directory of a large archive is expensive, so the index is only re-read when the modification
+    time or size of the archive changes.
+    A ZipFile handle is not safe to read from concurrently, so each thread that opens a member of the archive is given
+    its own pooled handle. This allows members of the same archive to be decompressed in parallel. A handle is returned
+    to the pool when the thread that leased it ends, e.g. when the executor of a build shuts down, and at most
+    MAX_FREE_HANDLES unused handles, besides the handle holding the central directory, are kept open for later threads.
+    The index can be seeded with a persisted member listing, in which case the archive is not opened until a member is read.
+    """
+    # The maximum number of unused ZipFile handles kept open for reuse
+    MAX_FREE_HANDLES: int = cpu_count() or 1
+
+    def __init__(self, zip_file_path: str):
+        """
+        :param zip_file_path: the path to the zip archive
+        """
+        self.zip_file_path: str = zip_file_path
+        self.archive_stat: Optional[tuple[int, int]] = None
+        self.zip_file: Optional[ZipFile] = None
+        self.member_paths: list[str] = []
+
+        self.lock: RLock = RLock()
+        # Incremented whenever the archive is re-read, so that handles of previous versions of the archive are replaced
+        self.generation: int = 0
+        self.thread_handles: local = local()
+        # Every open handle, whether leased by a thread or free for reuse
+        self.pooled_handles: list[ZipFile] = []
+        self.free_handles: list[ZipFile] = []
+
+    def __getstate__(self):
+        # Locks and ZipFile handles cannot be pickled, e.g. when sent to a process pool, so only the listing is kept
+        return {'zip_file_path': self.zip_file_path, 'archive_stat': self.archive_stat, 'member_paths': self.member_paths}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['zip_file_path'])
+        self.archive_stat = state['archive_stat']
+        self.member_paths = state['member_paths']
+
+    def refresh(self) -> bool:
+        """
+        Re-reads the central directory of the archive if the archive has changed since it was last read.
+        :return: True if the central directory was re-read, False if the index was already up to date
+        :rtype: bool
+        :raises BadZipFile: if the archive is malformed
+        :raises OSError: if the archive cannot be accessed
+        """
+        with self.lock:
+            file_stat = stat(self.zip_file_path)
+            curr_stat: tuple[int, int] = (file_stat.st_size, file_stat.st_mtime_ns)
+            if curr_stat == self.archive_stat:
+                return False
+
+            self.close()
+            zip_file = ZipFile(self.zip_file_path)
+            self.member_paths = [info.filename for info in zip_file.infolist() if not info.is_dir()]
+            self.zip_file = zip_file
+            self.archive_stat = curr_stat
+
+        return True
+
+    def seed(self, archive_stat: tuple[int, int], member_paths: list[str]):
+        """
+        Provides a previously read member listing of the archive. The listing is used by refresh as long as the size and
+        modification time of the archive match the provided archive_stat.
+        :param archive_stat: the size and modification time of the archive when the member listing was read
+        :param member_paths: the paths within the archive of the files held in the archive, excluding directories
+        """
+        with self.lock:
+            self.close()
+            self.archive_stat = archive_stat
+            self.member_paths = member_paths
+
+    def get_archive_stat(self) -> Optional[tuple[int, int]]:
+        """
+        :return: the size and modification time of the archive when the member listing was read, or None if it has not been read
+        :rtype: Optional[tuple[int, int]]
+        """
+        return self.archive_stat
+
+    def get_member_paths(self) -> list[str]:
+        """
+        :return: the paths within the archive of the files held in the archive, excluding directories
+        :rtype: list[str]
+        """
+        return self.member_paths
+
+    def _get_thread_handle(self) -> ZipFile:
+        """
+        Provides the handle leased by the calling thread, leasing a pooled handle if the thread has none for the current
+        version of the archive. Must be called while holding the lock, so the handle cannot be closed while it is used.
+        """
+        lease: Optional[_HandleLease] = getattr(self.thread_handles, 'lease', None)
+        if (lease is not None) and (lease.generation == self.generation):
+            return lease.handle
+
+        if self.zip_file is None:
+            self.refresh()
+        if self.zip_file is None:
+            # The member listing was seeded and is up to date, but the archive has not yet been opened
+            self.zip_file = ZipFile(self.zip_file_path)
+        handle: ZipFile
+        if self.free_handles:
+            handle = self.free_handles.pop()
+        else:
+            # The handle used to read the central directory is reused as the first pooled handle
+            handle = self.zip_file if (self.zip_file not in self.pooled_handles) else ZipFile(self.zip_file_path)
+            self.pooled_handles.append(handle)
+        self.thread_handles.lease = _HandleLease(self, handle, self.generation)
+
+        return handle
+
+    def _return_handle(self, handle: ZipFile, generation: int):
+        with self.lock:
+            if generation != self.generation:
+                # The handle was closed when the archive was re-read or closed
+                return
+            if (handle is self.zip_file) or (len(self.free_handles) < self.MAX_FREE_HANDLES):
+                self.free_handles.append(handle)
+            else:
+                self.pooled_handles.remove(handle)
+                handle.close()
+
+    def open_member(self, internal_path: str) -> BufferedIOBase:
+        """
+        Opens a stream that decompresses the file at the provided path within the archive as it is read.
+        The stream is opened on a ZipFile handle belonging to the calling thread, so this method is thread-safe.
+        :param internal_path: the path within the archive of the file to open
+        :return: the binary stream of the file contents
+        :rtype: BufferedIOBase
+        """
+        # The stream is opened while holding the lock, as an open stream keeps its handle readable if the archive is
+        # closed, but a handle being closed cannot be opened
+        with self.lock:
+            return self._get_thread_handle().open(internal_path)
+
+    def get_member_checksum(self, internal_path: str) -> tuple[int, int]:
+        """
+        Reads the uncompressed size and CRC-32 of a file within the archive from the central directory, re-reading the
+        central directory first if the archive has changed.
+        :param internal_path: the path within the archive of the file
+        :return: a tuple of the uncompressed size and the CRC-32 of the file
+        :rtype: tuple[int, int]
+        :raises KeyError: if the archive holds no file at the provided path
+        """
+        # The handle is taken while the lock is held, so it belongs to the version of the archive just refreshed
+        with self.lock:
+            self.refresh()
+            member_info: ZipInfo = self._get_thread_handle().getinfo(internal_path)
+        return member_info.file_size, member_info.CRC
+
+    def get_pool_size(self) -> int:
+        """
+        :return: the number of ZipFile handles currently open for reading members of the archive
+        :rtype: int
+        """
+        return len(self.pooled_handles)
+
+    def close(self):
+        """
+        Closes all ZipFile handles of the archive. Streams that are already open remain readable until they are closed.
+        The handles will be reopened when the archive is next accessed.
+        """
+        with self.lock:
+            if (self.zip_file is not None) and (self.zip_file not in self.pooled_handles):
+                self.zip_file.close()
+            for handle in self.pooled_handles:
+                handle.close()
+            self.pooled_handles = []
+            self.free_handles = []
+            self.zip_file = None
+            self.archive_stat = None
+            self.generation += 1
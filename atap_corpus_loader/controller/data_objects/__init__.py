@@ -1,6 +1,16 @@
 from .CorpusHeader import CorpusHeader
 from .DataType import DataType
 from .HeaderStrategy import HeaderStrategy
+from .ExecutorType import ExecutorType
+from .StringStorage import StringStorage
+from .DeduplicationMode import DeduplicationMode
+from .FileFilter import FileFilter
+from .PersistentFileIndex import PersistentFileIndex
+from .ReadOnlyBuffer import ReadOnlyBuffer
+from .ZipArchiveIndex import ZipArchiveIndex
 from .FileReference import FileReference, ZipFileReference, FileReferenceFactory
 from .ViewCorpusInfo import ViewCorpusInfo
+from .LinkReport import LinkReport
+from .BuildMetrics import BuildMetrics
+from .DeduplicationReport import DeduplicationReport
 from .UniqueNameCorpora import UniqueNameCorpora
@@ -0,0 +1,29 @@
+from atap_corpus_loader.controller.file_watcher.FileChangeType import FileChangeType
+
+
+class FileChange:
+    """
+    Represents a single change to a file or directory within the watched directory.
+    """
+    __slots__ = ('path', 'change_type', 'is_dir')
+
+    def __init__(self, path: str, change_type: FileChangeType, is_dir: bool = False):
+        """
+        :param path: the path of the file or directory that changed
+        :param change_type: the kind of change that occurred
+        :param is_dir: True if the path refers to a directory, False otherwise
+        """
+        self.path: str = path
+        self.change_type: FileChangeType = change_type
+        self.is_dir: bool = is_dir
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}: {self.change_type} {self.path}"
+
+    def __eq__(self, other):
+        if type(other) is not FileChange:
+            return False
+        return (self.path, self.change_type, self.is_dir) == (other.path, other.change_type, other.is_dir)
+
+    def __hash__(self):
+        return hash((self.path, self.change_type, self.is_dir))
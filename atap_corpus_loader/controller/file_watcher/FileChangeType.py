@@ -0,0 +1,16 @@
+from enum import Enum
+
+
+class FileChangeType(Enum):
+    """
+    Describes the kinds of change to the file system reported by a FileWatcher.
+    ADDED: a file or directory was created or moved into the watched directory
+    REMOVED: a file or directory was deleted or moved out of the watched directory
+    MODIFIED: the contents or attributes of a file or directory were changed
+    """
+    ADDED = "ADDED"
+    REMOVED = "REMOVED"
+    MODIFIED = "MODIFIED"
+
+    def __str__(self):
+        return self.value
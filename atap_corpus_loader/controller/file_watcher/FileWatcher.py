@@ -0,0 +1,87 @@
+import logging
+import traceback
+from abc import ABC, abstractmethod
+from queue import SimpleQueue, Empty
+from threading import Thread, Event
+from typing import Optional
+
+from atap_corpus_loader.controller.file_watcher.FileChange import FileChange
+
+
+class FileWatcher(ABC):
+    """
+    An abstract class whose implementations watch a directory and its subdirectories for changes in a background thread.
+    Changes are queued as FileChange objects, which clients collect using get_changes.
+    Consistent with the DirectoryIndex, hidden files and directories (names beginning with '.') are not watched.
+    """
+    LOGGER_NAME: str = "corpus-loader"
+
+    def __init__(self, root_directory: str):
+        """
+        :param root_directory: the directory to watch, including all subdirectories
+        """
+        self.root_directory: str = root_directory
+        self.change_queue: SimpleQueue = SimpleQueue()
+        self.stop_event: Event = Event()
+        self.thread: Optional[Thread] = None
+
+    @abstractmethod
+    def _run(self):
+        """
+        Watches for changes until stop_event is set, adding changes to the queue using _add_change.
+        Executed in the background thread.
+        """
+        raise NotImplementedError()
+
+    def _run_logged(self):
+        try:
+            self._run()
+        except Exception:
+            logger = logging.getLogger(self.LOGGER_NAME)
+            logger.error(f"Exception in {self.__class__.__name__}: \n{traceback.format_exc()}")
+
+    def _add_change(self, change: FileChange):
+        self.change_queue.put(change)
+
+    def start(self):
+        """
+        Starts watching for changes in a background daemon thread. Has no effect if the watcher is already running.
+        """
+        if self.is_running():
+            return
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run_logged, name=self.__class__.__name__, daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops watching for changes and waits for the background thread to finish.
+        :param timeout: the maximum number of seconds to wait for the background thread to finish. If None, waits indefinitely
+        """
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+        self.thread = None
+
+    def is_running(self) -> bool:
+        return (self.thread is not None) and self.thread.is_alive()
+
+    def has_changes(self) -> bool:
+        """
+        :return: True if there are changes that have not yet been collected using get_changes, False otherwise
+        :rtype: bool
+        """
+        return not self.change_queue.empty()
+
+    def get_changes(self) -> list[FileChange]:
+        """
+        Removes and returns all changes queued since the last call, in the order they were observed.
+        :return: the list of changes observed since the last call
+        :rtype: list[FileChange]
+        """
+        changes: list[FileChange] = []
+        while True:
+            try:
+                changes.append(self.change_queue.get_nowait())
+            except Empty:
+                return changes
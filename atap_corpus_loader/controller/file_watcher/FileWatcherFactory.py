@@ -0,0 +1,28 @@
+import logging
+
+from atap_corpus_loader.controller.file_watcher.FileWatcher import FileWatcher
+from atap_corpus_loader.controller.file_watcher.InotifyFileWatcher import InotifyFileWatcher
+from atap_corpus_loader.controller.file_watcher.PollingFileWatcher import PollingFileWatcher
+
+
+class FileWatcherFactory:
+    """
+    Provides a single public method to create the most efficient FileWatcher available on the current platform.
+    """
+    @staticmethod
+    def get_file_watcher(root_directory: str) -> FileWatcher:
+        """
+        Creates an InotifyFileWatcher where the inotify API is available, falling back to a PollingFileWatcher otherwise.
+        The returned FileWatcher has not been started.
+        :param root_directory: the directory to watch, including all subdirectories
+        :return: a FileWatcher for the provided directory
+        :rtype: FileWatcher
+        """
+        if InotifyFileWatcher.is_available():
+            try:
+                return InotifyFileWatcher(root_directory)
+            except OSError as e:
+                logger = logging.getLogger(FileWatcher.LOGGER_NAME)
+                logger.warning(f"Falling back to polling for file changes, inotify could not be initialised: {e}")
+
+        return PollingFileWatcher(root_directory)
@@ -0,0 +1,253 @@
+import ctypes
+import ctypes.util
+import logging
+import struct
+import sys
+from errno import EACCES, EINTR, ENOENT, ENOTDIR
+from os import close, read, fsencode, fsdecode, scandir, stat
+from os.path import join, isdir
+from select import poll, POLLIN
+from typing import Optional
+
+from atap_corpus_loader.controller.file_watcher.FileChange import FileChange
+from atap_corpus_loader.controller.file_watcher.FileChangeType import FileChangeType
+from atap_corpus_loader.controller.file_watcher.FileWatcher import FileWatcher
+
+
+class InotifyFileWatcher(FileWatcher):
+    """
+    A FileWatcher that uses the Linux inotify API, accessed through ctypes, to receive change notifications from the kernel.
+    A watch is added for every non-hidden directory, so no work is done while the file system is unchanged.
+    If the kernel event queue overflows, a MODIFIED change for the root directory is queued to signal that a full rescan is required.
+    When a directory is moved, the watches of the directory and its subdirectories are removed, and if it is moved within
+    the root directory, they are added again under the new path, as inotify reports changes by watch rather than by path.
+    If a watch cannot be added, such as when the user's inotify watch limit is reached, changes within that directory
+    would be missed, so the watcher stops rather than report an incomplete set of changes. If this happens while running,
+    a MODIFIED change for the root directory is queued first. Clients fall back to checking the directories for changes
+    once the watcher is no longer running.
+    """
+    IN_MODIFY: int = 0x00000002
+    IN_ATTRIB: int = 0x00000004
+    IN_CLOSE_WRITE: int = 0x00000008
+    IN_MOVED_FROM: int = 0x00000040
+    IN_MOVED_TO: int = 0x00000080
+    IN_CREATE: int = 0x00000100
+    IN_DELETE: int = 0x00000200
+    IN_DELETE_SELF: int = 0x00000400
+    IN_MOVE_SELF: int = 0x00000800
+    IN_Q_OVERFLOW: int = 0x00004000
+    IN_IGNORED: int = 0x00008000
+    IN_ONLYDIR: int = 0x01000000
+    IN_ISDIR: int = 0x40000000
+    IN_NONBLOCK: int = 0o4000
+    IN_CLOEXEC: int = 0o2000000
+
+    WATCH_MASK: int = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE |
+                       IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+    EVENT_HEADER = struct.Struct('iIII')
+    READ_SIZE: int = 64 * 1024
+    # The number of seconds between checks of the stop event and, if the root directory is missing, its existence
+    POLL_TIMEOUT: float = 1.0
+
+    @staticmethod
+    def is_available() -> bool:
+        """
+        :return: True if the inotify API is available on this platform, False otherwise
+        :rtype: bool
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        return InotifyFileWatcher._load_libc() is not None
+
+    @staticmethod
+    def _load_libc() -> Optional[ctypes.CDLL]:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except (OSError, AttributeError):
+            return None
+        return libc
+
+    def __init__(self, root_directory: str):
+        """
+        :param root_directory: the directory to watch, including all subdirectories
+        :raises OSError: if the inotify API is unavailable or an inotify instance cannot be created
+        """
+        super().__init__(root_directory)
+        self.libc: Optional[ctypes.CDLL] = self._load_libc()
+        if self.libc is None:
+            raise OSError("The inotify API is not available on this platform")
+        self.inotify_fd: int = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.inotify_fd < 0:
+            raise OSError(ctypes.get_errno(), "Failed to create an inotify instance")
+        # Maps watch descriptors to the directory paths they correspond to
+        self.watched_dirs: dict[int, str] = {}
+        # Maps watched directory paths to their device and inode numbers, which guard against directory cycles
+        self.watched_dir_ids: dict[str, tuple[int, int]] = {}
+        self.watched_ids: set[tuple[int, int]] = set()
+        # The error raised when a watch could not be added, after which changes may be missed
+        self.watch_error: Optional[OSError] = None
+
+    def _add_watch(self, dir_path: str) -> bool:
+        try:
+            dir_stat = stat(dir_path)
+        except OSError:
+            return False
+        dir_id: tuple[int, int] = (dir_stat.st_dev, dir_stat.st_ino)
+        if dir_id in self.watched_ids:
+            return False
+        watch_desc: int = self.libc.inotify_add_watch(self.inotify_fd, fsencode(dir_path), self.WATCH_MASK)
+        if watch_desc < 0:
+            errno: int = ctypes.get_errno()
+            # A directory that was removed before being watched or cannot be read has no changes to miss
+            if (errno not in (ENOENT, ENOTDIR, EACCES)) and (self.watch_error is None):
+                self.watch_error = OSError(errno, f"Failed to watch directory {dir_path}")
+            return False
+        self.watched_dirs[watch_desc] = dir_path
+        self.watched_dir_ids[dir_path] = dir_id
+        self.watched_ids.add(dir_id)
+        return True
+
+    def _add_watches_recursive(self, dir_path: str, report_added: bool):
+        """
+        Adds watches for the directory and all non-hidden subdirectories.
+        If report_added is True, ADDED changes are queued for the contents found, as they may have been created before
+        the watch was added.
+        """
+        dir_stack: list[str] = [dir_path]
+        while dir_stack:
+            curr_dir: str = dir_stack.pop()
+            if not self._add_watch(curr_dir):
+                continue
+            try:
+                with scandir(curr_dir) as dir_iter:
+                    for entry in dir_iter:
+                        if entry.name.startswith('.'):
+                            continue
+                        try:
+                            is_dir: bool = entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if report_added:
+                            self._add_change(FileChange(entry.path, FileChangeType.ADDED, is_dir))
+                        if is_dir:
+                            dir_stack.append(entry.path)
+            except OSError:
+                continue
+
+    def _remove_watched_dir(self, watch_desc: int):
+        dir_path: Optional[str] = self.watched_dirs.pop(watch_desc, None)
+        if dir_path is not None:
+            self.watched_ids.discard(self.watched_dir_ids.pop(dir_path, None))
+
+    def _remove_watches_recursive(self, dir_path: str):
+        """
+        Removes the watches for the directory and all watched subdirectories, so their ids can be watched again under a new path.
+        """
+        dir_prefix: str = join(dir_path, '')
+        for watch_desc, watched_path in list(self.watched_dirs.items()):
+            if (watched_path == dir_path) or watched_path.startswith(dir_prefix):
+                self.libc.inotify_rm_watch(self.inotify_fd, watch_desc)
+                self._remove_watched_dir(watch_desc)
+
+    def _handle_event(self, watch_desc: int, mask: int, name: str):
+        if mask & self.IN_Q_OVERFLOW:
+            self._add_change(FileChange(self.root_directory, FileChangeType.MODIFIED, is_dir=True))
+            return
+        if mask & self.IN_IGNORED:
+            self._remove_watched_dir(watch_desc)
+            return
+        dir_path: Optional[str] = self.watched_dirs.get(watch_desc)
+        if dir_path is None:
+            return
+        if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+            if dir_path == self.root_directory:
+                self._add_change(FileChange(dir_path, FileChangeType.REMOVED, is_dir=True))
+            return
+        if name.startswith('.'):
+            return
+
+        path: str = join(dir_path, name)
+        is_dir: bool = bool(mask & self.IN_ISDIR)
+        if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+            self._add_change(FileChange(path, FileChangeType.ADDED, is_dir))
+            if is_dir:
+                self._add_watches_recursive(path, report_added=True)
+        elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+            self._add_change(FileChange(path, FileChangeType.REMOVED, is_dir))
+            if is_dir and (mask & self.IN_MOVED_FROM):
+                # The watches stay attached to the moved directory, so are removed and added again if moved within the root
+                self._remove_watches_recursive(path)
+        elif mask & (self.IN_MODIFY | self.IN_ATTRIB | self.IN_CLOSE_WRITE):
+            self._add_change(FileChange(path, FileChangeType.MODIFIED, is_dir))
+
+    def _log_watch_error(self):
+        logger = logging.getLogger(self.LOGGER_NAME)
+        logger.warning(f"Stopped watching for file changes, a directory could not be watched: {self.watch_error}")
+
+    def _read_events(self):
+        try:
+            data: bytes = read(self.inotify_fd, self.READ_SIZE)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            if e.errno == EINTR:
+                return
+            raise
+        offset: int = 0
+        header_size: int = self.EVENT_HEADER.size
+        while offset + header_size <= len(data):
+            watch_desc, mask, _, name_len = self.EVENT_HEADER.unpack_from(data, offset)
+            name_bytes: bytes = data[offset + header_size:offset + header_size + name_len]
+            name: str = fsdecode(name_bytes.rstrip(b'\0'))
+            self._handle_event(watch_desc, mask, name)
+            offset += header_size + name_len
+
+    def _run(self):
+        # poll is used rather than select, as select cannot wait on file descriptors numbered above FD_SETSIZE
+        poller = poll()
+        poller.register(self.inotify_fd, POLLIN)
+        try:
+            while not self.stop_event.is_set():
+                if (self.root_directory not in self.watched_dir_ids) and isdir(self.root_directory):
+                    # The root directory did not exist when the watcher was started, or has since been recreated
+                    self._add_change(FileChange(self.root_directory, FileChangeType.ADDED, is_dir=True))
+                    self._add_watches_recursive(self.root_directory, report_added=True)
+
+                if poller.poll(self.POLL_TIMEOUT * 1000):
+                    self._read_events()
+
+                if self.watch_error is not None:
+                    # Changes within the unwatched directories may have been missed, so a full rescan is required
+                    self._log_watch_error()
+                    self._add_change(FileChange(self.root_directory, FileChangeType.MODIFIED, is_dir=True))
+                    return
+        finally:
+            close(self.inotify_fd)
+            self.inotify_fd = -1
+
+    def start(self):
+        """
+        Adds watches for the root directory and starts receiving change notifications in a background daemon thread.
+        If a watch cannot be added, the background thread is not started.
+        """
+        if self.is_running():
+            return
+        if self.inotify_fd < 0:
+            self.inotify_fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if self.inotify_fd < 0:
+                raise OSError(ctypes.get_errno(), "Failed to create an inotify instance")
+            self.watched_dirs = {}
+            self.watched_dir_ids = {}
+            self.watched_ids = set()
+        self.watch_error = None
+        # Watches for the existing directories are added before returning, so no changes made after start are missed
+        self._add_watches_recursive(self.root_directory, report_added=False)
+        if self.watch_error is not None:
+            self._log_watch_error()
+            close(self.inotify_fd)
+            self.inotify_fd = -1
+            return
+        super().start()
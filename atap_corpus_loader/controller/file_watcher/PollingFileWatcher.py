@@ -0,0 +1,86 @@
+from os import scandir, stat
+
+from atap_corpus_loader.controller.file_watcher.FileChange import FileChange
+from atap_corpus_loader.controller.file_watcher.FileChangeType import FileChangeType
+from atap_corpus_loader.controller.file_watcher.FileWatcher import FileWatcher
+
+
+class PollingFileWatcher(FileWatcher):
+    """
+    A FileWatcher that detects changes by periodically comparing the modification time and size of every file and
+    directory against the previous poll. Used where no change notification backend is available.
+    Polling is performed in the background thread, so it does not block the caller, but its cost grows with the number of files.
+    """
+    def __init__(self, root_directory: str, poll_interval: float = 2.0):
+        """
+        :param root_directory: the directory to watch, including all subdirectories
+        :param poll_interval: the number of seconds between polls
+        """
+        super().__init__(root_directory)
+        self.poll_interval: float = poll_interval
+        self.prev_snapshot: dict[str, tuple[int, int, bool]] = {}
+
+    def _take_snapshot(self) -> dict[str, tuple[int, int, bool]]:
+        """
+        :return: a mapping of the paths of all non-hidden files and directories to their modification time, size, and whether they are a directory
+        :rtype: dict[str, tuple[int, int, bool]]
+        """
+        snapshot: dict[str, tuple[int, int, bool]] = {}
+        visited_dirs: set[tuple[int, int]] = set()
+        dir_stack: list[str] = [self.root_directory]
+        while dir_stack:
+            dir_path: str = dir_stack.pop()
+            try:
+                dir_stat = stat(dir_path)
+            except OSError:
+                continue
+            dir_id: tuple[int, int] = (dir_stat.st_dev, dir_stat.st_ino)
+            if dir_id in visited_dirs:
+                continue
+            visited_dirs.add(dir_id)
+            if dir_path != self.root_directory:
+                snapshot[dir_path] = (dir_stat.st_mtime_ns, dir_stat.st_size, True)
+
+            try:
+                with scandir(dir_path) as dir_iter:
+                    for entry in dir_iter:
+                        if entry.name.startswith('.'):
+                            continue
+                        try:
+                            if entry.is_dir():
+                                dir_stack.append(entry.path)
+                                continue
+                            entry_stat = entry.stat()
+                        except OSError:
+                            continue
+                        snapshot[entry.path] = (entry_stat.st_mtime_ns, entry_stat.st_size, False)
+            except OSError:
+                continue
+
+        return snapshot
+
+    def _run(self):
+        prev_snapshot: dict[str, tuple[int, int, bool]] = self.prev_snapshot
+        self.prev_snapshot = {}
+        while not self.stop_event.wait(self.poll_interval):
+            curr_snapshot: dict[str, tuple[int, int, bool]] = self._take_snapshot()
+            for path, (mtime_ns, size, is_dir) in curr_snapshot.items():
+                prev_entry = prev_snapshot.get(path)
+                if prev_entry is None:
+                    self._add_change(FileChange(path, FileChangeType.ADDED, is_dir))
+                elif prev_entry != (mtime_ns, size, is_dir):
+                    self._add_change(FileChange(path, FileChangeType.MODIFIED, is_dir))
+            for path, (_, _, is_dir) in prev_snapshot.items():
+                if path not in curr_snapshot:
+                    self._add_change(FileChange(path, FileChangeType.REMOVED, is_dir))
+            prev_snapshot = curr_snapshot
+
+    def start(self):
+        """
+        Takes the initial snapshot and starts polling for changes in a background daemon thread.
+        """
+        if self.is_running():
+            return
+        # The initial snapshot is taken before returning, so no changes made after start are missed
+        self.prev_snapshot = self._take_snapshot()
+        super().start()
@@ -0,0 +1,6 @@
+from .FileChangeType import FileChangeType
+from .FileChange import FileChange
+from .FileWatcher import FileWatcher
+from .PollingFileWatcher import PollingFileWatcher
+from .InotifyFileWatcher import InotifyFileWatcher
+from .FileWatcherFactory import FileWatcherFactory
@@ -0,0 +1,143 @@
+from os import makedirs, remove
+from os.path import join, abspath
+from typing import Iterable, Iterator
+from uuid import uuid4
+
+from pandas import DataFrame, StringDtype, Int64Dtype, ArrowDtype
+
+from atap_corpus_loader.controller.data_objects import StringStorage
+from atap_corpus_loader.controller.data_objects.BuildMetrics import measure_stage
+from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
+
+
+class ArrowSpillStore:
+    """
+    Streams DataFrame chunks to Arrow IPC files within a spill directory, so that DataFrames larger than memory can be
+    assembled one chunk at a time. Each spill file is written with the schema of the first chunk written to it.
+    Text columns are stored as large strings and category columns are stored as their values, as the dictionaries of
+    category columns can differ between chunks. Category columns are restored when the chunks are read back.
+    Spilled files can be read back one chunk at a time using iter_dataframes, or as a whole using read_dataframe, in
+    which case the text columns remain memory mapped rather than being read into memory. Text columns read one chunk at
+    a time are read into the provided string storage.
+    pyarrow is only required when a spill store is created.
+    """
+    FILE_EXTENSION: str = "arrow"
+
+    def __init__(self, spill_directory: str, string_storage: StringStorage = StringStorage.PYTHON):
+        """
+        :param spill_directory: the directory to hold the spill files. Created if it does not exist
+        :param string_storage: the storage of the text columns of chunks read using iter_dataframes
+        :raises FileLoadError: if pyarrow is not installed
+        """
+        try:
+            import pyarrow
+            import pyarrow.ipc
+        except ImportError:
+            raise FileLoadError("Building a corpus out-of-core requires the pyarrow package. Install pyarrow, e.g. with the arrow extra, or remove the spill directory")
+        self.pa = pyarrow
+        self.spill_directory: str = abspath(spill_directory)
+        self.string_storage: StringStorage = string_storage
+        makedirs(self.spill_directory, exist_ok=True)
+        # The names of the category columns of each spill file
+        self.category_columns: dict[str, list[str]] = {}
+
+    def create_spill_path(self) -> str:
+        """
+        :return: a new unique path within the spill directory
+        :rtype: str
+        """
+        return join(self.spill_directory, f"spill-{uuid4().hex}.{self.FILE_EXTENSION}")
+
+    def _get_schema(self, df: DataFrame):
+        schema = self.pa.Schema.from_pandas(df, preserve_index=False).remove_metadata()
+        for i, field in enumerate(schema):
+            if self.pa.types.is_string(field.type) or self.pa.types.is_dictionary(field.type):
+                schema = schema.set(i, field.with_type(self.pa.large_string()))
+        return schema
+
+    def write_dataframes(self, spill_path: str, dataframes: Iterable[DataFrame]) -> int:
+        """
+        Writes the DataFrame objects to the spill file at spill_path as they are provided. All DataFrame objects must
+        have the same columns. If no DataFrame objects are provided, no file is written.
+        :param spill_path: the path to write the spill file to, as provided by create_spill_path
+        :param dataframes: the DataFrame objects to write, in order
+        :return: the number of rows written
+        :rtype: int
+        """
+        writer = None
+        schema = None
+        num_rows: int = 0
+        try:
+            for df in dataframes:
+                category_columns: list[str] = [col for col, dtype in df.dtypes.items() if dtype == 'category']
+                if len(category_columns):
+                    df = df.astype({col: 'string' for col in category_columns})
+                if writer is None:
+                    schema = self._get_schema(df)
+                    self.category_columns[spill_path] = category_columns
+                    writer = self.pa.ipc.new_file(spill_path, schema)
+                with measure_stage('spill_write'):
+                    writer.write_batch(self.pa.RecordBatch.from_pandas(df, schema=schema, preserve_index=False))
+                num_rows += len(df)
+        except Exception:
+            if writer is not None:
+                writer.close()
+                self.remove(spill_path)
+            raise
+        if writer is not None:
+            writer.close()
+
+        return num_rows
+
+    def _to_pandas_dtype(self, arrow_type, memory_mapped: bool):
+        if self.pa.types.is_large_string(arrow_type):
+            return ArrowDtype(arrow_type) if memory_mapped else StringDtype(self.string_storage.value)
+        if self.pa.types.is_integer(arrow_type):
+            return Int64Dtype()
+        return None
+
+    def _restore_categories(self, spill_path: str, df: DataFrame) -> DataFrame:
+        category_columns: list[str] = self.category_columns.get(spill_path, [])
+        if len(category_columns):
+            df = df.astype({col: 'category' for col in category_columns})
+        return df
+
+    def iter_dataframes(self, spill_path: str) -> Iterator[DataFrame]:
+        """
+        Reads the spill file one chunk at a time, in the order the chunks were written.
+        :param spill_path: the path of the spill file
+        :return: an iterator of the DataFrame chunks
+        :rtype: Iterator[DataFrame]
+        """
+        with self.pa.memory_map(spill_path) as source:
+            reader = self.pa.ipc.open_file(source)
+            for i in range(reader.num_record_batches):
+                batch = reader.get_batch(i)
+                df = batch.to_pandas(types_mapper=lambda t: self._to_pandas_dtype(t, memory_mapped=False))
+                yield self._restore_categories(spill_path, df)
+
+    def read_dataframe(self, spill_path: str) -> DataFrame:
+        """
+        Reads the whole spill file as a single DataFrame. Text columns are backed by a memory map of the file rather
+        than read into memory, so the file must not be modified while the DataFrame is in use. The file is closed once
+        read, and the memory map is released once the DataFrame and any columns taken from it are garbage collected.
+        :param spill_path: the path of the spill file
+        :return: the DataFrame held in the spill file
+        :rtype: DataFrame
+        """
+        # The Arrow buffers of the table keep the mapped region alive after the file is closed
+        with self.pa.memory_map(spill_path) as source:
+            table = self.pa.ipc.open_file(source).read_all()
+        df = table.to_pandas(types_mapper=lambda t: self._to_pandas_dtype(t, memory_mapped=True))
+        return self._restore_categories(spill_path, df)
+
+    def remove(self, spill_path: str):
+        """
+        Removes the spill file. On platforms that allow it, this can be done while the file is memory mapped, in which
+        case the space is reclaimed once the memory map is released.
+        """
+        self.category_columns.pop(spill_path, None)
+        try:
+            remove(spill_path)
+        except OSError:
+            pass
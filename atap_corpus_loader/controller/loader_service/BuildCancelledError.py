@@ -0,0 +1,2 @@
+class BuildCancelledError(Exception):
+    pass
@@ -0,0 +1,210 @@
+from heapq import heapify, heappop, heappush
+from os import scandir, stat
+from os.path import dirname, normpath
+from typing import Optional, Iterator
+
+from atap_corpus_loader.controller.data_objects import PersistentFileIndex
+from atap_corpus_loader.controller.file_watcher import FileChange, FileChangeType
+
+
+class DirectoryEntry:
+    """
+    The cached listing of a single directory, valid while the modification time of the directory is unchanged.
+    """
+    __slots__ = ('dir_id', 'mtime_ns', 'file_paths', 'subdir_paths')
+
+    def __init__(self, dir_id: tuple[int, int], mtime_ns: int, file_paths: list[str], subdir_paths: list[str]):
+        self.dir_id: tuple[int, int] = dir_id
+        self.mtime_ns: int = mtime_ns
+        self.file_paths: list[str] = file_paths
+        self.subdir_paths: list[str] = subdir_paths
+
+
+class DirectoryIndex:
+    """
+    Maintains a sorted list of the paths of all files under a root directory.
+    The listing of each directory is cached along with the modification time of the directory. The modification time of
+    a directory changes when an entry is added, removed, or renamed within it, so on refresh only directories whose
+    modification time has changed are re-listed. When nothing has changed, the previously sorted listing is reused.
+    The listing can also be iterated lazily in sorted order using iter_file_paths, which avoids sorting the full listing.
+    Consistent with glob, hidden files and directories (names beginning with '.') are excluded.
+    When the index is watched, the changes reported by a FileWatcher are provided using apply_changes and only the
+    directories affected by those changes are re-listed, so no directories need to be checked on refresh.
+    If a PersistentFileIndex is provided, the directory listings are seeded from and saved to it, so a new session only
+    needs to validate the modification time of each directory rather than re-list the whole tree.
+    """
+    def __init__(self, root_directory: str, persistent_index: Optional[PersistentFileIndex] = None):
+        """
+        :param root_directory: the directory to index, including all subdirectories
+        :param persistent_index: the PersistentFileIndex used to seed and persist directory listings. If None, listings are not persisted
+        """
+        self.root_directory: str = root_directory
+        self.persistent_index: Optional[PersistentFileIndex] = persistent_index
+        self.dir_entries: dict[str, DirectoryEntry] = {}
+        if persistent_index is not None:
+            for dir_path, dir_id, mtime_ns, file_paths, subdir_paths in persistent_index.load_directories(root_directory):
+                self.dir_entries[dir_path] = DirectoryEntry(dir_id, mtime_ns, file_paths, subdir_paths)
+        # Built from the directory entries when first requested after the listing changes
+        self.sorted_file_paths: Optional[list[str]] = None
+        # Incremented whenever the listing changes, allowing clients to cache values derived from the listing
+        self.version: int = 0
+
+        self.watched: bool = False
+        self.dirty_dirs: set[str] = set()
+        self.needs_full_refresh: bool = True
+
+    def set_watched(self, watched: bool):
+        """
+        :param watched: if True, the index relies on the changes provided using apply_changes rather than checking the modification time of each directory on refresh
+        """
+        self.watched = watched
+        self.needs_full_refresh = True
+
+    def _get_dir_key(self, dir_path: str) -> str:
+        if normpath(dir_path) == normpath(self.root_directory):
+            return self.root_directory
+        return dir_path
+
+    def apply_changes(self, changes: list[FileChange]):
+        """
+        Marks the directories affected by the provided changes to be re-listed on the next refresh.
+        A change to the root directory itself, such as when the FileWatcher has missed changes, causes the next refresh to check every directory.
+        :param changes: the changes reported by the FileWatcher watching the root directory
+        """
+        for change in changes:
+            change_path: str = self._get_dir_key(change.path)
+            if change_path == self.root_directory:
+                self.needs_full_refresh = True
+                continue
+            if change.is_dir and (change.change_type == FileChangeType.MODIFIED):
+                self.dirty_dirs.add(change_path)
+            if change.change_type != FileChangeType.MODIFIED:
+                # Adding or removing an entry changes the listing of its parent directory
+                self.dirty_dirs.add(self._get_dir_key(dirname(change.path)))
+
+    @staticmethod
+    def _scan_directory(dir_path: str, dir_id: tuple[int, int], mtime_ns: int) -> DirectoryEntry:
+        file_paths: list[str] = []
+        subdir_paths: list[str] = []
+        try:
+            with scandir(dir_path) as dir_iter:
+                for entry in dir_iter:
+                    if entry.name.startswith('.'):
+                        continue
+                    try:
+                        is_dir: bool = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        subdir_paths.append(entry.path)
+                    else:
+                        file_paths.append(entry.path)
+        except OSError:
+            pass
+
+        return DirectoryEntry(dir_id, mtime_ns, file_paths, subdir_paths)
+
+    def refresh(self) -> bool:
+        """
+        Brings the index up to date with the file system, re-listing only the directories that have changed.
+        If the index is watched, only the directories affected by the applied changes are checked.
+        :return: True if the listing changed, False otherwise
+        :rtype: bool
+        """
+        trust_entries: bool = self.watched and not self.needs_full_refresh
+        if trust_entries and (len(self.dirty_dirs) == 0):
+            return False
+        dirty_dirs: set[str] = self.dirty_dirs
+        self.dirty_dirs = set()
+        self.needs_full_refresh = False
+
+        changed: bool = False
+        updated_entries: dict[str, DirectoryEntry] = {}
+        visited_dirs: set[tuple[int, int]] = set()
+        dir_stack: list[str] = [self.root_directory]
+        while dir_stack:
+            dir_path: str = dir_stack.pop()
+            dir_entry: Optional[DirectoryEntry] = self.dir_entries.get(dir_path)
+            if trust_entries and (dir_entry is not None) and (dir_path not in dirty_dirs):
+                dir_id: tuple[int, int] = dir_entry.dir_id
+            else:
+                try:
+                    dir_stat = stat(dir_path)
+                except OSError:
+                    continue
+                dir_id = (dir_stat.st_dev, dir_stat.st_ino)
+                if ((dir_entry is None) or (dir_path in dirty_dirs) or (dir_entry.dir_id != dir_id) or
+                        (dir_entry.mtime_ns != dir_stat.st_mtime_ns)):
+                    dir_entry = self._scan_directory(dir_path, dir_id, dir_stat.st_mtime_ns)
+                    changed = True
+            # Symbolic links are followed, so guard against directory cycles
+            if dir_id in visited_dirs:
+                continue
+            visited_dirs.add(dir_id)
+
+            updated_entries[dir_path] = dir_entry
+            dir_stack.extend(dir_entry.subdir_paths)
+
+        if len(updated_entries) != len(self.dir_entries):
+            changed = True
+        if changed and (self.persistent_index is not None):
+            self._persist_entries(self.dir_entries, updated_entries)
+        self.dir_entries = updated_entries
+
+        if changed:
+            self.sorted_file_paths = None
+            self.version += 1
+
+        return changed
+
+    def _persist_entries(self, prev_entries: dict[str, DirectoryEntry], updated_entries: dict[str, DirectoryEntry]):
+        # Entries that were not re-listed are the same objects as before, so only new objects need to be saved
+        updated_dirs = [(dir_path, entry.dir_id, entry.mtime_ns, entry.file_paths, entry.subdir_paths)
+                        for dir_path, entry in updated_entries.items() if prev_entries.get(dir_path) is not entry]
+        removed_dir_paths: list[str] = [dir_path for dir_path in prev_entries if dir_path not in updated_entries]
+        self.persistent_index.save_directories(self.root_directory, updated_dirs, removed_dir_paths)
+
+    def get_file_paths(self) -> list[str]:
+        """
+        :return: the sorted paths of all files within the indexed directory, as of the last refresh
+        :rtype: list[str]
+        """
+        if self.sorted_file_paths is None:
+            file_paths: list[str] = [path for entry in self.dir_entries.values() for path in entry.file_paths]
+            file_paths.sort()
+            self.sorted_file_paths = file_paths
+        return self.sorted_file_paths
+
+    def iter_file_paths(self) -> Iterator[str]:
+        """
+        Lazily yields the paths of all files within the indexed directory, as of the last refresh, in the same sorted
+        order as get_file_paths. The paths within a directory all share the directory path as a prefix, so they sort after
+        it. A directory is therefore only expanded when it is the smallest remaining path, and the first paths can be
+        yielded without sorting the full listing.
+        :return: an iterator of the sorted file paths
+        :rtype: Iterator[str]
+        """
+        if self.sorted_file_paths is not None:
+            yield from self.sorted_file_paths
+            return
+
+        dir_entries: dict[str, DirectoryEntry] = self.dir_entries
+        root_entry: Optional[DirectoryEntry] = dir_entries.get(self.root_directory)
+        if root_entry is None:
+            return
+        pending_paths: list[tuple[str, bool]] = [(path, False) for path in root_entry.file_paths]
+        pending_paths.extend((path, True) for path in root_entry.subdir_paths)
+        heapify(pending_paths)
+        while pending_paths:
+            path, is_dir = heappop(pending_paths)
+            if not is_dir:
+                yield path
+                continue
+            # Directories excluded by the cycle guard have no entry
+            dir_entry: Optional[DirectoryEntry] = dir_entries.get(path)
+            if dir_entry is None:
+                continue
+            for file_path in dir_entry.file_paths:
+                heappush(pending_paths, (file_path, False))
+            for subdir_path in dir_entry.subdir_paths:
+                heappush(pending_paths, (subdir_path, True))
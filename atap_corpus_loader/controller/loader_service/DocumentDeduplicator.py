@@ -0,0 +1,124 @@
+from collections import defaultdict
+from hashlib import blake2b
+from typing import Optional, Hashable
+
+from numpy import ndarray, fromiter
+from pandas import DataFrame, Series
+from pandas.util import hash_pandas_object
+
+from atap_corpus_loader.controller.data_objects import FileReference, DeduplicationMode, DeduplicationReport
+from atap_corpus_loader.controller.data_objects.FileReference import STREAM_CHUNK_SIZE
+
+
+class DocumentDeduplicator:
+    """
+    Finds duplicate documents during a single corpus build, keeping the first of each set of duplicates.
+    Before parsing, corpus files of the same type and size are hashed by their raw contents, and when dropping
+    duplicates, only the first file with each hash is parsed. Files with a unique size are never read.
+    After parsing, the document of each row is hashed, and rows whose document hash has already been seen in the build
+    are dropped or flagged in the DUPLICATE_COLUMN column. The hashes seen are kept across calls, so the rows of a corpus
+    parsed in chunks are deduplicated across the chunks.
+    Document hashes are 64-bit, so distinct documents are treated as duplicates only in the event of a hash collision.
+    """
+    DUPLICATE_COLUMN: str = 'duplicate'
+    HASH_DIGEST_SIZE: int = 16
+
+    def __init__(self, mode: DeduplicationMode, text_column: str,
+                 previous_content_hashes: Optional[dict[Hashable, bytes]] = None):
+        """
+        :param mode: the way in which duplicate documents are handled. Must not be DeduplicationMode.NONE
+        :param text_column: the name of the column holding the documents
+        :param previous_content_hashes: the content_hashes of a previous build, so unchanged files are not hashed again
+        """
+        self.mode: DeduplicationMode = mode
+        self.text_column: str = text_column
+        self.previous_content_hashes: dict[Hashable, bytes] = {} if previous_content_hashes is None else previous_content_hashes
+        # Maps the fingerprint of each file hashed or reused by this build to the hash of its contents
+        self.content_hashes: dict[Hashable, bytes] = {}
+        self.seen_document_hashes: set[int] = set()
+        self.num_duplicate_files: int = 0
+        self.num_duplicate_rows: int = 0
+
+    def _get_content_hash(self, file_ref: FileReference) -> bytes:
+        fingerprint: Hashable = file_ref.get_fingerprint()
+        content_hash: Optional[bytes] = self.previous_content_hashes.get(fingerprint)
+        if content_hash is None:
+            hasher = blake2b(digest_size=self.HASH_DIGEST_SIZE)
+            with file_ref.open_stream() as file_buf:
+                for chunk in iter(lambda: file_buf.read(STREAM_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+            content_hash = hasher.digest()
+        self.content_hashes[fingerprint] = content_hash
+        return content_hash
+
+    def get_unique_files(self, file_refs: list[FileReference]) -> list[FileReference]:
+        """
+        Removes the files whose contents duplicate an earlier file of the same type. Only removes files when dropping
+        duplicates, as the rows of flagged files must be parsed. Files that cannot be accessed are kept, so the error is
+        raised when they are parsed.
+        :param file_refs: the corpus files, in the order they are parsed
+        :return: the files to be parsed, in the same order
+        :rtype: list[FileReference]
+        """
+        if self.mode != DeduplicationMode.DROP:
+            return file_refs
+
+        size_groups: dict[tuple[str, int], list[int]] = defaultdict(list)
+        for i, file_ref in enumerate(file_refs):
+            try:
+                size_groups[(file_ref.get_extension().lower(), file_ref.get_size())].append(i)
+            except OSError:
+                continue
+
+        duplicate_indices: set[int] = set()
+        for group_indices in size_groups.values():
+            if len(group_indices) < 2:
+                continue
+            seen_hashes: set[bytes] = set()
+            for i in group_indices:
+                try:
+                    content_hash: bytes = self._get_content_hash(file_refs[i])
+                except OSError:
+                    continue
+                if content_hash in seen_hashes:
+                    duplicate_indices.add(i)
+                seen_hashes.add(content_hash)
+
+        self.num_duplicate_files += len(duplicate_indices)
+        return [file_ref for i, file_ref in enumerate(file_refs) if i not in duplicate_indices]
+
+    def _get_duplicated(self, documents: Series) -> ndarray:
+        document_hashes: list[int] = hash_pandas_object(documents, index=False).tolist()
+        duplicated: ndarray = Series(document_hashes, dtype='uint64').duplicated().to_numpy()
+        if len(self.seen_document_hashes):
+            seen_hashes: set[int] = self.seen_document_hashes
+            duplicated |= fromiter((h in seen_hashes for h in document_hashes), dtype=bool, count=len(document_hashes))
+        self.seen_document_hashes.update(document_hashes)
+        return duplicated
+
+    def apply(self, corpus_df: DataFrame) -> DataFrame:
+        """
+        Drops or flags the rows of corpus_df whose document duplicates an earlier row of this or a previous DataFrame.
+        :param corpus_df: the parsed corpus rows, holding the text_column
+        :return: the DataFrame with the duplicate rows dropped, or with a boolean DUPLICATE_COLUMN column appended
+        :rtype: DataFrame
+        """
+        if len(corpus_df.columns) == 0:
+            return corpus_df
+        duplicated: ndarray = self._get_duplicated(corpus_df[self.text_column])
+        self.num_duplicate_rows += int(duplicated.sum())
+        if self.mode == DeduplicationMode.FLAG:
+            corpus_df = corpus_df.copy(deep=False)
+            # Duplicate labels are allowed, as the corpus may hold a column of the same name. Labels are made unique when renamed
+            corpus_df.insert(len(corpus_df.columns), self.DUPLICATE_COLUMN, duplicated, allow_duplicates=True)
+            return corpus_df
+        if not duplicated.any():
+            return corpus_df
+        return corpus_df[~duplicated].reset_index(drop=True)
+
+    def get_report(self) -> DeduplicationReport:
+        """
+        :return: the DeduplicationReport of the duplicates found so far
+        :rtype: DeduplicationReport
+        """
+        return DeduplicationReport(self.mode, self.num_duplicate_files, self.num_duplicate_rows)
@@ -1,12 +1,15 @@
-from glob import iglob
+from heapq import heappop, heappush
 from os import R_OK, access
-from os.path import normpath, sep, isdir, exists
-from typing import Iterator
+from os.path import normpath, sep, exists, join
+from typing import Optional, Iterator
 from zipfile import BadZipFile
 
 from panel.widgets import Tqdm
 
-from atap_corpus_loader.controller.data_objects import FileReference
+from atap_corpus_loader.controller.data_objects import FileReference, FileReferenceFactory, FileFilter, ZipArchiveIndex, \
+    PersistentFileIndex
+from atap_corpus_loader.controller.file_watcher import FileChange, FileWatcher, FileWatcherFactory
+from atap_corpus_loader.controller.loader_service.DirectoryIndex import DirectoryIndex
 from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
 from atap_corpus_loader.controller.loader_service.LoaderService import LoaderService
 
@@ -17,24 +20,112 @@ class FileLoaderService(LoaderService):
     Provides methods that handle the logic of loading files and building the DataFrameCorpus object from the loaded files.
     Maintains a reference to files loaded as corpus files and files loaded as metadata files.
     """
-    def __init__(self, root_directory: str):
+    def __init__(self, root_directory: str, use_mmap: bool = False, file_cache_size: Optional[int] = None,
+                 watch_files: bool = False, index_cache_dir: Optional[str] = None):
         super().__init__()
         self.root_directory: str = self._sanitise_root_dir(root_directory)
+        self.persistent_index: Optional[PersistentFileIndex] = None
+        if index_cache_dir is not None:
+            self.persistent_index = PersistentFileIndex(index_cache_dir)
+        self.file_ref_factory = FileReferenceFactory(use_mmap, file_cache_size, self.is_file_loaded,
+                                                     self.persistent_index)
+        self.directory_index: DirectoryIndex = DirectoryIndex(self.root_directory, self.persistent_index)
+        # The unexpanded file listing, along with the DirectoryIndex version it was built from
+        self.cached_file_refs: Optional[tuple[int, list[FileReference]]] = None
+
+        self.file_watcher: Optional[FileWatcher] = None
+        if watch_files:
+            self.file_watcher = FileWatcherFactory.get_file_watcher(self.root_directory)
+            self.file_watcher.start()
+            self.directory_index.set_watched(True)
+
+    def has_file_changes(self) -> bool:
+        if (self.file_watcher is None) or (not self.file_watcher.is_running()):
+            return True
+        return self.file_watcher.has_changes()
+
+    def _apply_file_changes(self):
+        if self.file_watcher is None:
+            return
+        if not self.file_watcher.is_running():
+            # Changes can no longer be observed, so fall back to checking the directories on each refresh
+            self.directory_index.set_watched(False)
+            self.file_watcher = None
+            return
+
+        changes: list[FileChange] = self.file_watcher.get_changes()
+        if len(changes) == 0:
+            return
+        self.directory_index.apply_changes(changes)
+        for change in changes:
+            if not change.is_dir:
+                self.file_ref_factory.invalidate_path(change.path)
+
+    def stop_watching(self):
+        """
+        Stops the file watcher, if one is running. The directory listing will be checked for changes on each refresh.
+        """
+        if self.file_watcher is None:
+            return
+        self.file_watcher.stop()
+        self.file_watcher = None
+        self.directory_index.set_watched(False)
+
+    def close(self):
+        """
+        Shuts down the workers used to infer headers and stops the file watcher, if one is running.
+        """
+        super().close()
+        self.stop_watching()
 
     def get_all_files(self, expand_archived: bool) -> list[FileReference]:
-        path_iter: Iterator = iglob(f"{self.root_directory}**", recursive=True)
-        all_file_refs: list[FileReference] = []
-        for path in path_iter:
-            if isdir(path):
-                continue
-
-            file_refs: list[FileReference] = self.file_ref_factory.get_file_refs_from_path(path, expand_archived)
-            all_file_refs.extend(file_refs)
+        self._apply_file_changes()
+        self.directory_index.refresh()
+        index_version: int = self.directory_index.version
+        if (not expand_archived) and (self.cached_file_refs is not None) and (self.cached_file_refs[0] == index_version):
+            return list(self.cached_file_refs[1])
 
-        all_file_refs.sort(key=lambda ref: ref.get_path())
+        all_file_refs: list[FileReference] = list(self._iter_indexed_files(expand_archived, None))
+        if not expand_archived:
+            self.cached_file_refs = (index_version, list(all_file_refs))
 
         return all_file_refs
 
+    def iter_files(self, expand_archived: bool, file_filter: Optional[FileFilter] = None) -> Iterator[FileReference]:
+        self._apply_file_changes()
+        self.directory_index.refresh()
+        return self._iter_indexed_files(expand_archived, file_filter)
+
+    def _iter_indexed_files(self, expand_archived: bool, file_filter: Optional[FileFilter]) -> Iterator[FileReference]:
+        # The files within archives sort after the archive path, but may sort after later paths in the directory
+        # listing, so they are held in a heap and merged with the directory listing as it is iterated
+        pending_members: list[tuple[str, str, str]] = []
+        archive_indexes: dict[str, ZipArchiveIndex] = {}
+        for path in self.directory_index.iter_file_paths():
+            while pending_members and (pending_members[0][0] < path):
+                _, zip_file_path, internal_path = heappop(pending_members)
+                yield self.file_ref_factory.get_zip_member_ref(archive_indexes[zip_file_path], internal_path)
+
+            if path.endswith('.zip'):
+                try:
+                    archive_index: ZipArchiveIndex = self.file_ref_factory.get_zip_archive_index(path)
+                except (BadZipFile, OSError):
+                    continue
+                if expand_archived:
+                    archive_indexes[path] = archive_index
+                    for internal_path in archive_index.get_member_paths():
+                        member_path: str = join(path, internal_path)
+                        if (file_filter is None) or file_filter.matches(member_path):
+                            heappush(pending_members, (member_path, path, internal_path))
+                    continue
+
+            if (file_filter is None) or file_filter.matches(path):
+                yield self.file_ref_factory.get_file_ref(path)
+
+        while pending_members:
+            _, zip_file_path, internal_path = heappop(pending_members)
+            yield self.file_ref_factory.get_zip_member_ref(archive_indexes[zip_file_path], internal_path)
+
     def add_corpus_files(self, corpus_filepaths: list[str], include_hidden: bool, tqdm_obj: Tqdm):
         for filepath in tqdm_obj(corpus_filepaths, desc="Loading corpus files", unit="files", leave=False):
             file_ref: FileReference = self.file_ref_factory.get_file_ref(filepath)
@@ -0,0 +1,126 @@
+from numpy import ndarray, arange, argsort, bincount, concatenate, cumsum, repeat, zeros
+from pandas import DataFrame, Series, Categorical, CategoricalDtype, concat
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_datetime64_any_dtype
+
+from atap_corpus_loader.controller.data_objects import LinkReport
+from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
+
+
+class LinkIndex:
+    """
+    A hash index of the link keys of the metadata, used to link corpus rows to metadata rows.
+    The metadata link keys are dictionary encoded as a Categorical, and the metadata rows are grouped by key code, so the
+    metadata rows matching a corpus row are found by looking up the code of its key rather than by hashing the metadata
+    for each join. The index refers to the metadata DataFrame rather than copying it, and holds the distinct keys and an
+    integer array of row positions in addition to it, so it adds to the memory used by the metadata rather than
+    reducing it.
+    The index is built once when the metadata is loaded and can be used to report the match rate and cardinality of the
+    link before joining. Joining produces the same rows as an inner pandas merge, except that missing link keys never
+    match. The joined rows follow the order of the corpus rows, with the metadata rows of each key in their original order.
+    As with a pandas merge, the corpus and metadata link keys must be of the same kind (text, number, datetime, or
+    boolean), otherwise FileLoadError is raised rather than reporting that no rows match.
+    """
+    META_SUFFIX: str = '_meta'
+
+    def __init__(self, meta_df: DataFrame, meta_link_column: str):
+        """
+        :param meta_df: the metadata DataFrame. Must not be modified while the index is in use
+        :param meta_link_column: the name of the column of meta_df holding the link keys
+        """
+        self.meta_df: DataFrame = meta_df
+        self.meta_link_column: str = meta_link_column
+
+        meta_keys: Categorical = Categorical(meta_df[meta_link_column])
+        self.categories = meta_keys.categories
+        self.key_kind: str = LinkIndex._get_key_kind(meta_df[meta_link_column].dtype)
+        # Missing keys have a code of -1 and are excluded from the index
+        codes: ndarray = meta_keys.codes
+        self.key_counts: ndarray = bincount(codes[codes >= 0], minlength=len(self.categories))
+        # The start of each key's group of metadata rows within row_order
+        self.key_starts: ndarray = concatenate(([0], cumsum(self.key_counts)[:-1])).astype(int)
+        # The stable sort keeps the metadata rows of each key in their original order
+        self.row_order: ndarray = argsort(codes, kind='stable')[len(codes) - int(self.key_counts.sum()):]
+
+    def __len__(self) -> int:
+        return len(self.meta_df)
+
+    @staticmethod
+    def _get_key_kind(dtype) -> str:
+        """
+        :return: the kind of values held by link keys of the given dtype. Link keys can only match keys of the same kind
+        :rtype: str
+        """
+        if isinstance(dtype, CategoricalDtype):
+            dtype = dtype.categories.dtype
+        if is_bool_dtype(dtype):
+            return 'boolean'
+        if is_numeric_dtype(dtype):
+            return 'number'
+        if is_datetime64_any_dtype(dtype):
+            return 'datetime'
+        return 'text'
+
+    def get_key_codes(self, corpus_keys: Series) -> ndarray:
+        """
+        :param corpus_keys: the link keys of the corpus rows
+        :return: the code of each corpus link key within the index, or -1 where the key is not found in the metadata
+        :rtype: ndarray
+        :raises FileLoadError: if the corpus link keys are not of the same kind as the metadata link keys
+        """
+        corpus_key_kind: str = LinkIndex._get_key_kind(corpus_keys.dtype)
+        if corpus_key_kind != self.key_kind:
+            raise FileLoadError(f"Corpus linking label values of type {corpus_key_kind} cannot be linked to metadata "
+                                f"linking label values of type {self.key_kind}. Select the same datatype for both "
+                                f"linking labels")
+        return self.categories.get_indexer(corpus_keys)
+
+    def _get_match_counts(self, key_codes: ndarray) -> ndarray:
+        match_counts: ndarray = zeros(len(key_codes), dtype=int)
+        matched = key_codes >= 0
+        match_counts[matched] = self.key_counts[key_codes[matched]]
+        return match_counts
+
+    def get_report(self, corpus_keys: Series) -> LinkReport:
+        """
+        :param corpus_keys: the link keys of the corpus rows
+        :return: the LinkReport summarising how the corpus link keys match the metadata
+        :rtype: LinkReport
+        :raises FileLoadError: if the corpus link keys are not of the same kind as the metadata link keys
+        """
+        match_counts: ndarray = self._get_match_counts(self.get_key_codes(corpus_keys))
+        return LinkReport(num_corpus_rows=len(corpus_keys),
+                          num_matched_rows=int((match_counts > 0).sum()),
+                          num_meta_rows=len(self.meta_df),
+                          num_meta_keys=len(self.categories),
+                          num_duplicate_meta_keys=int((self.key_counts > 1).sum()),
+                          num_linked_rows=int(match_counts.sum()))
+
+    def join(self, corpus_df: DataFrame, corpus_link_column: str) -> DataFrame:
+        """
+        Performs an inner join of the corpus rows with the indexed metadata rows. Columns of the metadata that share a
+        name with a corpus column are suffixed with META_SUFFIX, except for a link column of the same name, which is
+        only included once.
+        :param corpus_df: the corpus DataFrame
+        :param corpus_link_column: the name of the column of corpus_df holding the link keys
+        :return: the joined DataFrame, with a row for each pair of corpus and metadata rows with matching link keys
+        :rtype: DataFrame
+        :raises FileLoadError: if the corpus link keys are not of the same kind as the metadata link keys
+        """
+        key_codes: ndarray = self.get_key_codes(corpus_df[corpus_link_column])
+        match_counts: ndarray = self._get_match_counts(key_codes)
+        corpus_rows: ndarray = repeat(arange(len(corpus_df)), match_counts)
+        # Each corpus row is paired with consecutive metadata rows of its key group, offset from the group start
+        num_linked: int = len(corpus_rows)
+        group_offsets: ndarray = arange(num_linked) - repeat(cumsum(match_counts) - match_counts, match_counts)
+        matched_starts: ndarray = repeat(self.key_starts[key_codes[match_counts > 0]], match_counts[match_counts > 0])
+        meta_rows: ndarray = self.row_order[matched_starts + group_offsets]
+
+        meta_df: DataFrame = self.meta_df
+        if corpus_link_column == self.meta_link_column:
+            meta_df = meta_df.drop(columns=self.meta_link_column)
+        renames: dict[str, str] = {col: f"{col}{self.META_SUFFIX}" for col in meta_df.columns if col in corpus_df.columns}
+
+        linked_corpus: DataFrame = corpus_df.take(corpus_rows).reset_index(drop=True)
+        linked_meta: DataFrame = meta_df.take(meta_rows).reset_index(drop=True).rename(columns=renames)
+
+        return concat([linked_corpus, linked_meta], axis=1)
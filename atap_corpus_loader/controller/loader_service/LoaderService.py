@@ -1,15 +1,30 @@
 from abc import abstractmethod, ABC
+from collections import deque, OrderedDict, Counter
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, ProcessPoolExecutor, BrokenExecutor
+from contextvars import copy_context
 from datetime import datetime
+from itertools import islice
 from keyword import iskeyword
-from typing import Optional, Union
+from os import cpu_count
+from random import Random
+from threading import Event, Lock, RLock
+from typing import Optional, Union, Iterator, Iterable, Callable, Hashable
 
 from atap_corpus.corpus.corpus import DataFrameCorpus
-from pandas import DataFrame, merge, concat
+from pandas import DataFrame, Series, StringDtype, concat, option_context
 from panel.widgets import Tqdm
 
-from atap_corpus_loader.controller.data_objects import FileReference, CorpusHeader, FileReferenceFactory, HeaderStrategy
+from atap_corpus_loader.controller.data_objects import FileReference, CorpusHeader, FileReferenceFactory, HeaderStrategy, \
+    FileFilter, ExecutorType, LinkReport, BuildMetrics, StringStorage, DataType, DeduplicationMode, DeduplicationReport
+from atap_corpus_loader.controller.data_objects.BuildMetrics import measure_stage, get_active_build_metrics
+from atap_corpus_loader.controller.loader_service.ArrowSpillStore import ArrowSpillStore
+from atap_corpus_loader.controller.loader_service.BuildCancelledError import BuildCancelledError
+from atap_corpus_loader.controller.loader_service.DocumentDeduplicator import DocumentDeduplicator
 from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
-from atap_corpus_loader.controller.loader_service.file_loader_strategy import FileLoaderStrategy, FileLoaderFactory
+from atap_corpus_loader.controller.loader_service.LinkIndex import LinkIndex
+from atap_corpus_loader.controller.loader_service.ParsedFileCache import ParsedFileCache
+from atap_corpus_loader.controller.loader_service.file_loader_strategy import FileLoaderStrategy, FileLoaderFactory, \
+    DocumentLoaderStrategy
 
 """
 Some methods in this module utilise Tqdm from the panel library, which breaks the Model-View separation.
@@ -18,19 +33,104 @@ The panel Tqdm is a wrapper for the standard tqdm module and can be replaced if
 """
 
 
+def _no_progress(iterable: Iterable, **_) -> Iterable:
+    """
+    Stands in for the Tqdm object within parallel workers, as the progress bar can only be updated by the calling thread.
+    """
+    return iterable
+
+
+def _parse_file(file_loader: FileLoaderStrategy, headers: list[CorpusHeader],
+                header_strategy: HeaderStrategy, tqdm_obj: Tqdm = _no_progress) -> Union[DataFrame, tuple[str, ...]]:
+    """
+    Parses a single file. Defined at the module level so that it can be executed by a process pool.
+    Files holding a single document are parsed into the values of their row rather than a DataFrame, so that the rows of
+    many files can be collected into a single DataFrame.
+    """
+    if isinstance(file_loader, DocumentLoaderStrategy):
+        return file_loader.get_row_values(DocumentLoaderStrategy.get_included_columns(headers))
+    return file_loader.get_dataframe(headers, header_strategy, tqdm_obj)
+
+
+def _infer_headers(file_loader: FileLoaderStrategy, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
+    """
+    Infers the headers of a single file. Defined at the module level so that it can be executed by a process pool.
+    """
+    return file_loader.get_inferred_headers(header_strategy)
+
+
 class LoaderService(ABC):
     """
     LoaderService is an abstract class whose implementations handle the loading of files and building of a corpus with those files.
     Different implementations of this class are required as files can be accessed in different ways, e.g. via the file system or over a network.
     Constructing a corpus consists of two stages: loading and building. During the loading stage, files can be added to the corpus or meta file list. The build stage finalises the corpus.
     The corpus file list contains the 'document' data (the main text to be analysed) whereas the meta file list does not, and must be associated with the document data.
+    Headers can be inferred and files parsed in parallel using a thread or process pool, as set by set_executor_type.
+    The pool used to infer headers is created when first needed and kept until the executor type changes or the service
+    is closed, so inferring the headers of each selection does not start new workers.
+    The inferred headers of each file are cached against the fingerprint of the file and the header strategy, so only
+    files that are new or have changed are inferred when the loaded files change.
+    If reuse of parsed files is enabled, the parsed contents of the files of the last build are kept, so rebuilding a
+    corpus only parses the files that are new or have changed, or whose selected headers have changed. The kept contents
+    can be bounded in bytes, in which case the least recently used files are dropped first.
+    If a spill directory is set, corpora are built out-of-core, which bounds the memory used while the files are parsed
+    and linked. The built corpus is still held in memory, as DataFrameCorpus copies the DataFrame it is created from.
+    The values of TEXT columns are stored as Python str objects or in Arrow buffers, as set by set_string_storage.
+    Duplicate documents can be dropped or flagged during a build, as set by set_deduplication_mode. The hashes of the
+    corpus file contents are kept until the next build, so unchanged files are not hashed again.
+    The memory used by a build can be estimated from the size of the loaded files before any file is parsed, using
+    estimate_build_memory.
+    The corpus is linked to the metadata using a LinkIndex of the metadata link keys. The index is kept until the loaded
+    metadata files, metadata headers, or metadata link header change, so the link can be reported using get_link_report
+    before building and the build reuses the index rather than parsing the metadata again. When only the metadata link
+    header changes, the index is rebuilt from the metadata already parsed. The link report may be requested from a
+    worker thread, so the index and corpus link keys are only read and replaced while holding link_lock. The LinkIndex
+    is held in addition to the parsed metadata, which it refers to rather than copies.
+    A build can be cancelled by setting the Event provided to build_corpus. The Event is checked before each file and
+    chunk, and a cancelled build raises BuildCancelledError without changing the loaded files.
+    The stages of a build are recorded by the BuildMetrics activated by the caller, if any.
+    A preview of the corpus can be built from a sample of the loaded files using build_preview.
     """
+    # The number of files submitted ahead of the file being read, per worker of a parallel executor
+    PARSE_WINDOW_PER_WORKER: int = 4
+    # The maximum number of files whose inferred headers are cached
+    HEADER_CACHE_SIZE: int = 100000
+    # The maximum number of single document files written to a spill file at once when building out-of-core
+    SPILL_CHUNK_ROWS: int = 10000
+    # The estimated bytes of memory used by a built corpus per byte of the loaded files, allowing for the overhead of
+    # holding each parsed value as a Python object
+    MEMORY_ESTIMATE_FACTOR: float = 2.0
+    # The name given to the corpus built by build_preview
+    PREVIEW_CORPUS_NAME: str = 'Preview'
+    # The seed of the sample of single document files read by build_preview
+    PREVIEW_SEED: int = 0
     def __init__(self):
         self.loaded_corpus_files: set[FileReference] = set()
         self.loaded_meta_files: set[FileReference] = set()
-        # Utilise FileReferenceFactory.clear_cache() if memory overhead is raised as an issue.
-        self.file_ref_factory: FileReferenceFactory = FileReferenceFactory()
+        # Loaded files are pinned so they are never evicted from the FileReferenceFactory cache
+        self.file_ref_factory: FileReferenceFactory = FileReferenceFactory(is_pinned=self.is_file_loaded)
         self.header_strategy: HeaderStrategy = HeaderStrategy.HEADERS
+        self.executor_type: ExecutorType = ExecutorType.SERIAL
+        self.max_workers: Optional[int] = None
+        # Created when headers are first inferred in parallel and shut down by close
+        self.header_executor: Optional[Executor] = None
+        self.header_executor_lock: Lock = Lock()
+        # Maps the fingerprint of a file and a header strategy to the headers inferred, ordered from least to most recently used
+        self.header_cache: OrderedDict[tuple[Hashable, HeaderStrategy], list[CorpusHeader]] = OrderedDict()
+        self.parsed_file_cache: Optional[ParsedFileCache] = None
+        self.spill_directory: Optional[str] = None
+        self.string_storage: StringStorage = StringStorage.PYTHON
+        self.deduplication_mode: DeduplicationMode = DeduplicationMode.NONE
+        # The content hashes of the corpus files of the most recent build, and the report of the duplicates it found
+        self.content_hashes: dict[Hashable, bytes] = {}
+        self.deduplication_report: Optional[DeduplicationReport] = None
+        # The most recently built LinkIndex and the key of the metadata it was built from
+        self.link_index: Optional[LinkIndex] = None
+        self.link_index_key: Optional[Hashable] = None
+        # The most recently read corpus link keys and the key of the corpus files they were read from
+        self.corpus_link_keys: Optional[Series] = None
+        self.corpus_link_keys_key: Optional[Hashable] = None
+        self.link_lock: RLock = RLock()
 
     @abstractmethod
     def get_all_files(self, expand_archived: bool) -> list[FileReference]:
@@ -44,6 +144,45 @@ class LoaderService(ABC):
     def add_meta_files(self, meta_filepaths: list[str], include_hidden: bool, tqdm_obj: Tqdm):
         raise NotImplementedError()
 
+    def iter_files(self, expand_archived: bool, file_filter: Optional[FileFilter] = None) -> Iterator[FileReference]:
+        """
+        Lazily yields the files that match the provided filter, in the same order as get_all_files.
+        Implementations should override this method where the listing can be produced without building the full list.
+        :param expand_archived: if True, the files within archives are listed in place of the archives
+        :param file_filter: the filter the listed files must match. If None, all files are listed
+        :return: an iterator of the matching files, sorted by path
+        :rtype: Iterator[FileReference]
+        """
+        for file_ref in self.get_all_files(expand_archived):
+            if (file_filter is None) or file_filter.matches(file_ref.get_path()):
+                yield file_ref
+
+    def get_files_page(self, expand_archived: bool, offset: int, limit: Optional[int],
+                       file_filter: Optional[FileFilter] = None) -> list[FileReference]:
+        """
+        Provides a page of the files that match the provided filter. Files are sorted by path, so pages are stable
+        while the files are unchanged. Only the files up to the end of the page are listed.
+        :param expand_archived: if True, the files within archives are listed in place of the archives
+        :param offset: the number of matching files to skip
+        :param limit: the maximum number of files in the page. If None, all files after the offset are included
+        :param file_filter: the filter the listed files must match. If None, all files are listed
+        :return: the matching files within the page
+        :rtype: list[FileReference]
+        """
+        if offset < 0:
+            raise ValueError(f"offset argument must be non-negative, instead got {offset}")
+        if (limit is not None) and (limit < 0):
+            raise ValueError(f"limit argument must be non-negative or None, instead got {limit}")
+        stop: Optional[int] = None if limit is None else offset + limit
+        return list(islice(self.iter_files(expand_archived, file_filter), offset, stop))
+
+    def has_file_changes(self) -> bool:
+        """
+        :return: True if the files provided by get_all_files may have changed since it was last called, False otherwise
+        :rtype: bool
+        """
+        return True
+
     def get_header_strategy(self) -> HeaderStrategy:
         return self.header_strategy
 
@@ -58,6 +197,177 @@ class LoaderService(ABC):
         else:
             TypeError(f"strategy argument should be either str or HeaderStrategy, instead got {type(strategy)}")
 
+    def get_executor_type(self) -> ExecutorType:
+        return self.executor_type
+
+    def set_executor_type(self, executor_type: Union[ExecutorType, str], max_workers: Optional[int] = None):
+        if isinstance(executor_type, ExecutorType):
+            self.executor_type = executor_type
+        elif isinstance(executor_type, str):
+            try:
+                self.executor_type = ExecutorType(executor_type)
+            except ValueError:
+                raise ValueError(f'executor_type argument should be a value in the ExecutorType enum, instead got {executor_type}')
+        else:
+            raise TypeError(f"executor_type argument should be either str or ExecutorType, instead got {type(executor_type)}")
+        if (max_workers is not None) and (max_workers < 1):
+            raise ValueError(f"max_workers argument should be a positive integer or None, instead got {max_workers}")
+        self.max_workers = max_workers
+        # Headers inferred after this point use a pool of the new type and size
+        self._discard_header_executor()
+
+    def is_reusing_parsed_files(self) -> bool:
+        return self.parsed_file_cache is not None
+
+    def set_reuse_parsed_files(self, reuse_parsed_files: bool, max_bytes: Optional[int] = None):
+        """
+        :param reuse_parsed_files: if True, the parsed contents of the files of the last build are kept in memory, in addition to the built corpus, and reused by the next build. If False, any kept contents are released
+        :param max_bytes: the maximum memory used by the kept contents in bytes. The least recently used files are dropped first. If None, the kept contents are unbounded
+        """
+        if not reuse_parsed_files:
+            self.parsed_file_cache = None
+        elif self.parsed_file_cache is None:
+            self.parsed_file_cache = ParsedFileCache(max_bytes)
+        else:
+            self.parsed_file_cache.max_bytes = max_bytes
+            if max_bytes is not None:
+                self.parsed_file_cache.trim(max_bytes)
+
+    def trim_parsed_file_cache(self, max_bytes: int):
+        """
+        Drops the least recently used parsed contents kept for reuse until they use at most max_bytes of memory.
+        :param max_bytes: the maximum memory used by the kept contents in bytes
+        """
+        if self.parsed_file_cache is not None:
+            self.parsed_file_cache.trim(max_bytes)
+
+    def get_parsed_file_cache_memory_usage(self) -> int:
+        """
+        :return: the memory used by the parsed contents kept for reuse in bytes, or 0 if parsed files are not reused
+        :rtype: int
+        """
+        if self.parsed_file_cache is None:
+            return 0
+        return self.parsed_file_cache.get_memory_usage()
+
+    def get_spill_directory(self) -> Optional[str]:
+        return self.spill_directory
+
+    def set_spill_directory(self, spill_directory: Optional[str]):
+        """
+        :param spill_directory: if provided, corpora are built out-of-core by streaming the parsed files to spill files within this directory. If None, corpora are built in memory
+        """
+        self.spill_directory = spill_directory
+
+    def get_string_storage(self) -> StringStorage:
+        return self.string_storage
+
+    def set_string_storage(self, string_storage: Union[StringStorage, str]):
+        """
+        Sets the storage used for the values of TEXT columns. Any parsed files and link index kept from previous builds
+        are released, as they hold values in the previous storage.
+        :param string_storage: a value of the StringStorage enum, or its string equivalent
+        :raises ValueError: if string_storage is not a valid StringStorage value, or is PYARROW and pyarrow is not installed
+        """
+        if isinstance(string_storage, str):
+            try:
+                string_storage = StringStorage(string_storage)
+            except ValueError:
+                raise ValueError(f'string_storage argument should be a value in the StringStorage enum, instead got {string_storage}')
+        elif not isinstance(string_storage, StringStorage):
+            raise TypeError(f"string_storage argument should be either str or StringStorage, instead got {type(string_storage)}")
+        if string_storage == StringStorage.PYARROW:
+            try:
+                import pyarrow
+            except ImportError:
+                raise ValueError("Arrow string storage requires the pyarrow package. Install pyarrow or use 'python' string storage")
+
+        self.string_storage = string_storage
+        if self.parsed_file_cache is not None:
+            self.parsed_file_cache.clear()
+        self._clear_link_cache()
+
+    def get_deduplication_mode(self) -> DeduplicationMode:
+        return self.deduplication_mode
+
+    def set_deduplication_mode(self, deduplication_mode: Union[DeduplicationMode, str]):
+        if isinstance(deduplication_mode, DeduplicationMode):
+            self.deduplication_mode = deduplication_mode
+        elif isinstance(deduplication_mode, str):
+            try:
+                self.deduplication_mode = DeduplicationMode(deduplication_mode)
+            except ValueError:
+                raise ValueError(f'deduplication_mode argument should be a value in the DeduplicationMode enum, instead got {deduplication_mode}')
+        else:
+            raise TypeError(f"deduplication_mode argument should be either str or DeduplicationMode, instead got {type(deduplication_mode)}")
+
+    def get_deduplication_report(self) -> Optional[DeduplicationReport]:
+        """
+        :return: the DeduplicationReport of the most recent successful build, or None if that build did not deduplicate
+        :rtype: Optional[DeduplicationReport]
+        """
+        return self.deduplication_report
+
+    def estimate_build_memory(self) -> int:
+        """
+        Estimates the memory used by a corpus built from the loaded files from the size of the files, without parsing
+        them. The estimate is approximate, as the memory used by a parsed file depends on its format and contents.
+        If parsed files are reused, the parsed contents of the files that are not yet cached are also counted, as they are
+        kept after the build. The memory of the files already cached is given by get_parsed_file_cache_memory_usage.
+        :return: the estimated memory usage of the corpus in bytes
+        :rtype: int
+        """
+        loaded_files: list[FileReference] = list(self.loaded_corpus_files | self.loaded_meta_files)
+        build_size: int = LoaderService._get_total_size(loaded_files)
+        if self.parsed_file_cache is not None:
+            uncached_files: list[FileReference] = [ref for ref in loaded_files if not self.parsed_file_cache.has_file(ref)]
+            build_size += LoaderService._get_total_size(uncached_files)
+        return int(build_size * self.MEMORY_ESTIMATE_FACTOR)
+
+    def _get_num_workers(self) -> int:
+        if self.max_workers is not None:
+            return self.max_workers
+        return cpu_count() or 1
+
+    def _create_executor(self) -> Optional[Executor]:
+        """
+        :return: a new Executor of the configured type, or None if files should be parsed serially
+        :rtype: Optional[Executor]
+        """
+        if self.executor_type == ExecutorType.THREAD:
+            return ThreadPoolExecutor(max_workers=self._get_num_workers(), thread_name_prefix="corpus-loader-parse")
+        elif self.executor_type == ExecutorType.PROCESS:
+            return ProcessPoolExecutor(max_workers=self._get_num_workers())
+        return None
+
+    def _get_header_executor(self) -> Optional[Executor]:
+        """
+        :return: the Executor used to infer headers, created on first use, or None if headers should be inferred serially
+        :rtype: Optional[Executor]
+        """
+        with self.header_executor_lock:
+            if self.header_executor is None:
+                self.header_executor = self._create_executor()
+            return self.header_executor
+
+    def _discard_header_executor(self, wait: bool = False):
+        """
+        Shuts down the Executor used to infer headers, if one has been created, so the next inference creates a new one.
+        Inference already submitted to it is left to finish unless wait is True, in which case it is cancelled and waited for.
+        """
+        with self.header_executor_lock:
+            executor: Optional[Executor] = self.header_executor
+            self.header_executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=wait)
+
+    def close(self):
+        """
+        Shuts down the workers used to infer headers. The service can still be used after it is closed, in which case
+        new workers are created when needed.
+        """
+        self._discard_header_executor(wait=True)
+
     def is_corpus_loaded(self) -> bool:
         return len(self.loaded_corpus_files) > 0
 
@@ -70,25 +380,49 @@ class LoaderService(ABC):
     def get_loaded_meta_files(self) -> set[FileReference]:
         return set(f for f in self.loaded_meta_files if not f.is_archive())
 
+    def is_file_loaded(self, file_ref: FileReference) -> bool:
+        return (file_ref in self.loaded_corpus_files) or (file_ref in self.loaded_meta_files)
+
+    def _release_if_unloaded(self, file_ref: FileReference):
+        if not self.is_file_loaded(file_ref):
+            file_ref.release()
+
     def remove_corpus_filepath(self, corpus_filepath: str):
         file_ref: FileReference = self.file_ref_factory.get_file_ref(corpus_filepath)
         if file_ref in self.loaded_corpus_files:
             self.loaded_corpus_files.remove(file_ref)
+            self._release_if_unloaded(file_ref)
 
     def remove_meta_filepath(self, meta_filepath: str):
         file_ref: FileReference = self.file_ref_factory.get_file_ref(meta_filepath)
         if file_ref in self.loaded_meta_files:
             self.loaded_meta_files.remove(file_ref)
+            self._release_if_unloaded(file_ref)
 
     def remove_loaded_corpus_files(self):
+        unloaded_files: list[FileReference] = list(self.loaded_corpus_files)
         self.loaded_corpus_files.clear()
+        for file_ref in unloaded_files:
+            self._release_if_unloaded(file_ref)
 
     def remove_loaded_meta_files(self):
+        unloaded_files: list[FileReference] = list(self.loaded_meta_files)
         self.loaded_meta_files.clear()
+        for file_ref in unloaded_files:
+            self._release_if_unloaded(file_ref)
 
     def remove_all_files(self):
         self.remove_loaded_corpus_files()
         self.remove_loaded_meta_files()
+        self.content_hashes = {}
+        self._clear_link_cache()
+
+    def _clear_link_cache(self):
+        with self.link_lock:
+            self.link_index = None
+            self.link_index_key = None
+            self.corpus_link_keys = None
+            self.corpus_link_keys_key = None
 
     def get_inferred_corpus_headers(self) -> list[CorpusHeader]:
         return self._get_file_headers(self.get_loaded_corpus_files())
@@ -96,27 +430,82 @@ class LoaderService(ABC):
     def get_inferred_meta_headers(self) -> list[CorpusHeader]:
         return self._get_file_headers(self.get_loaded_meta_files())
 
+    @staticmethod
+    def _copy_headers(headers: list[CorpusHeader]) -> list[CorpusHeader]:
+        # Headers are modified by clients, e.g. when the datatype is changed, so cached headers are never shared
+        return [CorpusHeader(header.name, header.datatype, header.include) for header in headers]
+
+    def _get_header_cache_key(self, file_ref: FileReference) -> Optional[tuple[Hashable, HeaderStrategy]]:
+        try:
+            fingerprint: Hashable = file_ref.get_fingerprint()
+        except Exception:
+            # The file cannot be accessed, so the error is raised when its headers are inferred
+            return None
+        return fingerprint, self.header_strategy
+
+    def _get_cached_headers(self, cache_key: Optional[tuple[Hashable, HeaderStrategy]]) -> Optional[list[CorpusHeader]]:
+        if cache_key is None:
+            return None
+        cached_headers: Optional[list[CorpusHeader]] = self.header_cache.get(cache_key)
+        if cached_headers is not None:
+            self.header_cache.move_to_end(cache_key)
+        return cached_headers
+
+    def _add_cached_headers(self, cache_key: Optional[tuple[Hashable, HeaderStrategy]], headers: list[CorpusHeader]):
+        if cache_key is None:
+            return
+        self.header_cache[cache_key] = self._copy_headers(headers)
+        self.header_cache.move_to_end(cache_key)
+        while len(self.header_cache) > self.HEADER_CACHE_SIZE:
+            self.header_cache.popitem(last=False)
+
     def _get_file_headers(self, file_refs: set[FileReference]) -> list[CorpusHeader]:
+        """
+        Infers the headers of each file and checks they are compatible, stopping at the first incompatible file.
+        Files are checked in path order. The headers of files that are unchanged since they were last inferred with the
+        same header strategy are provided by the header cache, and only the remaining files are inferred.
+        If a parallel executor is set, the headers of the following files are inferred concurrently by the header
+        executor, and inference still pending when an incompatible file is found is cancelled.
+        """
         headers: Optional[list[CorpusHeader]] = None
-        for ref in file_refs:
-            file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref)
-            try:
-                path_headers: list[CorpusHeader] = file_loader.get_inferred_headers(self.header_strategy)
-            except UnicodeDecodeError:
-                self.remove_corpus_filepath(ref.get_path())
-                self.remove_meta_filepath(ref.get_path())
-                raise FileLoadError(f"Error loading file at {ref.get_path()}: file is not UTF-8 encoded")
-            except Exception as e:
-                self.remove_corpus_filepath(ref.get_path())
-                self.remove_meta_filepath(ref.get_path())
-                raise FileLoadError(f"Error loading file at {ref.get_path()}: {e}")
+        sorted_refs: list[FileReference] = sorted(file_refs, key=lambda f: f.get_path())
+        cache_keys: list[Optional[tuple[Hashable, HeaderStrategy]]] = [self._get_header_cache_key(ref) for ref in sorted_refs]
+        cached_headers: list[Optional[list[CorpusHeader]]] = [self._get_cached_headers(key) for key in cache_keys]
+        uncached_refs: list[FileReference] = [ref for ref, cached in zip(sorted_refs, cached_headers) if cached is None]
 
-            if headers is None:
-                headers = path_headers
-            elif set(headers) != set(path_headers):
-                self.remove_corpus_filepath(ref.get_path())
-                self.remove_meta_filepath(ref.get_path())
-                raise FileLoadError(f"Incompatible data labels in file: {ref.get_path()}")
+        executor: Optional[Executor] = self._get_header_executor() if len(uncached_refs) > 1 else None
+        submitted_refs = None
+        try:
+            submitted_refs = self._submit_file_loaders(uncached_refs, _infer_headers, (self.header_strategy,),
+                                                       executor, self._get_num_workers())
+            for ref, cache_key, path_headers in zip(sorted_refs, cache_keys, cached_headers):
+                if path_headers is None:
+                    _, future = next(submitted_refs)
+                    try:
+                        path_headers = future.result()
+                    except UnicodeDecodeError:
+                        self.remove_corpus_filepath(ref.get_path())
+                        self.remove_meta_filepath(ref.get_path())
+                        raise FileLoadError(f"Error loading file at {ref.get_path()}: file is not UTF-8 encoded")
+                    except Exception as e:
+                        if isinstance(e, BrokenExecutor):
+                            # A pool whose worker has terminated cannot run further tasks
+                            self._discard_header_executor()
+                        self.remove_corpus_filepath(ref.get_path())
+                        self.remove_meta_filepath(ref.get_path())
+                        raise FileLoadError(f"Error loading file at {ref.get_path()}: {e}")
+                    self._add_cached_headers(cache_key, path_headers)
+
+                if headers is None:
+                    headers = self._copy_headers(path_headers)
+                elif set(headers) != set(path_headers):
+                    self.remove_corpus_filepath(ref.get_path())
+                    self.remove_meta_filepath(ref.get_path())
+                    raise FileLoadError(f"Incompatible data labels in file: {ref.get_path()}")
+        finally:
+            if submitted_refs is not None:
+                # Cancels the inference still pending, as the executor is kept for later inference
+                submitted_refs.close()
 
         if headers is None:
             headers = []
@@ -135,8 +524,13 @@ class LoaderService(ABC):
         return True
 
     @staticmethod
-    def _get_valid_header_name(header_name: str, existing_headers: list[str]) -> str:
-        existing_headers.remove(header_name)
+    def _get_valid_header_name(header_name: str, existing_headers: Counter) -> str:
+        """
+        :param header_name: the header name to make valid
+        :param existing_headers: the number of columns holding each header name, excluding the column being renamed
+        :return: a valid header name that is not held by any other column
+        :rtype: str
+        """
         # Replace all spaces in the meta name with underscores
         header_name = header_name.strip().replace(' ', '_')
         # Remove all special characters from the meta name.
@@ -145,7 +539,7 @@ class LoaderService(ABC):
             header_name = 'M_' + header_name
         i = 1
         orig_name = header_name
-        while header_name in existing_headers:
+        while existing_headers[header_name] > 0:
             header_name = f'{orig_name}_{i}'
             i += 1
 
@@ -157,69 +551,686 @@ class LoaderService(ABC):
                      text_header: CorpusHeader,
                      corpus_link_header: Optional[CorpusHeader],
                      meta_link_header: Optional[CorpusHeader],
-                     tqdm_obj: Tqdm) -> DataFrameCorpus:
-        corpus_files: list[FileReference] = sorted(self.get_loaded_corpus_files(), key=lambda f: f.get_path())
-        meta_files: list[FileReference] = sorted(self.get_loaded_meta_files(), key=lambda f: f.get_path())
+                     tqdm_obj: Tqdm,
+                     cancel_event: Optional[Event] = None,
+                     out_of_core: Optional[bool] = None) -> DataFrameCorpus:
+        """
+        :param cancel_event: if provided and set during the build, the build stops before the next file or chunk and raises BuildCancelledError
+        :param out_of_core: if False, the corpus is built in memory even if a spill directory is set. If None or True, the corpus is built out-of-core if a spill directory is set
+        :raises FileLoadError: if the files cannot be parsed or the corpus would be empty
+        :raises BuildCancelledError: if cancel_event is set before the build completes
+        """
+        if (len(corpus_headers) == 0) and (len(meta_headers) == 0):
+            raise FileLoadError("No corpus headers or metadata headers provided")
+        LoaderService._raise_if_cancelled(cancel_event)
 
-        corpus_df: DataFrame = self._get_concatenated_dataframe(corpus_files, corpus_headers, self.header_strategy,
-                                                                tqdm_obj, "Reading corpus files")
-        meta_df: DataFrame = self._get_concatenated_dataframe(meta_files, meta_headers, self.header_strategy,
-                                                              tqdm_obj, "Reading metadata files")
+        deduplicator: Optional[DocumentDeduplicator] = None
+        if (self.deduplication_mode != DeduplicationMode.NONE) and (len(corpus_headers) > 0):
+            deduplicator = DocumentDeduplicator(self.deduplication_mode, text_header.name, self.content_hashes)
 
-        if (corpus_df.shape[0] == 0) and (meta_df.shape[0] == 0):
-            raise FileLoadError("No corpus documents loaded. Corpus cannot be empty")
+        final_df: DataFrame
+        if (self.spill_directory is not None) and (out_of_core is not False) and (len(corpus_headers) > 0):
+            final_df = self._build_dataframe_out_of_core(corpus_headers, meta_headers, corpus_link_header,
+                                                         meta_link_header, tqdm_obj, cancel_event, deduplicator)
+        else:
+            final_df = self._build_dataframe(corpus_headers, meta_headers, corpus_link_header, meta_link_header,
+                                             tqdm_obj, cancel_event, deduplicator)
+        LoaderService._raise_if_cancelled(cancel_event)
+        self.deduplication_report = None
+        if deduplicator is not None:
+            self.content_hashes = deduplicator.content_hashes
+            self.deduplication_report = deduplicator.get_report()
+
+        return self._create_corpus(corpus_name, final_df, text_header)
 
+    def build_preview(self, corpus_headers: list[CorpusHeader],
+                      meta_headers: list[CorpusHeader],
+                      text_header: CorpusHeader,
+                      corpus_link_header: Optional[CorpusHeader],
+                      meta_link_header: Optional[CorpusHeader],
+                      tqdm_obj: Tqdm,
+                      sample_rows: int,
+                      sample_files: int) -> DataFrameCorpus:
+        """
+        Builds a small corpus from a deterministic sample of the loaded files, using the same headers, datatypes, and link
+        as build_corpus, so mistakes in the selected headers are found without parsing every file.
+        The first sample_rows rows of each tabular file are read, along with a sample of sample_files of the files
+        holding a single document. The sample is drawn with a fixed seed, so the same files are previewed each time.
+        When linking, the metadata is read in full so the sampled rows are linked as they would be in the full build, and
+        the LinkIndex is kept for reuse by the full build.
+        Parsed files are not cached, and duplicates are only found within the sampled rows.
+        :param sample_rows: the maximum number of rows read from each tabular file
+        :param sample_files: the maximum number of single document files read
+        :raises FileLoadError: if the files cannot be parsed or the preview would be empty
+        """
+        if (len(corpus_headers) == 0) and (len(meta_headers) == 0):
+            raise FileLoadError("No corpus headers or metadata headers provided")
+
+        corpus_files: list[FileReference] = self._get_preview_files(self.get_loaded_corpus_files(), sample_files)
+        meta_files: list[FileReference] = self._get_preview_files(self.get_loaded_meta_files(), sample_files)
         load_corpus: bool = len(corpus_headers) > 0
         load_meta: bool = len(meta_headers) > 0
 
+        executor: Optional[Executor] = self._create_executor()
+        link_index: Optional[LinkIndex] = None
+        try:
+            corpus_df: DataFrame = self._get_concatenated_dataframe(corpus_files, corpus_headers, self.header_strategy,
+                                                                    tqdm_obj, "Reading corpus sample", executor,
+                                                                    self._get_num_workers(),
+                                                                    string_storage=self.string_storage,
+                                                                    max_rows=sample_rows)
+            if (self.deduplication_mode != DeduplicationMode.NONE) and load_corpus:
+                corpus_df = DocumentDeduplicator(self.deduplication_mode, text_header.name).apply(corpus_df)
+            meta_df: DataFrame = DataFrame()
+            if load_corpus and load_meta:
+                link_index = self.get_link_index(meta_headers, meta_link_header, tqdm_obj, executor)
+            elif load_meta:
+                meta_df = self._get_concatenated_dataframe(meta_files, meta_headers, self.header_strategy, tqdm_obj,
+                                                           "Reading metadata sample", executor,
+                                                           self._get_num_workers(), string_storage=self.string_storage,
+                                                           max_rows=sample_rows)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
         final_df: DataFrame
-        if load_corpus and load_meta:
-            final_df = merge(left=corpus_df, right=meta_df,
-                             left_on=corpus_link_header.name, right_on=meta_link_header.name,
-                             how='inner', suffixes=(None, '_meta'))
+        if link_index is not None:
+            final_df = self._join_link_index(link_index, corpus_df, corpus_link_header)
         elif load_corpus:
             final_df = corpus_df
-        elif load_meta:
-            final_df = meta_df
         else:
-            raise FileLoadError("No corpus headers or metadata headers provided")
+            final_df = meta_df
+        if final_df.shape[0] == 0:
+            raise FileLoadError("No corpus documents loaded. Corpus cannot be empty")
 
-        col_doc: str = text_header.name
-        for header_name in final_df.columns:
-            curr_headers = [str(c) for c in final_df.columns]
-            renamed = LoaderService._get_valid_header_name(header_name, curr_headers)
-            if header_name != renamed:
-                if header_name == col_doc:
-                    col_doc = renamed
-                final_df = final_df.rename({header_name: renamed}, axis=1)
+        return self._create_corpus(self.PREVIEW_CORPUS_NAME, final_df, text_header)
+
+    def _get_preview_files(self, file_refs: set[FileReference], sample_files: int) -> list[FileReference]:
+        """
+        Samples the files read by build_preview. All tabular files are kept, as only their first rows are read, while at
+        most sample_files of the files holding a single document are kept, drawn using PREVIEW_SEED. Files without a
+        loader are kept, so the error is raised when they are parsed.
+        :return: the sampled files, ordered by path as in build_corpus
+        :rtype: list[FileReference]
+        """
+        sorted_refs: list[FileReference] = sorted(file_refs, key=lambda f: f.get_path())
+        document_refs: list[FileReference] = []
+        preview_refs: list[FileReference] = []
+        for ref in sorted_refs:
+            try:
+                file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref)
+            except FileLoadError:
+                preview_refs.append(ref)
+                continue
+            if isinstance(file_loader, DocumentLoaderStrategy):
+                document_refs.append(ref)
+            else:
+                preview_refs.append(ref)
+
+        if len(document_refs) > sample_files:
+            document_refs = Random(self.PREVIEW_SEED).sample(document_refs, sample_files)
+        preview_refs.extend(document_refs)
+
+        return sorted(preview_refs, key=lambda f: f.get_path())
+
+    def _create_corpus(self, corpus_name: Optional[str], final_df: DataFrame, text_header: CorpusHeader) -> DataFrameCorpus:
+        with measure_stage('rename'):
+            final_df, col_doc = LoaderService._rename_headers(final_df, text_header.name)
+        build_metrics: Optional[BuildMetrics] = get_active_build_metrics()
+        if build_metrics is not None:
+            build_metrics.set_rows_produced(len(final_df))
 
         if (corpus_name == '') or (corpus_name is None):
             corpus_name = f"Corpus-{datetime.now()}"
 
-        return DataFrameCorpus.from_dataframe(final_df, col_doc, corpus_name)
+        # DataFrameCorpus converts each document to a Python str before casting the documents to the default string
+        # dtype. The documents are given to it as Python strings, which it does not copy, and are only moved to Arrow
+        # buffers once the corpus is created, so Arrow and Python copies of every document are not held at once
+        is_arrow_storage: bool = self.string_storage == StringStorage.PYARROW
+        with measure_stage('create_corpus'), option_context('mode.string_storage', StringStorage.PYTHON.value):
+            if is_arrow_storage:
+                final_df = final_df.copy(deep=False)
+                final_df[col_doc] = final_df[col_doc].astype(StringDtype(StringStorage.PYTHON.value))
+            corpus: DataFrameCorpus = DataFrameCorpus.from_dataframe(final_df, col_doc, corpus_name)
+            del final_df
+            if is_arrow_storage:
+                doc_col: str = corpus._COL_DOC
+                corpus._df[doc_col] = corpus._df[doc_col].astype(StringDtype(StringStorage.PYARROW.value))
+
+        return corpus
+
+    def _build_dataframe(self, corpus_headers: list[CorpusHeader],
+                         meta_headers: list[CorpusHeader],
+                         corpus_link_header: Optional[CorpusHeader],
+                         meta_link_header: Optional[CorpusHeader],
+                         tqdm_obj: Tqdm,
+                         cancel_event: Optional[Event] = None,
+                         deduplicator: Optional[DocumentDeduplicator] = None) -> DataFrame:
+        """
+        Parses the loaded files and joins the corpus and metadata within memory.
+        If deduplicator is provided, duplicate corpus files are removed before parsing and duplicate corpus rows are
+        removed or flagged before joining.
+        """
+        corpus_files: list[FileReference] = sorted(self.get_loaded_corpus_files(), key=lambda f: f.get_path())
+        if deduplicator is not None:
+            with measure_stage('deduplicate'):
+                corpus_files = deduplicator.get_unique_files(corpus_files)
+        meta_files: list[FileReference] = sorted(self.get_loaded_meta_files(), key=lambda f: f.get_path())
+
+        load_corpus: bool = len(corpus_headers) > 0
+        load_meta: bool = len(meta_headers) > 0
+
+        executor: Optional[Executor] = self._create_executor()
+        parsed_file_cache: Optional[ParsedFileCache] = self.parsed_file_cache
+        if parsed_file_cache is not None:
+            parsed_file_cache.start_build()
+        files_parsed: bool = False
+        link_index: Optional[LinkIndex] = None
+        try:
+            corpus_df: DataFrame = self._get_concatenated_dataframe(corpus_files, corpus_headers, self.header_strategy,
+                                                                    tqdm_obj, "Reading corpus files", executor,
+                                                                    self._get_num_workers(), parsed_file_cache,
+                                                                    cancel_event, self.string_storage)
+            if deduplicator is not None:
+                with measure_stage('deduplicate'):
+                    corpus_df = deduplicator.apply(corpus_df)
+            meta_df: DataFrame
+            if load_corpus and load_meta:
+                link_index = self.get_link_index(meta_headers, meta_link_header, tqdm_obj, executor, parsed_file_cache,
+                                                 cancel_event)
+                meta_df = link_index.meta_df
+            else:
+                meta_df = self._get_concatenated_dataframe(meta_files, meta_headers, self.header_strategy, tqdm_obj,
+                                                           "Reading metadata files", executor,
+                                                           self._get_num_workers(), parsed_file_cache, cancel_event,
+                                                           self.string_storage)
+            files_parsed = True
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            if parsed_file_cache is not None:
+                parsed_file_cache.finish_build(files_parsed)
+
+        if (corpus_df.shape[0] == 0) and (meta_df.shape[0] == 0):
+            raise FileLoadError("No corpus documents loaded. Corpus cannot be empty")
+
+        if link_index is not None:
+            return self._join_link_index(link_index, corpus_df, corpus_link_header)
+        elif load_corpus:
+            return corpus_df
+        return meta_df
+
+    def _build_dataframe_out_of_core(self, corpus_headers: list[CorpusHeader],
+                                     meta_headers: list[CorpusHeader],
+                                     corpus_link_header: Optional[CorpusHeader],
+                                     meta_link_header: Optional[CorpusHeader],
+                                     tqdm_obj: Tqdm,
+                                     cancel_event: Optional[Event] = None,
+                                     deduplicator: Optional[DocumentDeduplicator] = None) -> DataFrame:
+        """
+        Parses the loaded corpus files and streams them to a spill file in chunks, so that the parsed files are never all
+        held in memory. The metadata, which is expected to be far smaller than the corpus, is read into memory and joined
+        with each chunk of the corpus in turn, with the joined chunks streamed to a second spill file.
+        The returned DataFrame is read from a memory map of the final spill file, so its text columns are not held in
+        memory until the corpus is created from it, at which point DataFrameCorpus copies them into memory.
+        Parsed files are not kept for reuse by later builds.
+        If deduplicator is provided, duplicate corpus files are removed before parsing and duplicate corpus rows are
+        removed or flagged as each chunk is spilled.
+        """
+        corpus_files: list[FileReference] = sorted(self.get_loaded_corpus_files(), key=lambda f: f.get_path())
+        if deduplicator is not None:
+            with measure_stage('deduplicate'):
+                corpus_files = deduplicator.get_unique_files(corpus_files)
+        spill_store: ArrowSpillStore = ArrowSpillStore(self.spill_directory, self.string_storage)
+        corpus_path: str = spill_store.create_spill_path()
+
+        executor: Optional[Executor] = self._create_executor()
+        try:
+            parsed_files = self._iter_parsed_files(corpus_files, corpus_headers, self.header_strategy, tqdm_obj,
+                                                   "Reading corpus files", executor, self._get_num_workers(),
+                                                   cancel_event=cancel_event, string_storage=self.string_storage)
+            corpus_chunks = self._iter_until_cancelled(
+                self._iter_dataframe_chunks(parsed_files, corpus_headers, self.SPILL_CHUNK_ROWS, self.string_storage),
+                cancel_event)
+            if deduplicator is not None:
+                corpus_chunks = (deduplicator.apply(corpus_chunk) for corpus_chunk in corpus_chunks)
+            with measure_stage('parse_files'):
+                num_corpus_rows: int = spill_store.write_dataframes(corpus_path, corpus_chunks)
+            link_index: Optional[LinkIndex] = None
+            if len(meta_headers) > 0:
+                link_index = self.get_link_index(meta_headers, meta_link_header, tqdm_obj, executor,
+                                                 cancel_event=cancel_event)
+        except Exception:
+            spill_store.remove(corpus_path)
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        if num_corpus_rows == 0:
+            raise FileLoadError("No corpus documents loaded. Corpus cannot be empty")
+
+        final_path: str = corpus_path
+        if link_index is not None:
+            final_path = spill_store.create_spill_path()
+            joined_chunks = (self._join_link_index(link_index, corpus_chunk, corpus_link_header)
+                             for corpus_chunk in self._iter_until_cancelled(spill_store.iter_dataframes(corpus_path),
+                                                                            cancel_event))
+            try:
+                with measure_stage('spill_link'):
+                    spill_store.write_dataframes(final_path, joined_chunks)
+            finally:
+                spill_store.remove(corpus_path)
+
+        try:
+            with measure_stage('read_spill'):
+                return spill_store.read_dataframe(final_path)
+        finally:
+            # The memory map keeps the contents available until the DataFrame is released
+            spill_store.remove(final_path)
+
+    def _get_files_key(self, file_refs: list[FileReference], headers: list[CorpusHeader]) -> Optional[Hashable]:
+        """
+        :return: a key identifying the contents of the files when parsed with the headers, or None if any file cannot be fingerprinted
+        :rtype: Optional[Hashable]
+        """
+        file_keys: list[Optional[Hashable]] = [ParsedFileCache.get_key(ref, headers, self.header_strategy) for ref in file_refs]
+        if any(file_key is None for file_key in file_keys):
+            return None
+        return tuple(file_keys)
+
+    def get_link_index(self, meta_headers: list[CorpusHeader], meta_link_header: CorpusHeader, tqdm_obj: Tqdm,
+                       executor: Optional[Executor] = None,
+                       parsed_file_cache: Optional[ParsedFileCache] = None,
+                       cancel_event: Optional[Event] = None,
+                       meta_files: Optional[Iterable[FileReference]] = None) -> LinkIndex:
+        """
+        Provides the LinkIndex of the loaded metadata files. The previous index is reused unless the metadata files,
+        metadata headers, or metadata link header have changed since it was built.
+        :param meta_headers: the headers the metadata files are parsed with
+        :param meta_link_header: the metadata header holding the link keys
+        :param tqdm_obj: the progress bar updated while the metadata files are parsed
+        :param executor: the Executor used to parse the metadata files. If None, the files are parsed serially
+        :param parsed_file_cache: the ParsedFileCache used when parsing the metadata files, if any
+        :param cancel_event: if provided and set while the metadata files are parsed, BuildCancelledError is raised
+        :param meta_files: the metadata files to index. If None, the loaded metadata files are indexed
+        :return: the LinkIndex of the metadata files
+        :rtype: LinkIndex
+        :raises FileLoadError: if the metadata files cannot be parsed or do not hold the link header
+        """
+        if meta_files is None:
+            meta_files = self.get_loaded_meta_files()
+        meta_files = sorted(meta_files, key=lambda f: f.get_path())
+        files_key: Optional[Hashable] = self._get_files_key(meta_files, meta_headers)
+        index_key: Optional[Hashable] = None if files_key is None else (files_key, meta_link_header.name)
+        with self.link_lock:
+            if (index_key is not None) and (self.link_index is not None):
+                if index_key == self.link_index_key:
+                    return self.link_index
+                if (self.link_index_key is not None) and (self.link_index_key[0] == files_key):
+                    # Only the link header has changed, so the metadata is indexed again without being parsed again
+                    return self._index_meta_df(self.link_index.meta_df, meta_link_header, index_key)
+
+            meta_df: DataFrame = self._get_concatenated_dataframe(meta_files, meta_headers, self.header_strategy,
+                                                                  tqdm_obj, "Reading metadata files", executor,
+                                                                  self._get_num_workers(), parsed_file_cache,
+                                                                  cancel_event, self.string_storage)
+            return self._index_meta_df(meta_df, meta_link_header, index_key)
+
+    def _index_meta_df(self, meta_df: DataFrame, meta_link_header: CorpusHeader,
+                       index_key: Optional[Hashable]) -> LinkIndex:
+        if meta_link_header.name not in meta_df.columns:
+            raise FileLoadError(f"Metadata linking label '{meta_link_header.name}' not found in the metadata files")
+        with measure_stage('link_index'):
+            link_index: LinkIndex = LinkIndex(meta_df, meta_link_header.name)
+        self.link_index = link_index
+        self.link_index_key = index_key
+
+        return link_index
+
+    def _get_corpus_link_keys(self, corpus_headers: list[CorpusHeader], corpus_link_header: CorpusHeader,
+                              tqdm_obj: Tqdm, executor: Optional[Executor] = None,
+                              corpus_files: Optional[Iterable[FileReference]] = None) -> Series:
+        """
+        Parses only the link keys of the corpus files, which are the loaded corpus files if corpus_files is None. The
+        previous keys are reused unless the corpus files or the corpus link header have changed since they were read.
+        """
+        if corpus_files is None:
+            corpus_files = self.get_loaded_corpus_files()
+        corpus_files = sorted(corpus_files, key=lambda f: f.get_path())
+        link_headers: list[CorpusHeader] = [CorpusHeader(header.name, header.datatype, include=(header == corpus_link_header))
+                                            for header in corpus_headers]
+        keys_key: Optional[Hashable] = self._get_files_key(corpus_files, link_headers)
+        with self.link_lock:
+            if (keys_key is not None) and (self.corpus_link_keys is not None) and (keys_key == self.corpus_link_keys_key):
+                return self.corpus_link_keys
+
+            link_df: DataFrame = self._get_concatenated_dataframe(corpus_files, link_headers, self.header_strategy,
+                                                                  tqdm_obj, "Reading corpus linking labels", executor,
+                                                                  self._get_num_workers(),
+                                                                  string_storage=self.string_storage)
+            if corpus_link_header.name not in link_df.columns:
+                raise FileLoadError(f"Corpus linking label '{corpus_link_header.name}' not found in the corpus files")
+            self.corpus_link_keys = link_df[corpus_link_header.name]
+            self.corpus_link_keys_key = keys_key
+
+            return self.corpus_link_keys
+
+    def get_link_report(self, corpus_headers: list[CorpusHeader], meta_headers: list[CorpusHeader],
+                        corpus_link_header: CorpusHeader, meta_link_header: CorpusHeader, tqdm_obj: Tqdm,
+                        corpus_files: Optional[Iterable[FileReference]] = None,
+                        meta_files: Optional[Iterable[FileReference]] = None) -> LinkReport:
+        """
+        Reports how the link keys of the corpus files match the link keys of the metadata files, without building the
+        corpus. The LinkIndex built for the report is reused by the next build.
+        The files can be provided by a caller on another thread, so the report does not read the loaded files while
+        they are being changed. If None, the loaded files are reported.
+        :return: the LinkReport of the corpus and metadata link headers
+        :rtype: LinkReport
+        :raises FileLoadError: if the files cannot be parsed or do not hold the link headers
+        """
+        executor: Optional[Executor] = self._create_executor()
+        try:
+            link_index: LinkIndex = self.get_link_index(meta_headers, meta_link_header, tqdm_obj, executor,
+                                                        meta_files=meta_files)
+            corpus_keys: Series = self._get_corpus_link_keys(corpus_headers, corpus_link_header, tqdm_obj, executor,
+                                                             corpus_files)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        return link_index.get_report(corpus_keys)
+
+    @staticmethod
+    def _join_link_index(link_index: LinkIndex, corpus_df: DataFrame, corpus_link_header: CorpusHeader) -> DataFrame:
+        if corpus_link_header.name not in corpus_df.columns:
+            raise FileLoadError(f"Corpus linking label '{corpus_link_header.name}' not found in the corpus files")
+        with measure_stage('link'):
+            return link_index.join(corpus_df, corpus_link_header.name)
+
+    @staticmethod
+    def _rename_headers(final_df: DataFrame, col_doc: str) -> tuple[DataFrame, str]:
+        """
+        Renames the columns of the DataFrame to valid header names. The new names of all columns are found in a single
+        pass and applied to a shallow copy of the DataFrame, so the column data is not copied.
+        :return: a tuple of the renamed DataFrame and the new name of the document column
+        :rtype: tuple[DataFrame, str]
+        """
+        curr_headers: list[str] = [str(c) for c in final_df.columns]
+        header_counts: Counter = Counter(curr_headers)
+        renamed_headers: list[str] = []
+        for header_name in curr_headers:
+            header_counts[header_name] -= 1
+            renamed = LoaderService._get_valid_header_name(header_name, header_counts)
+            header_counts[renamed] += 1
+            if (header_name != renamed) and (header_name == col_doc):
+                col_doc = renamed
+            renamed_headers.append(renamed)
+        if renamed_headers != curr_headers:
+            final_df = final_df.copy(deep=False)
+            final_df.columns = renamed_headers
+
+        return final_df, col_doc
 
     @staticmethod
     def _dataframe_generator(file_refs: list[FileReference],
                              headers: list[CorpusHeader],
                              header_strategy: HeaderStrategy,
-                             tqdm_obj: Tqdm, loading_msg: str):
+                             tqdm_obj: Tqdm, loading_msg: str,
+                             string_storage: StringStorage = StringStorage.PYTHON,
+                             max_rows: Optional[int] = None):
         for ref in tqdm_obj(file_refs, desc=loading_msg, unit="files", leave=False):
-            file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref)
+            file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref, string_storage, max_rows)
             try:
-                yield file_loader.get_dataframe(headers, header_strategy, tqdm_obj)
+                yield _parse_file(file_loader, headers, header_strategy, tqdm_obj)
             except UnicodeDecodeError:
                 raise FileLoadError(f"Error loading file at {ref.get_path()}: file is not UTF-8 encoded")
             except Exception as e:
                 raise FileLoadError(f"Error loading file at {ref.get_path()}: {e}")
 
+    @staticmethod
+    def _submit_file_loaders(file_refs: list[FileReference], loader_fn: Callable, loader_args: tuple,
+                             executor: Optional[Executor], num_workers: int,
+                             string_storage: StringStorage = StringStorage.PYTHON,
+                             max_rows: Optional[int] = None) -> Iterator[tuple[FileReference, Future]]:
+        """
+        Calls loader_fn(file_loader, *loader_args) for the FileLoaderStrategy of each file, yielding each file and the
+        Future of its result in the same order as file_refs. If executor is None, each call is made as it is yielded.
+        Otherwise, only a bounded window of calls is submitted ahead of the file being yielded, which limits the memory
+        held by results waiting to be yielded.
+        A FileLoadError raised when assigning a loader to a file is raised when that file would have been yielded, so
+        errors are raised in the same order regardless of the executor.
+        Calls that have not started are cancelled if the iterator is closed before every file is yielded.
+        """
+        if executor is None:
+            for ref in file_refs:
+                file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref, string_storage, max_rows)
+                future: Future = Future()
+                try:
+                    future.set_result(loader_fn(file_loader, *loader_args))
+                except Exception as e:
+                    future.set_exception(e)
+                yield ref, future
+            return
+
+        window_size: int = num_workers * LoaderService.PARSE_WINDOW_PER_WORKER
+        # Each pending entry holds either the future of the call or the error raised when assigning a loader
+        pending: deque[tuple[FileReference, Optional[Future], Optional[FileLoadError]]] = deque()
+        unsubmitted_refs: Iterator[FileReference] = iter(file_refs)
+
+        def submit_next():
+            ref: Optional[FileReference] = next(unsubmitted_refs, None)
+            if ref is None:
+                return
+            try:
+                file_loader: FileLoaderStrategy = FileLoaderFactory.get_file_loader(ref, string_storage, max_rows)
+            except FileLoadError as e:
+                pending.append((ref, None, e))
+                return
+            if isinstance(executor, ThreadPoolExecutor):
+                # Copies the context so that stages measured by thread workers are recorded by the active BuildMetrics
+                future: Future = executor.submit(copy_context().run, loader_fn, file_loader, *loader_args)
+            else:
+                future = executor.submit(loader_fn, file_loader, *loader_args)
+            pending.append((ref, future, None))
+
+        try:
+            for _ in range(window_size):
+                submit_next()
+            while pending:
+                ref, future, loader_error = pending.popleft()
+                submit_next()
+                if loader_error is not None:
+                    raise loader_error
+                yield ref, future
+        finally:
+            for _, future, _ in pending:
+                if future is not None:
+                    future.cancel()
+
+    @staticmethod
+    def _parallel_dataframe_generator(file_refs: list[FileReference],
+                                      headers: list[CorpusHeader],
+                                      header_strategy: HeaderStrategy,
+                                      tqdm_obj: Tqdm, loading_msg: str,
+                                      executor: Executor, num_workers: int,
+                                      string_storage: StringStorage = StringStorage.PYTHON,
+                                      max_rows: Optional[int] = None):
+        """
+        Parses the files using the provided executor, yielding the parsed files in the same order as file_refs.
+        Errors are raised in the same order as the serial generator.
+        """
+        submitted_refs = LoaderService._submit_file_loaders(file_refs, _parse_file, (headers, header_strategy),
+                                                            executor, num_workers, string_storage, max_rows)
+        for ref, future in tqdm_obj(submitted_refs, total=len(file_refs), desc=loading_msg, unit="files", leave=False):
+            try:
+                yield future.result()
+            except UnicodeDecodeError:
+                raise FileLoadError(f"Error loading file at {ref.get_path()}: file is not UTF-8 encoded")
+            except Exception as e:
+                raise FileLoadError(f"Error loading file at {ref.get_path()}: {e}")
+
+    @staticmethod
+    def _raise_if_cancelled(cancel_event: Optional[Event]):
+        if (cancel_event is not None) and cancel_event.is_set():
+            raise BuildCancelledError("Corpus build cancelled")
+
+    @staticmethod
+    def _iter_until_cancelled(items: Iterator, cancel_event: Optional[Event]) -> Iterator:
+        """
+        Yields the items, raising BuildCancelledError before the next item is taken once cancel_event is set.
+        The items are closed on cancellation, so any progress bar they update is closed.
+        """
+        if cancel_event is None:
+            return items
+
+        def cancellable_items() -> Iterator:
+            try:
+                while True:
+                    LoaderService._raise_if_cancelled(cancel_event)
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        return
+                    yield item
+            except BuildCancelledError:
+                close_items: Optional[Callable] = getattr(items, 'close', None)
+                if close_items is not None:
+                    close_items()
+                raise
+
+        return cancellable_items()
+
+    @staticmethod
+    def _iter_dataframe_chunks(parsed_files: Iterable[Union[DataFrame, tuple[str, ...]]],
+                               headers: list[CorpusHeader], chunk_rows: int,
+                               string_storage: StringStorage = StringStorage.PYTHON) -> Iterator[DataFrame]:
+        """
+        Converts the parsed files into DataFrame chunks, preserving their order. Parsed DataFrame objects are yielded as
+        they are, while the row values of single document files are written into column lists of chunk_rows rows, and
+        each consecutive run of rows is converted to a DataFrame at once rather than a DataFrame per file.
+        :param parsed_files: the DataFrame objects or row values of the parsed files
+        :param headers: the headers the files were parsed with
+        :param chunk_rows: the maximum number of rows of single document files held in a chunk, used to size the column lists
+        :param string_storage: the storage used for the values of the rows of single document files
+        :return: an iterator of the DataFrame chunks
+        :rtype: Iterator[DataFrame]
+        """
+        document_columns: list[str] = DocumentLoaderStrategy.get_included_columns(headers)
+        column_values: list[list[Optional[str]]] = [[None] * chunk_rows for _ in document_columns]
+        text_dtype = DataType.TEXT.get_dtype(string_storage)
+        num_rows: int = 0
+
+        def get_rows_dataframe() -> DataFrame:
+            rows_data = {column: (values if num_rows == chunk_rows else values[:num_rows])
+                         for column, values in zip(document_columns, column_values)}
+            return DataFrame(rows_data, dtype=text_dtype)
+
+        for parsed_file in parsed_files:
+            if isinstance(parsed_file, DataFrame):
+                if num_rows > 0:
+                    yield get_rows_dataframe()
+                    num_rows = 0
+                yield parsed_file
+                continue
+            for values, value in zip(column_values, parsed_file):
+                values[num_rows] = value
+            num_rows += 1
+            if num_rows == chunk_rows:
+                yield get_rows_dataframe()
+                num_rows = 0
+        if num_rows > 0:
+            yield get_rows_dataframe()
+
+    @staticmethod
+    def _merge_cached_files(cached_files: list[Optional[Union[DataFrame, tuple[str, ...]]]],
+                            cache_keys: list[Optional[Hashable]],
+                            parsed_files: Iterator[Union[DataFrame, tuple[str, ...]]],
+                            parsed_file_cache: ParsedFileCache) -> Iterator[Union[DataFrame, tuple[str, ...]]]:
+        """
+        Yields the cached contents of each file, taking the contents of each file that was not cached from parsed_files
+        and adding it to the cache.
+        """
+        for cache_key, cached_file in zip(cache_keys, cached_files):
+            if cached_file is None:
+                cached_file = next(parsed_files)
+                parsed_file_cache.add(cache_key, cached_file)
+            yield cached_file
+        # Exhausts the generator so that the progress bar is closed
+        for _ in parsed_files:
+            pass
+
+    @staticmethod
+    def _get_total_size(file_refs: list[FileReference]) -> int:
+        total_size: int = 0
+        for ref in file_refs:
+            try:
+                total_size += ref.get_size()
+            except OSError:
+                # The file cannot be accessed, so the error is raised when it is parsed
+                pass
+        return total_size
+
+    @staticmethod
+    def _iter_parsed_files(file_refs: list[FileReference],
+                           headers: list[CorpusHeader],
+                           header_strategy: HeaderStrategy,
+                           tqdm_obj: Tqdm,
+                           loading_msg: str,
+                           executor: Optional[Executor] = None,
+                           num_workers: int = 1,
+                           parsed_file_cache: Optional[ParsedFileCache] = None,
+                           cancel_event: Optional[Event] = None,
+                           string_storage: StringStorage = StringStorage.PYTHON,
+                           max_rows: Optional[int] = None) -> Iterator[Union[DataFrame, tuple[str, ...]]]:
+        """
+        Parses the files, yielding the DataFrame or row values of each file in the same order as file_refs.
+        If max_rows is provided, at most max_rows rows are read from each tabular file.
+        If parsed_file_cache is provided, only the files that are not cached are parsed.
+        If cancel_event is provided and set, BuildCancelledError is raised before the next file is yielded.
+        """
+        cache_keys: list[Optional[Hashable]] = []
+        cached_files: list[Optional[Union[DataFrame, tuple[str, ...]]]] = []
+        parsed_refs: list[FileReference] = file_refs
+        if parsed_file_cache is not None:
+            cache_keys = [ParsedFileCache.get_key(ref, headers, header_strategy) for ref in file_refs]
+            cached_files = [parsed_file_cache.get(key) for key in cache_keys]
+            parsed_refs = [ref for ref, cached_file in zip(file_refs, cached_files) if cached_file is None]
+        build_metrics: Optional[BuildMetrics] = get_active_build_metrics()
+        if build_metrics is not None:
+            build_metrics.add_files_read(len(parsed_refs), LoaderService._get_total_size(parsed_refs))
+
+        if executor is None:
+            parsed_files = LoaderService._dataframe_generator(parsed_refs, headers, header_strategy, tqdm_obj, loading_msg,
+                                                              string_storage, max_rows)
+        else:
+            parsed_files = LoaderService._parallel_dataframe_generator(parsed_refs, headers, header_strategy,
+                                                                       tqdm_obj, loading_msg, executor, num_workers,
+                                                                       string_storage, max_rows)
+        if parsed_file_cache is not None:
+            parsed_files = LoaderService._merge_cached_files(cached_files, cache_keys, parsed_files, parsed_file_cache)
+        return LoaderService._iter_until_cancelled(parsed_files, cancel_event)
+
     @staticmethod
     def _get_concatenated_dataframe(file_refs: list[FileReference],
                                     headers: list[CorpusHeader],
                                     header_strategy: HeaderStrategy,
                                     tqdm_obj: Tqdm,
-                                    loading_msg: str) -> DataFrame:
+                                    loading_msg: str,
+                                    executor: Optional[Executor] = None,
+                                    num_workers: int = 1,
+                                    parsed_file_cache: Optional[ParsedFileCache] = None,
+                                    cancel_event: Optional[Event] = None,
+                                    string_storage: StringStorage = StringStorage.PYTHON,
+                                    max_rows: Optional[int] = None) -> DataFrame:
         if len(file_refs) == 0:
             return DataFrame()
 
-        df_generator = LoaderService._dataframe_generator(file_refs, headers, header_strategy, tqdm_obj, loading_msg)
-        return concat(df_generator, ignore_index=True)
+        parsed_files = LoaderService._iter_parsed_files(file_refs, headers, header_strategy, tqdm_obj, loading_msg,
+                                                        executor, num_workers, parsed_file_cache, cancel_event,
+                                                        string_storage, max_rows)
+        # The column lists are sized for all files, so consecutive single document files form a single chunk.
+        # Parsed DataFrame objects may be cached, so the chunks are always copied by concat
+        with measure_stage('parse_files'):
+            return concat(LoaderService._iter_dataframe_chunks(parsed_files, headers, len(file_refs), string_storage),
+                          ignore_index=True)
@@ -0,0 +1,148 @@
+import sys
+from collections import OrderedDict
+from typing import Optional, Hashable, Union
+
+from pandas import DataFrame
+
+from atap_corpus_loader.controller.data_objects import FileReference, CorpusHeader, HeaderStrategy
+
+
+class ParsedFileCache:
+    """
+    Holds the parsed contents of each file of the most recent corpus build, so that rebuilding the corpus only requires
+    parsing the files that have been added or changed since.
+    The parsed contents of a file are keyed by the fingerprint of the file, the header strategy, and the name, datatype,
+    and inclusion of each header, so changing any of these causes the file to be parsed again.
+    The cache is replaced by the files used in each successful build, so it never holds files that are no longer loaded.
+    Cached DataFrame objects are shared between builds and must not be modified.
+    The cached contents are held in addition to the built corpora, so the cache roughly doubles the memory used by a build.
+    If max_bytes is set, the least recently used entries are dropped after each build until the deep memory usage of the
+    cache is within max_bytes. The cache can also be trimmed to a smaller size using trim.
+    """
+    def __init__(self, max_bytes: Optional[int] = None):
+        """
+        :param max_bytes: the maximum deep memory usage of the cached contents in bytes. If None, the cache is unbounded
+        """
+        if (max_bytes is not None) and (max_bytes < 0):
+            raise ValueError(f"max_bytes argument should be a non-negative integer or None, instead got {max_bytes}")
+        self.max_bytes: Optional[int] = max_bytes
+        # Ordered from least to most recently used
+        self.entries: OrderedDict[Hashable, Union[DataFrame, tuple[str, ...]]] = OrderedDict()
+        # The entries used or added by the build in progress, in the order they were used
+        self.build_entries: OrderedDict[Hashable, Union[DataFrame, tuple[str, ...]]] = OrderedDict()
+        # The deep memory usage of each entry, measured when first required
+        self.entry_sizes: dict[Hashable, int] = {}
+        # The fingerprints of the files of the entries, measured when first requested after the entries change
+        self.fingerprints: Optional[set[Hashable]] = None
+
+    @staticmethod
+    def get_key(file_ref: FileReference, headers: list[CorpusHeader], header_strategy: HeaderStrategy) -> Optional[Hashable]:
+        """
+        :param file_ref: the file to be parsed
+        :param headers: the headers the file is to be parsed with
+        :param header_strategy: the header strategy the file is to be parsed with
+        :return: the key of the parsed contents of the file, or None if the file cannot be fingerprinted
+        :rtype: Optional[Hashable]
+        """
+        try:
+            fingerprint: Hashable = file_ref.get_fingerprint()
+        except Exception:
+            # The file cannot be accessed, so the error is raised when it is parsed
+            return None
+        header_key = tuple((header.name, header.datatype, header.include) for header in headers)
+        return fingerprint, header_strategy, header_key
+
+    def get(self, key: Optional[Hashable]) -> Optional[Union[DataFrame, tuple[str, ...]]]:
+        """
+        :param key: the key provided by get_key
+        :return: the cached parsed contents of the file, or None if the file has not been parsed with the same key
+        :rtype: Optional[Union[DataFrame, tuple[str, ...]]]
+        """
+        if key is None:
+            return None
+        parsed_file = self.entries.get(key)
+        if parsed_file is not None:
+            self.add(key, parsed_file)
+        return parsed_file
+
+    def add(self, key: Optional[Hashable], parsed_file: Union[DataFrame, tuple[str, ...]]):
+        """
+        :param key: the key provided by get_key
+        :param parsed_file: the parsed contents of the file
+        """
+        if key is not None:
+            self.build_entries[key] = parsed_file
+            self.build_entries.move_to_end(key)
+
+    def has_file(self, file_ref: FileReference) -> bool:
+        """
+        :param file_ref: the file to check
+        :return: True if the contents of the file are cached with any headers, False otherwise
+        :rtype: bool
+        """
+        if self.fingerprints is None:
+            self.fingerprints = {key[0] for key in self.entries}
+        try:
+            return file_ref.get_fingerprint() in self.fingerprints
+        except Exception:
+            return False
+
+    @staticmethod
+    def _get_entry_memory_usage(parsed_file: Union[DataFrame, tuple[str, ...]]) -> int:
+        if isinstance(parsed_file, DataFrame):
+            return int(parsed_file.memory_usage(index=True, deep=True).sum())
+        return sys.getsizeof(parsed_file) + sum(sys.getsizeof(value) for value in parsed_file)
+
+    def get_memory_usage(self) -> int:
+        """
+        :return: the deep memory usage of the cached contents in bytes
+        :rtype: int
+        """
+        return sum(self._get_entry_size(key) for key in self.entries)
+
+    def _get_entry_size(self, key: Hashable) -> int:
+        entry_size: Optional[int] = self.entry_sizes.get(key)
+        if entry_size is None:
+            entry_size = self._get_entry_memory_usage(self.entries[key])
+            self.entry_sizes[key] = entry_size
+        return entry_size
+
+    def trim(self, max_bytes: int):
+        """
+        Drops the least recently used entries until the deep memory usage of the cached contents is at most max_bytes.
+        Entries kept by the cache are only measured once.
+        :param max_bytes: the maximum deep memory usage of the cached contents in bytes
+        """
+        memory_usage: int = self.get_memory_usage()
+        while (memory_usage > max_bytes) and (len(self.entries) > 0):
+            key, _ = self.entries.popitem(last=False)
+            memory_usage -= self.entry_sizes.pop(key)
+        self.fingerprints = None
+
+    def start_build(self):
+        self.build_entries = OrderedDict()
+
+    def finish_build(self, succeeded: bool):
+        """
+        :param succeeded: if True, the cache is replaced with the entries used by the build. Otherwise, the entries parsed by the build are added to the cache
+        """
+        if succeeded:
+            self.entries = self.build_entries
+            self.entry_sizes = {key: size for key, size in self.entry_sizes.items() if key in self.entries}
+        else:
+            for key, parsed_file in self.build_entries.items():
+                self.entries[key] = parsed_file
+                self.entries.move_to_end(key)
+        self.build_entries = OrderedDict()
+        self.fingerprints = None
+        if self.max_bytes is not None:
+            self.trim(self.max_bytes)
+
+    def clear(self):
+        self.entries = OrderedDict()
+        self.build_entries = OrderedDict()
+        self.entry_sizes = {}
+        self.fingerprints = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
@@ -0,0 +1,71 @@
+from abc import abstractmethod
+from typing import Optional
+
+from pandas import DataFrame
+from panel.widgets import Tqdm
+
+from atap_corpus_loader.controller.data_objects import CorpusHeader, DataType, HeaderStrategy
+from atap_corpus_loader.controller.loader_service.file_loader_strategy.FileLoaderStrategy import FileLoaderStrategy
+
+
+class DocumentLoaderStrategy(FileLoaderStrategy):
+    """
+    An abstract class for file types that hold a single document per file, e.g. plain text or word processor documents.
+    Each file is a single row of text columns, so rather than building a DataFrame per file, the values of the row can
+    be provided with get_row_values and collected into columns for many files at once.
+    A concrete class should implement get_document to extract the text of the document.
+    """
+    DOCUMENT_COLUMNS: tuple[str, ...] = ('document', 'filename', 'filepath')
+
+    def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
+        headers: list[CorpusHeader] = [
+            CorpusHeader('document', DataType.TEXT, include=True),
+            CorpusHeader('filename', DataType.TEXT),
+            CorpusHeader('filepath', DataType.TEXT)
+        ]
+
+        return headers
+
+    @abstractmethod
+    def get_document(self) -> str:
+        """
+        :return: the text of the document held in the file
+        :rtype: str
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def get_included_columns(headers: list[CorpusHeader]) -> list[str]:
+        """
+        :param headers: the CorpusHeader objects representing the columns. CorpusHeader objects with include as False will be ignored
+        :return: the names of the included columns, in the order their values are provided by get_row_values
+        :rtype: list[str]
+        """
+        included_headers: set[str] = {header.name for header in headers if header.include}
+        return [column for column in DocumentLoaderStrategy.DOCUMENT_COLUMNS if column in included_headers]
+
+    def get_row_values(self, included_columns: list[str]) -> tuple[str, ...]:
+        """
+        :param included_columns: the names of the columns to provide, as returned by get_included_columns
+        :return: the values of the included columns for the file, in the same order as included_columns
+        :rtype: tuple[str, ...]
+        """
+        row_values: list[str] = []
+        for column in included_columns:
+            if column == 'document':
+                row_values.append(self.get_document())
+            elif column == 'filename':
+                row_values.append(self.file_ref.get_filename_no_ext())
+            elif column == 'filepath':
+                row_values.append(self.file_ref.get_path())
+
+        return tuple(row_values)
+
+    def get_dataframe(self, headers: list[CorpusHeader], header_strategy: HeaderStrategy, tqdm_obj: Optional[Tqdm] = None) -> DataFrame:
+        included_columns: list[str] = self.get_included_columns(headers)
+        row_values: tuple[str, ...] = self.get_row_values(included_columns)
+        file_data = {column: [value] for column, value in zip(included_columns, row_values)}
+
+        df: DataFrame = DataFrame(file_data, dtype=DataType.TEXT.get_dtype(self.string_storage))
+
+        return df
@@ -1,6 +1,7 @@
 from enum import Enum, auto
+from typing import Optional
 
-from atap_corpus_loader.controller.data_objects import FileReference
+from atap_corpus_loader.controller.data_objects import FileReference, StringStorage
 from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
 from atap_corpus_loader.controller.loader_service.file_loader_strategy.concrete_strategies import *
 from atap_corpus_loader.controller.loader_service.file_loader_strategy.FileLoaderStrategy import FileLoaderStrategy
@@ -40,12 +41,15 @@ class FileLoaderFactory:
     }
 
     @staticmethod
-    def get_file_loader(file_ref: FileReference) -> FileLoaderStrategy:
+    def get_file_loader(file_ref: FileReference, string_storage: StringStorage = StringStorage.PYTHON,
+                        max_rows: Optional[int] = None) -> FileLoaderStrategy:
         """
         Maps the provided FileReference object to a concrete FileLoaderStrategy object based on the extension.
         If the file extension is missing (the filename is not of the format <name>.<extension> or is not
         valid, i.e. is not a member of the ValidFileType enum) a FileLoadError will be raised.
         :param file_ref: the FileReference object corresponding to the file to assign a loader to
+        :param string_storage: the storage used by the loader for the values of TEXT columns
+        :param max_rows: the maximum number of rows read by the loader from a tabular file, or None to read all rows
         :return: a concrete FileLoaderStrategy object that has been passed the provided FileReference object.
         :raises FileLoadError: if there is no '.' in the file name or the extension after the '.' is not a valid file type
         """
@@ -57,7 +61,7 @@ class FileLoaderFactory:
 
         try:
             file_type: ValidFileType = ValidFileType[file_extension]
-            file_loader: FileLoaderStrategy = FileLoaderFactory.FILETYPE_LOADER_MAP[file_type](file_ref)
+            file_loader: FileLoaderStrategy = FileLoaderFactory.FILETYPE_LOADER_MAP[file_type](file_ref, string_storage, max_rows)
         except KeyError:
             accepted_types: str = ', '.join([ft.name for ft in ValidFileType])
             raise FileLoadError(f"Invalid file type loaded: {file_extension}. Valid file types: {accepted_types}")
@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from io import BytesIO, BufferedIOBase
+from typing import Optional, Callable
 
 from pandas import DataFrame, to_datetime
+from pandas.errors import ParserError
 from panel.widgets import Tqdm
 
-from atap_corpus_loader.controller.data_objects import CorpusHeader, FileReference, DataType, HeaderStrategy
+from atap_corpus_loader.controller.data_objects import CorpusHeader, FileReference, DataType, HeaderStrategy, StringStorage
+from atap_corpus_loader.controller.data_objects.BuildMetrics import measure_stage
 from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
 
 
@@ -13,39 +16,96 @@ class FileLoaderStrategy(ABC):
     An abstract class for loading files as DataFrame objects to be used in a DataFrameCorpus.
     A concrete class should extend this class for each file type that is supported.
     """
-    def __init__(self, file_ref: FileReference):
+    # The number of rows sampled from tabular files when inferring headers
+    HEADER_SAMPLE_ROWS: int = 10
+    # The number of bytes initially read from the start of a delimited file when inferring headers
+    HEADER_PREFIX_BYTES: int = 64 * 1024
+
+    def __init__(self, file_ref: FileReference, string_storage: StringStorage = StringStorage.PYTHON,
+                 max_rows: Optional[int] = None):
         """
         :param file_ref: the FileReference object corresponding to the file to be loaded
+        :param string_storage: the storage used for the values of TEXT columns
+        :param max_rows: the maximum number of rows read by get_dataframe from a tabular file, or None to read all rows
         """
         self.file_ref: FileReference = file_ref
+        self.string_storage: StringStorage = string_storage
+        self.max_rows: Optional[int] = max_rows
 
     @staticmethod
-    def _apply_selected_dtypes(df: DataFrame, headers: list[CorpusHeader]) -> DataFrame:
+    def _apply_selected_dtypes(df: DataFrame, headers: list[CorpusHeader],
+                               string_storage: StringStorage = StringStorage.PYTHON) -> DataFrame:
         """
         Attempts to cast each column within the provided DataFrame to the data types specified in headers.
         :param df: the DataFrame object whose columns will be type cast
         :param headers: the CorpusHeader objects representing the columns of the DataFrame. CorpusHeader objects with
         include as False will be ignored.
+        :param string_storage: the storage used for the values of TEXT columns
         :return: the DataFrame with columns cast to the given data types
         """
 
-        for header in headers:
-            if not header.include:
-                continue
-            if header.datatype == DataType.DATETIME:
-                # Datetimes require handling timezone aware and timezone naive cases
-                col = to_datetime(df[header.name], errors='coerce')
-                if col.dt.tz is not None:
-                    col = col.dt.tz_convert(None)
-                df[header.name] = col
-            else:
-                try:
-                    df[header.name] = df[header.name].astype(header.datatype.value)
-                except ValueError:
-                    raise FileLoadError(f"Could not cast value from {header.name} to {header.datatype.name}. Try modifying the selected datatype")
+        with measure_stage('dtypes'):
+            for header in headers:
+                if not header.include:
+                    continue
+                if header.datatype == DataType.DATETIME:
+                    # Datetimes require handling timezone aware and timezone naive cases
+                    col = to_datetime(df[header.name], errors='coerce')
+                    if col.dt.tz is not None:
+                        col = col.dt.tz_convert(None)
+                    df[header.name] = col
+                else:
+                    try:
+                        df[header.name] = df[header.name].astype(header.datatype.get_dtype(string_storage))
+                    except ValueError:
+                        raise FileLoadError(f"Could not cast value from {header.name} to {header.datatype.name}. Try modifying the selected datatype")
 
         return df
 
+    def _parse_content_prefix(self, parse_fn: Callable[[BytesIO], list[DataFrame]]) -> list[DataFrame]:
+        """
+        Parses a sample of a delimited text file from a bounded prefix of the file rather than the whole file.
+        The prefix is trimmed to the last complete line. If the prefix does not hold enough lines for parse_fn to read
+        HEADER_SAMPLE_ROWS rows from each DataFrame, or cannot be parsed (e.g. it ends within a quoted value spanning
+        multiple lines), the prefix size is doubled and parsing is retried.
+        :param parse_fn: parses the provided prefix into one or more DataFrame objects of at most HEADER_SAMPLE_ROWS rows
+        :return: the DataFrame objects returned by parse_fn
+        :rtype: list[DataFrame]
+        """
+        max_bytes: int = self.HEADER_PREFIX_BYTES
+        while True:
+            prefix: bytes = self.file_ref.get_content_prefix(max_bytes)
+            is_whole_file: bool = len(prefix) < max_bytes
+            if not is_whole_file:
+                prefix = prefix[:prefix.rfind(b'\n') + 1]
+                # The header row and the sample rows are required
+                if prefix.count(b'\n') <= self.HEADER_SAMPLE_ROWS:
+                    max_bytes *= 2
+                    continue
+
+            try:
+                sample_dfs: list[DataFrame] = parse_fn(BytesIO(prefix))
+            except ParserError:
+                if is_whole_file:
+                    raise
+                max_bytes *= 2
+                continue
+            if is_whole_file or all(len(df) >= self.HEADER_SAMPLE_ROWS for df in sample_dfs):
+                return sample_dfs
+            max_bytes *= 2
+
+    def _open_random_access_stream(self) -> BufferedIOBase:
+        """
+        Provides a seekable binary stream of the file for formats that must be read out of order, e.g. spreadsheets
+        whose index is at the end of the file. Files on disk are streamed, while zipped files are read into memory as
+        seeking backwards within a zipped file requires decompressing it again from the start.
+        :return: the seekable binary stream of the file contents, which should be closed after use
+        :rtype: BufferedIOBase
+        """
+        if self.file_ref.is_zipped():
+            return self.file_ref.get_content_buffer()
+        return self.file_ref.open_stream()
+
     @abstractmethod
     def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
         """
@@ -64,6 +124,7 @@ class FileLoaderStrategy(ABC):
         Provides a DataFrame object containing the data from the loaded file.
         Columns of the DataFrame will be cast to the data types specified in the headers parameter.
         The DataFrame will exclude a column of data if its corresponding CorpusHeader object has include set to False
+        If max_rows is set, at most max_rows rows are read from the start of the file.
         :param tqdm_obj: the progress indicator object that tracks the progress of the DataFrame construction. Can be ignored in implementation, i.e. for text files
         :type tqdm_obj: Optional[panel.widgets.Tqdm]
         :param headers: a list of CorpusHeader objects corresponding to the data found within the file
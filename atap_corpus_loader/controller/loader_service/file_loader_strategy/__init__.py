@@ -1,2 +1,3 @@
 from .FileLoaderStrategy import FileLoaderStrategy
+from .DocumentLoaderStrategy import DocumentLoaderStrategy
 from .FileLoaderFactory import FileLoaderFactory
@@ -23,25 +23,42 @@ class TSVLoaderStrategy(FileLoaderStrategy):
     def _rename_headers(df: DataFrame):
         df.columns = [f'Data_{c}' for c in df.columns.astype(str)]
 
-    @staticmethod
-    def _detect_headers(file_buf: BytesIO) -> bool:
-        read_rows = 10
-        file_buf.seek(0)
-        df_no_header = read_csv(file_buf, header=None, nrows=read_rows, sep='\t')
-        file_buf.seek(0)
-        df_header = read_csv(file_buf, nrows=read_rows, sep='\t')
-        file_buf.seek(0)
-        return tuple(df_no_header.dtypes) != tuple(df_header.dtypes)
+    def _read_header_sample(self, header_strategy: HeaderStrategy) -> tuple[DataFrame, bool]:
+        """
+        Reads a sample of rows from a bounded prefix of the file, parsing the prefix with a header row only if required
+        by the header strategy, and without a header row only if required.
+        :return: a tuple of the sample DataFrame, with columns named according to the header strategy, and whether a header row was detected
+        :rtype: tuple[DataFrame, bool]
+        """
+        read_rows: int = self.HEADER_SAMPLE_ROWS
+        parse_header: bool = header_strategy != HeaderStrategy.NO_HEADERS
+        parse_no_header: bool = header_strategy != HeaderStrategy.HEADERS
 
-    def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
-        read_rows = 10
-        file_buf: BytesIO = self.file_ref.get_content_buffer()
-        header_detected: bool = self._detect_headers(file_buf)
-        if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
-            df = read_csv(file_buf, header=0, nrows=read_rows, sep='\t')
+        def parse_sample(sample_buf: BytesIO) -> list[DataFrame]:
+            sample_dfs: list[DataFrame] = []
+            if parse_header:
+                sample_buf.seek(0)
+                sample_dfs.append(read_csv(sample_buf, header=0, nrows=read_rows, sep='\t'))
+            if parse_no_header:
+                sample_buf.seek(0)
+                sample_dfs.append(read_csv(sample_buf, header=None, nrows=read_rows, sep='\t'))
+            return sample_dfs
+
+        sample_dfs: list[DataFrame] = self._parse_content_prefix(parse_sample)
+        header_detected: bool = False
+        if parse_header and parse_no_header:
+            header_detected = tuple(sample_dfs[1].dtypes) != tuple(sample_dfs[0].dtypes)
+
+        if (header_strategy == HeaderStrategy.HEADERS) or ((header_strategy == HeaderStrategy.INFER) and header_detected):
+            df = sample_dfs[0]
         else:
-            df = read_csv(file_buf, header=None, nrows=read_rows, sep='\t')
+            df = sample_dfs[-1]
             self._rename_headers(df)
+
+        return df, header_detected
+
+    def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
+        df, _ = self._read_header_sample(header_strategy)
         headers: list[CorpusHeader] = []
         empty_columns = df.columns[df.isna().all()]
         df[empty_columns] = df[empty_columns].astype('string')
@@ -59,21 +76,21 @@ class TSVLoaderStrategy(FileLoaderStrategy):
         return headers
 
     def get_dataframe(self, headers: list[CorpusHeader], header_strategy: HeaderStrategy, tqdm_obj: Optional[Tqdm] = None) -> DataFrame:
-        file_buf: BytesIO = self.file_ref.get_content_buffer()
         included_headers: list[str] = [header.name for header in headers if header.include]
-        header_detected: bool = self._detect_headers(file_buf)
-
-        chunksize = 10000
-        total_lines = sum(1 for _ in file_buf)
-        file_buf.seek(0)
-
-        if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
-            df = concat(tqdm_obj(read_csv(file_buf, chunksize=chunksize, header=0, dtype=object, usecols=included_headers, sep='\t'), total=((total_lines-1) // chunksize)+1, unit="chunks", desc="Reading CSV"))
-        else:
-            df = concat(tqdm_obj(read_csv(file_buf, chunksize=chunksize, header=None, dtype=object, sep='\t'), total=(total_lines // chunksize)+1, unit="chunks", desc="Reading CSV"))
-            self._rename_headers(df)
-            df = df[included_headers]
+        header_detected: bool = False
+        if header_strategy == HeaderStrategy.INFER:
+            _, header_detected = self._read_header_sample(header_strategy)
+        with self.file_ref.open_stream() as file_buf:
+            chunksize = 10000
+            # The file is read in a single pass, as counting its lines first would read or decompress it twice, so the
+            # progress is tracked by the chunks read without a total
+            if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
+                df = concat(tqdm_obj(read_csv(file_buf, chunksize=chunksize, nrows=self.max_rows, header=0, dtype=object, usecols=included_headers, sep='\t'), unit="chunks", desc="Reading CSV"))
+            else:
+                df = concat(tqdm_obj(read_csv(file_buf, chunksize=chunksize, nrows=self.max_rows, header=None, dtype=object, sep='\t'), unit="chunks", desc="Reading CSV"))
+                self._rename_headers(df)
+                df = df[included_headers]
 
-        dtypes_applied_df: DataFrame = FileLoaderStrategy._apply_selected_dtypes(df, headers)
+        dtypes_applied_df: DataFrame = FileLoaderStrategy._apply_selected_dtypes(df, headers, self.string_storage)
 
         return dtypes_applied_df
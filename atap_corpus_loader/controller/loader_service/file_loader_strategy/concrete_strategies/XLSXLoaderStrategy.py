@@ -1,4 +1,4 @@
-from io import BytesIO
+from io import BufferedIOBase
 from typing import Optional
 
 from pandas import DataFrame, read_excel, Series, to_datetime
@@ -23,25 +23,38 @@ class XLSXLoaderStrategy(FileLoaderStrategy):
     def _rename_headers(df: DataFrame):
         df.columns = [f'Data_{c}' for c in df.columns.astype(str)]
 
-    @staticmethod
-    def _detect_headers(file_buf: BytesIO) -> bool:
-        read_rows = 10
-        file_buf.seek(0)
-        df_no_header = read_excel(file_buf, header=None, nrows=read_rows)
-        file_buf.seek(0)
-        df_header = read_excel(file_buf, nrows=read_rows)
+    def _read_header_sample(self, file_buf: BufferedIOBase, header_strategy: HeaderStrategy) -> tuple[DataFrame, bool]:
+        """
+        Reads a sample of rows from the first sheet, parsing it with a header row only if required by the header
+        strategy, and without a header row only if required.
+        :return: a tuple of the sample DataFrame, with columns named according to the header strategy, and whether a header row was detected
+        :rtype: tuple[DataFrame, bool]
+        """
+        read_rows: int = self.HEADER_SAMPLE_ROWS
+        df_header: Optional[DataFrame] = None
+        df_no_header: Optional[DataFrame] = None
+        if header_strategy != HeaderStrategy.NO_HEADERS:
+            file_buf.seek(0)
+            df_header = read_excel(file_buf, header=0, nrows=read_rows)
+        if header_strategy != HeaderStrategy.HEADERS:
+            file_buf.seek(0)
+            df_no_header = read_excel(file_buf, header=None, nrows=read_rows)
         file_buf.seek(0)
-        return tuple(df_no_header.dtypes) != tuple(df_header.dtypes)
+        header_detected: bool = False
+        if (df_header is not None) and (df_no_header is not None):
+            header_detected = tuple(df_no_header.dtypes) != tuple(df_header.dtypes)
 
-    def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
-        read_rows = 10
-        file_buf: BytesIO = self.file_ref.get_content_buffer()
-        header_detected: bool = self._detect_headers(file_buf)
-        if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
-            df = read_excel(file_buf, header=0, nrows=read_rows)
+        if (header_strategy == HeaderStrategy.HEADERS) or ((header_strategy == HeaderStrategy.INFER) and header_detected):
+            df = df_header
         else:
-            df = read_excel(file_buf, header=None, nrows=read_rows)
+            df = df_no_header
             self._rename_headers(df)
+
+        return df, header_detected
+
+    def get_inferred_headers(self, header_strategy: HeaderStrategy) -> list[CorpusHeader]:
+        with self._open_random_access_stream() as file_buf:
+            df, _ = self._read_header_sample(file_buf, header_strategy)
         headers: list[CorpusHeader] = []
         empty_columns = df.columns[df.isna().all()]
         df[empty_columns] = df[empty_columns].astype('string')
@@ -56,15 +69,17 @@ class XLSXLoaderStrategy(FileLoaderStrategy):
         return headers
 
     def get_dataframe(self, headers: list[CorpusHeader], header_strategy: HeaderStrategy, tqdm_obj: Optional[Tqdm] = None) -> DataFrame:
-        file_buf: BytesIO = self.file_ref.get_content_buffer()
         included_headers: list[str] = [header.name for header in headers if header.include]
-        header_detected: bool = self._detect_headers(file_buf)
-        if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
-            df = read_excel(file_buf, header=0, dtype=object, usecols=included_headers)
-        else:
-            df = read_excel(file_buf, header=None, dtype=object)
-            self._rename_headers(df)
-            df = df[included_headers]
-        dtypes_applied_df: DataFrame = FileLoaderStrategy._apply_selected_dtypes(df, headers)
+        with self._open_random_access_stream() as file_buf:
+            header_detected: bool = False
+            if header_strategy == HeaderStrategy.INFER:
+                _, header_detected = self._read_header_sample(file_buf, header_strategy)
+            if (header_strategy == header_strategy.HEADERS) or ((header_strategy == header_strategy.INFER) and header_detected):
+                df = read_excel(file_buf, header=0, nrows=self.max_rows, dtype=object, usecols=included_headers)
+            else:
+                df = read_excel(file_buf, header=None, nrows=self.max_rows, dtype=object)
+                self._rename_headers(df)
+                df = df[included_headers]
+        dtypes_applied_df: DataFrame = FileLoaderStrategy._apply_selected_dtypes(df, headers, self.string_storage)
 
         return dtypes_applied_df
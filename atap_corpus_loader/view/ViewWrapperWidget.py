@@ -1,6 +1,7 @@
-from typing import Optional
+from concurrent.futures import Future
+from typing import Optional, Callable
 
-from panel import Tabs
+from panel import Tabs, state
 from panel.viewable import Viewable
 from panel.widgets import TooltipIcon
 
@@ -57,14 +58,47 @@ class ViewWrapperWidget(AbstractWidget):
     def build_corpus(self, corpus_id: str) -> bool:
         success: bool = self.controller.build_corpus(corpus_id)
         if success:
-            self.update_displays()
-
-            self.panel.active = self.corpus_info_idx
-            corpus_id: str = self.controller.get_latest_corpus().name
-            self.controller.display_success(f"Corpus {corpus_id} built successfully")
+            self._display_built_corpus()
 
         return success
 
+    def build_corpus_async(self, corpus_id: str, on_finish: Callable[[bool], None]) -> Future:
+        """
+        Builds the corpus on the build worker thread so the event loop is not blocked.
+        Once the build finishes, the displays are updated and on_finish is called on the event loop of the session that
+        started the build, as the widgets of a session can only be changed safely while its document is locked.
+        :param corpus_id: the name of the corpus to build
+        :param on_finish: called with True if the corpus was built and False otherwise, once the build finishes
+        :return: the Future of the build
+        :rtype: Future
+        """
+        session_doc = state.curdoc
+
+        def finish_build(build_future: Future):
+            success: bool = build_future.result()
+
+            def update_view():
+                if success:
+                    self._display_built_corpus()
+                on_finish(success)
+
+            # Called on the build worker thread, or on the calling thread if the build was rejected
+            if (session_doc is None) or (session_doc.session_context is None):
+                update_view()
+            else:
+                session_doc.add_next_tick_callback(update_view)
+
+        build_future: Future = self.controller.build_corpus_async(corpus_id)
+        build_future.add_done_callback(finish_build)
+        return build_future
+
+    def _display_built_corpus(self):
+        self.update_displays()
+
+        self.panel.active = self.corpus_info_idx
+        corpus_id: str = self.controller.get_latest_corpus().name
+        self.controller.display_success(f"Corpus {corpus_id} built successfully")
+
     def set_load_service_type(self, *_):
         active_tab: int = self.panel.active
         if active_tab == 0:
@@ -45,6 +45,7 @@ class CorpusInfoWidget(AbstractWidget):
             corpus_label += 's'
         if corpus_info.parent_name:
             corpus_label += f" - Parent: {corpus_info.parent_name}"
+        corpus_label += f" - {corpus_info.memory_bytes / 1e6:.1f} MB"
 
         return corpus_label
 
@@ -1,8 +1,11 @@
+from concurrent.futures import Future
+
 from panel import Row, Spacer, Column, HSpacer
 from panel.pane import Markdown
 from panel.widgets import Button, TextInput, TooltipIcon, Select
 
 from atap_corpus_loader.controller import Controller
+from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
 from atap_corpus_loader.view import ViewWrapperWidget
 from atap_corpus_loader.view.gui import AbstractWidget
 from atap_corpus_loader.view.gui.FileSelectorWidget import FileSelectorWidget
@@ -50,9 +53,12 @@ class FileLoaderWidget(AbstractWidget):
         self.corpus_name_input = TextInput(placeholder='Corpus name', width=130)
         self.build_button: Button = Button(name='Build corpus', button_style='solid', button_type='success', width=100)
         self.build_button.on_click(self.build_corpus)
+        self.cancel_build_button: Button = Button(name='Cancel build', button_style='outline', button_type='danger',
+                                                  width=100, visible=False)
+        self.cancel_build_button.on_click(self.cancel_build)
         build_tool_tip: TooltipIcon = self.view_handler.get_tooltip('build_button')
-        self.build_button_row: Row = Row(self.corpus_name_input, self.build_button, build_tool_tip,
-                                         visible=False, align='start')
+        self.build_button_row: Row = Row(self.corpus_name_input, self.build_button, self.cancel_build_button,
+                                         build_tool_tip, visible=False, align='start')
 
         self.file_selector = FileSelectorWidget(view_handler, controller)
         self.file_selector.set_button_operation_fn(self._set_button_status_on_operation)
@@ -97,23 +103,31 @@ class FileLoaderWidget(AbstractWidget):
 
     def _set_build_buttons_status(self, *_):
         files_added: bool = self.controller.is_meta_added() or self.controller.is_corpus_added()
+        unload_disabled: bool = (not files_added) or self.controller.is_building()
         self.build_button_row.visible = files_added
-        self.unload_selected_button.disabled = not files_added
-        self.unload_all_button.disabled = not files_added
+        self.unload_selected_button.disabled = unload_disabled
+        self.unload_all_button.disabled = unload_disabled
         self.header_strategy_selector.disabled = files_added
 
     def _set_button_status_on_operation(self, curr_loading: bool, *_):
-        self.file_selector.selector_widget.disabled = curr_loading
-        self.file_selector.show_hidden_files_checkbox.disabled = curr_loading
-        self.file_selector.expand_archive_checkbox.disabled = curr_loading
-        self.file_selector.select_all_button.disabled = curr_loading
-        self.file_selector.file_type_filter.disabled = curr_loading
-        self.file_selector.filter_input.disabled = curr_loading
-
-        self.load_as_corpus_button.disabled = curr_loading
-        self.load_as_meta_button.disabled = curr_loading
-        self.build_button.disabled = curr_loading
-        self.header_strategy_selector.disabled = curr_loading
+        # The controls stay disabled while an asynchronous build runs, including when an operation finishes during it
+        is_building: bool = self.controller.is_building()
+        disabled: bool = curr_loading or is_building
+        self.file_selector.selector_widget.disabled = disabled
+        self.file_selector.show_hidden_files_checkbox.disabled = disabled
+        self.file_selector.expand_archive_checkbox.disabled = disabled
+        self.file_selector.select_all_button.disabled = disabled
+        self.file_selector.file_type_filter.disabled = disabled
+        self.file_selector.filter_input.disabled = disabled
+
+        self.load_as_corpus_button.disabled = disabled
+        self.load_as_meta_button.disabled = disabled
+        self.build_button.disabled = disabled
+        self.header_strategy_selector.disabled = disabled
+        files_added: bool = self.controller.is_meta_added() or self.controller.is_corpus_added()
+        self.unload_selected_button.disabled = disabled or (not files_added)
+        self.unload_all_button.disabled = disabled or (not files_added)
+        self.meta_editor.set_disabled(is_building)
 
     def load_as_corpus(self, *_):
         self._set_button_status_on_operation(curr_loading=True)
@@ -132,21 +146,36 @@ class FileLoaderWidget(AbstractWidget):
     def unload_selected(self, *_):
         self._set_button_status_on_operation(curr_loading=True)
         file_ls: list[str] = self.file_selector.get_selector_value()
-        self.controller.unload_filepaths(file_ls)
+        try:
+            self.controller.unload_filepaths(file_ls)
+        except FileLoadError as e:
+            self.controller.display_error(str(e))
         self.view_handler.update_displays()
         self._set_button_status_on_operation(curr_loading=False)
 
     def unload_all(self, *_):
         self._set_button_status_on_operation(curr_loading=True)
-        self.controller.unload_all()
+        try:
+            self.controller.unload_all()
+        except FileLoadError as e:
+            self.controller.display_error(str(e))
         self.view_handler.update_displays()
         self._set_button_status_on_operation(curr_loading=False)
 
-    def build_corpus(self, *_):
+    def build_corpus(self, *_) -> Future:
         self._set_button_status_on_operation(curr_loading=True)
-        success: bool = self.view_handler.build_corpus(self.corpus_name_input.value_input)
+        # The headers cannot be edited until the build finishes, at which point _on_build_finished enables them
+        self.meta_editor.set_disabled(True)
+        self.cancel_build_button.visible = True
+        return self.view_handler.build_corpus_async(self.corpus_name_input.value_input, self._on_build_finished)
+
+    def _on_build_finished(self, success: bool):
+        self.cancel_build_button.visible = False
         if success:
             self.corpus_name_input.value_input = ""
             self.corpus_name_input.value = ""
             self.unload_all()
         self._set_button_status_on_operation(curr_loading=False)
+
+    def cancel_build(self, *_):
+        self.controller.cancel_build()
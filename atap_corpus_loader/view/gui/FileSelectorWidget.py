@@ -1,6 +1,5 @@
 import sys
-from fnmatch import fnmatch
-from typing import Callable
+from typing import Callable, Optional
 
 import panel
 from panel import Row, Column
@@ -8,7 +7,7 @@ from panel.pane import Markdown
 from panel.widgets import Button, MultiSelect, TextInput, Select, Checkbox
 
 from atap_corpus_loader.controller import Controller
-from atap_corpus_loader.controller.data_objects import FileReference
+from atap_corpus_loader.controller.data_objects import FileReference, FileFilter
 from atap_corpus_loader.view import ViewWrapperWidget
 from atap_corpus_loader.view.gui import AbstractWidget
 
@@ -50,8 +49,12 @@ class FileSelectorWidget(AbstractWidget):
     """
     Handles the interactive components when selecting files using the panel MultiSelect widget.
     A user-specified wildcard filter controls which files are listed for selection.
+    At most MAX_DISPLAYED_FILES files are listed, so only the first page of a large directory is ever retrieved.
+    When the listing is truncated, "Select all" selects every file matching the filters rather than only those listed,
+    until the selection or filters are changed.
     """
     MAX_WIDTH: int = 1000
+    MAX_DISPLAYED_FILES: int = 10000
 
     @staticmethod
     def _get_short_path(long_path: str, threshold_len: int = 70):
@@ -90,6 +93,10 @@ class FileSelectorWidget(AbstractWidget):
         self.file_type_filter.param.watch(self._on_filter_change, ['value'])
 
         self.selector_widget = MultiSelect(size=10, sizing_mode='stretch_width')
+        self.selector_widget.param.watch(self._on_selection_change, ['value'])
+        self.truncated_msg = Markdown(object="", visible=False)
+        # The paths of every file matching the filters when "Select all" is used on a truncated listing
+        self.all_selected_paths: Optional[list[str]] = None
 
         self.stderr_wrapper = StdErrWrapper()
 
@@ -105,11 +112,12 @@ class FileSelectorWidget(AbstractWidget):
                 )
             ),
             Row(self.selector_widget),
+            self.truncated_msg,
             self.stderr_wrapper,
             max_width=self.MAX_WIDTH
         )
 
-        panel.state.add_periodic_callback(self.update_display, period=2000)
+        panel.state.add_periodic_callback(self._poll_file_changes, period=2000)
         self.update_display()
 
     def set_button_operation_fn(self, _set_button_status_on_operation: Callable):
@@ -119,7 +127,12 @@ class FileSelectorWidget(AbstractWidget):
         loaded_corpus_files: set[FileReference] = self.controller.get_loaded_corpus_files()
         loaded_meta_files: set[FileReference] = self.controller.get_loaded_meta_files()
 
-        filtered_refs: list[FileReference] = self._get_filtered_file_refs()
+        # One more file than can be displayed is retrieved so that truncation can be detected
+        filtered_refs: list[FileReference] = self._get_filtered_file_refs(self.MAX_DISPLAYED_FILES + 1)
+        is_truncated: bool = len(filtered_refs) > self.MAX_DISPLAYED_FILES
+        if is_truncated:
+            filtered_refs = filtered_refs[:self.MAX_DISPLAYED_FILES]
+        self._update_truncated_msg(is_truncated)
 
         filtered_files_dict: dict[str, str] = {}
         checkmark_symbol = "\U00002714"
@@ -133,34 +146,42 @@ class FileSelectorWidget(AbstractWidget):
 
         self.selector_widget.options = filtered_files_dict
 
-    def _get_filtered_file_refs(self) -> list[FileReference]:
+    def _update_truncated_msg(self, is_truncated: bool):
+        if self.all_selected_paths is not None:
+            self.truncated_msg.object = (f"All {len(self.all_selected_paths)} files matching the filters are selected, "
+                                         f"including those not displayed")
+        else:
+            self.truncated_msg.object = (f"Showing the first {self.MAX_DISPLAYED_FILES} files. Use the filter to narrow "
+                                         f"down the files displayed, or select all to select every matching file")
+        self.truncated_msg.visible = is_truncated
+
+    def _poll_file_changes(self):
+        if self.controller.has_file_changes():
+            self.update_display()
+
+    def _get_filtered_file_refs(self, limit: Optional[int]) -> list[FileReference]:
+        """
+        :param limit: the maximum number of files returned, or None to return every file matching the filters
+        :return: the first page of files matching the filters
+        :rtype: list[FileReference]
+        """
         valid_file_types: list[str] = self.controller.get_valid_filetypes()
-        selected_file_types: set[str]
+        selected_file_types: list[str]
         if self.file_type_filter.value in valid_file_types:
-            selected_file_types = {self.file_type_filter.value.upper()}
+            selected_file_types = [self.file_type_filter.value]
         else:
-            selected_file_types = {ft.upper() for ft in valid_file_types}
+            selected_file_types = valid_file_types
 
+        file_filter = FileFilter(file_types=selected_file_types,
+                                 include_hidden=self.show_hidden_files_checkbox.value,
+                                 glob_pattern=f"*{self.filter_input.value}*")
         expand_archived: bool = self.expand_archive_checkbox.value
-        file_refs: list[FileReference] = self.controller.retrieve_all_files(expand_archived)
-
-        filtered_refs: list[FileReference] = []
-        filter_str = f"*{self.filter_input.value}*"
-        skip_hidden: bool = not self.show_hidden_files_checkbox.value
-        for ref in file_refs:
-            if ref.get_extension().upper() not in selected_file_types:
-                continue
-            if not fnmatch(ref.get_path(), filter_str):
-                continue
-            if skip_hidden and ref.is_hidden():
-                continue
 
-            filtered_refs.append(ref)
-
-        return filtered_refs
+        return self.controller.retrieve_files_page(expand_archived, 0, limit, file_filter)
 
     def _on_filter_change(self, *_):
         self._set_button_status_on_operation(curr_loading=True)
+        self.all_selected_paths = None
         self.update_display()
         self._set_button_status_on_operation(curr_loading=False)
         self._check_for_download()
@@ -172,12 +193,26 @@ class FileSelectorWidget(AbstractWidget):
         if success:
             self.filter_input.value = ""
 
+    def _on_selection_change(self, *_):
+        if self.all_selected_paths is not None:
+            self.all_selected_paths = None
+            self._update_truncated_msg(self.truncated_msg.visible)
+
     def select_all(self, *_):
         self._set_button_status_on_operation(curr_loading=True)
         self.selector_widget.value = list(self.selector_widget.options.values())
+        if self.truncated_msg.visible:
+            self.all_selected_paths = [ref.get_path() for ref in self._get_filtered_file_refs(limit=None)]
+            self._update_truncated_msg(True)
         self._set_button_status_on_operation(curr_loading=False)
 
     def get_selector_value(self) -> list[str]:
+        """
+        :return: the paths of the selected files, including those not displayed if "Select all" was used on a truncated listing
+        :rtype: list[str]
+        """
+        if self.all_selected_paths is not None:
+            return self.all_selected_paths
         return self.selector_widget.value
 
     def get_show_hidden_value(self) -> bool:
@@ -1,11 +1,13 @@
+from functools import partial
 from typing import Optional
 
-from panel import Column, GridBox, bind, Row, Spacer
+from panel import Column, GridBox, bind, Row, Spacer, state
 from panel.pane import Markdown, Str
 from panel.widgets import Select, Checkbox, Button
 
 from atap_corpus_loader.controller import Controller
 from atap_corpus_loader.controller.data_objects.CorpusHeader import CorpusHeader
+from atap_corpus_loader.controller.data_objects.LinkReport import LinkReport
 from atap_corpus_loader.view import ViewWrapperWidget
 from atap_corpus_loader.view.gui import AbstractWidget
 
@@ -20,6 +22,8 @@ class MetaEditorWidget(AbstractWidget):
         super().__init__()
         self.view_handler: ViewWrapperWidget = view_handler
         self.controller: Controller = controller
+        # True while the headers cannot be edited, e.g. while a corpus is being built
+        self.is_disabled: bool = False
 
         self.corpus_table_container = GridBox(styles=MetaEditorWidget.TABLE_BORDER_STYLE)
         self.meta_table_container = GridBox(styles=MetaEditorWidget.TABLE_BORDER_STYLE)
@@ -54,6 +58,7 @@ class MetaEditorWidget(AbstractWidget):
                                  self.corpus_link_dropdown,
                                  self.link_markdown.clone(),
                                  self.meta_link_dropdown]
+        self.link_report_markdown = Markdown(visible=False)
 
         self.corpus_editor_control_row = Row(self.corpus_include_all_Button, self.corpus_exclude_all_Button, self.text_header_dropdown, visible=False)
         self.meta_editor_control_row = Row(self.meta_include_all_button, self.meta_exclude_all_button, visible=False)
@@ -67,6 +72,7 @@ class MetaEditorWidget(AbstractWidget):
             self.corpus_table_container,
             Spacer(height=20),
             self.link_row,
+            self.link_report_markdown,
             Spacer(height=20),
             self.meta_table_row,
             self.meta_editor_control_row,
@@ -80,6 +86,21 @@ class MetaEditorWidget(AbstractWidget):
         self._build_meta_table()
         self._update_dropdowns()
 
+    def set_disabled(self, disabled: bool):
+        """
+        Disables or enables every control that edits the headers
+        :param disabled: True to disable the controls, False to enable them
+        """
+        if disabled == self.is_disabled:
+            return
+        self.is_disabled = disabled
+        for control in (self.text_header_dropdown, self.corpus_link_dropdown, self.meta_link_dropdown,
+                        self.corpus_include_all_Button, self.corpus_exclude_all_Button,
+                        self.meta_include_all_button, self.meta_exclude_all_button):
+            control.disabled = disabled
+        self._build_corpus_table()
+        self._build_meta_table()
+
     def _toggle_all_corpus(self, state: bool, *_):
         for checkbox in self.corpus_checkboxes:
             if not checkbox.disabled:
@@ -101,10 +122,32 @@ class MetaEditorWidget(AbstractWidget):
     def _set_corpus_link_header(self, header_name: str):
         self.controller.set_corpus_link_header(header_name)
         self.update_display()
+        self._update_link_report()
 
     def _set_meta_link_header(self, header_name: str):
         self.controller.set_meta_link_header(header_name)
         self.update_display()
+        self._update_link_report()
+
+    def _update_link_report(self):
+        # The report reads the linking labels of every loaded file, so it is computed off the event loop
+        self.controller.request_link_report(self._on_link_report)
+
+    def _on_link_report(self, link_report: Optional[LinkReport]):
+        state.execute(partial(self._display_link_report, link_report))
+
+    def _display_link_report(self, link_report: Optional[LinkReport]):
+        if link_report is None:
+            self.link_report_markdown.visible = False
+            return
+
+        report_text: str = (f"**{link_report.num_matched_rows}** of **{link_report.num_corpus_rows}** corpus rows "
+                            f"match the metadata ({link_report.get_match_rate():.0%})")
+        if not link_report.is_one_to_one():
+            report_text += (f". {link_report.num_duplicate_meta_keys} metadata linking labels are held by more than one "
+                            f"metadata row, so the built corpus will have **{link_report.num_linked_rows}** rows")
+        self.link_report_markdown.object = report_text
+        self.link_report_markdown.visible = True
 
     def _get_table_cells_list(self, headers: list[CorpusHeader], link_header: CorpusHeader, is_meta_table: bool) -> tuple[int, list]:
         all_datatypes: list[str] = self.controller.get_all_datatypes()
@@ -132,14 +175,16 @@ class MetaEditorWidget(AbstractWidget):
             header_name_truncated: str = header.name[:MetaEditorWidget.MAX_HEADER_LENGTH]
             table_cells.append(Markdown(header_name_truncated, align='start', styles=MetaEditorWidget.HEADER_STYLE))
 
-            datatype_selector = Select(options=all_datatypes, value=header.datatype.name, width=100, disabled=is_text)
+            datatype_selector = Select(options=all_datatypes, value=header.datatype.name, width=100,
+                                       disabled=(is_text or self.is_disabled))
             if is_meta_table:
                 dtype_fn = bind(self.controller.update_meta_header, header, None, datatype_selector)
             else:
                 dtype_fn = bind(self.controller.update_corpus_header, header, None, datatype_selector)
             table_cells.append(Row(datatype_selector, Column(dtype_fn, visible=False)))
 
-            include_checkbox = Checkbox(value=header.include, align='center', disabled=(is_text or is_link))
+            include_checkbox = Checkbox(value=header.include, align='center',
+                                        disabled=(is_text or is_link or self.is_disabled))
             if is_meta_table:
                 self.meta_checkboxes.append(include_checkbox)
                 include_fn = bind(self.controller.update_meta_header, header, include_checkbox, None)
@@ -215,5 +260,6 @@ class MetaEditorWidget(AbstractWidget):
 
         if (meta_link_header is None) or (corpus_link_header is None):
             self.link_row.styles = MetaEditorWidget.ERROR_BORDER_STYLE
+            self.link_report_markdown.visible = False
         else:
             self.link_row.styles = {}
@@ -1,9 +1,13 @@
+from functools import partial
+
 import panel
 
 
 class NotifierService:
     """
     Provides an object to handle GUI notifications as an indirection from the Panel library notifications.
+    Notifications raised outside the event loop of the current session, e.g. by a build running on a worker thread, are
+    scheduled on the event loop, as the models of a session can only be changed safely while its document is locked.
     """
     def __init__(self):
         panel.extension(notifications=True)
@@ -13,11 +17,22 @@ class NotifierService:
         Renders the provided error message. The notification will last indefinitely until the user dismisses it.
         :param error_msg: The error message to be displayed as a string
         """
-        panel.state.notifications.error(error_msg, duration=0)
+        panel.state.execute(partial(self._notify, 'error', error_msg, 0))
 
     def notify_success(self, success_msg: str):
         """
         Renders the provided success message. The notification will last for 3 seconds or until the user dismisses it.
         :param success_msg: The success message to be displayed as a string
         """
-        panel.state.notifications.success(success_msg, duration=3000)
+        panel.state.execute(partial(self._notify, 'success', success_msg, 3000))
+
+    def notify_info(self, info_msg: str):
+        """
+        Renders the provided informational message. The notification will last for 3 seconds or until the user dismisses it.
+        :param info_msg: The informational message to be displayed as a string
+        """
+        panel.state.execute(partial(self._notify, 'info', info_msg, 3000))
+
+    @staticmethod
+    def _notify(notification_type: str, msg: str, duration: int):
+        getattr(panel.state.notifications, notification_type)(msg, duration=duration)
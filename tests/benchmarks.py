@@ -0,0 +1,119 @@
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+import warnings
+from typing import Callable
+
+warnings.filterwarnings(action="ignore", category=FutureWarning)
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from pandas import DataFrame, concat
+
+from atap_corpus_loader.controller.data_objects import CorpusHeader, DataType, HeaderStrategy, FileReferenceFactory, \
+    StringStorage
+from atap_corpus_loader.controller.data_objects.FileReference import DiskFileReference
+from atap_corpus_loader.controller.loader_service.LoaderService import LoaderService, _no_progress
+from atap_corpus_loader.controller.loader_service.file_loader_strategy import FileLoaderFactory
+
+"""
+Benchmarks for performance sensitive parts of the corpus loader. Run with:
+    python3 tests/benchmarks.py
+The results are printed to stdout and are intended for comparison between revisions on the same machine.
+"""
+
+
+def _measure_allocated_bytes(fn: Callable) -> tuple[int, object]:
+    tracemalloc.start()
+    start_bytes, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    end_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return end_bytes - start_bytes, result
+
+
+def bench_file_reference_memory(num_refs: int = 200000, files_per_dir: int = 200):
+    paths: list[str] = [f"/data/corpora/collection_{i // files_per_dir}/document_{i}.txt" for i in range(num_refs)]
+
+    def create_refs() -> list[DiskFileReference]:
+        refs = [DiskFileReference(path) for path in paths]
+        # Access the derived fields as the file selector does when filtering
+        for ref in refs:
+            ref.get_extension()
+            ref.is_hidden()
+            ref.get_directory_path()
+        return refs
+
+    allocated_bytes, refs = _measure_allocated_bytes(create_refs)
+    print(f"FileReference memory: {allocated_bytes / num_refs:.1f} bytes per reference "
+          f"({num_refs} references, excluding path strings)")
+
+
+def bench_document_ingestion(num_files: int = 500000, files_per_dir: int = 1000):
+    headers: list[CorpusHeader] = [CorpusHeader('document', DataType.TEXT), CorpusHeader('filename', DataType.TEXT),
+                                   CorpusHeader('filepath', DataType.TEXT)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths: list[str] = []
+        for i in range(num_files):
+            dir_path: str = os.path.join(temp_dir, f'collection_{i // files_per_dir}')
+            if i % files_per_dir == 0:
+                os.mkdir(dir_path)
+            path: str = os.path.join(dir_path, f'document_{i}.txt')
+            with open(path, 'w') as f:
+                f.write(f'The text of document {i}')
+            paths.append(path)
+        factory = FileReferenceFactory()
+        file_refs = [factory.get_file_ref(path) for path in paths]
+
+        # The previous ingestion path, which builds a DataFrame per file and concatenates them
+        start_time: float = time.perf_counter()
+        per_file_dfs: list[DataFrame] = [FileLoaderFactory.get_file_loader(ref).get_dataframe(headers, HeaderStrategy.HEADERS)
+                                         for ref in file_refs]
+        per_file_df: DataFrame = concat(per_file_dfs, ignore_index=True)
+        per_file_time: float = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        batch_df: DataFrame = LoaderService._get_concatenated_dataframe(file_refs, headers, HeaderStrategy.HEADERS,
+                                                                        _no_progress, "")
+        batch_time: float = time.perf_counter() - start_time
+
+    assert per_file_df.equals(batch_df)
+    print(f"TXT ingestion of {num_files} files: {per_file_time:.1f}s per file DataFrames, "
+          f"{batch_time:.1f}s batched columns ({per_file_time / batch_time:.1f}x)")
+
+
+def bench_string_storage(num_files: int = 200000, files_per_dir: int = 1000):
+    headers: list[CorpusHeader] = [CorpusHeader('document', DataType.TEXT), CorpusHeader('filename', DataType.TEXT),
+                                   CorpusHeader('filepath', DataType.TEXT)]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths: list[str] = []
+        for i in range(num_files):
+            dir_path: str = os.path.join(temp_dir, f'collection_{i // files_per_dir}')
+            if i % files_per_dir == 0:
+                os.mkdir(dir_path)
+            path: str = os.path.join(dir_path, f'document_{i}.txt')
+            with open(path, 'w') as f:
+                f.write(f'The text of document {i}')
+            paths.append(path)
+        factory = FileReferenceFactory()
+        file_refs = [factory.get_file_ref(path) for path in paths]
+
+        for string_storage in StringStorage:
+            start_time: float = time.perf_counter()
+            df: DataFrame = LoaderService._get_concatenated_dataframe(file_refs, headers, HeaderStrategy.HEADERS,
+                                                                      _no_progress, "", string_storage=string_storage)
+            ingest_time: float = time.perf_counter() - start_time
+            memory_bytes: int = int(df.memory_usage(deep=True).sum())
+
+            start_time = time.perf_counter()
+            concat([df, df], ignore_index=True)
+            concat_time: float = time.perf_counter() - start_time
+            print(f"{string_storage.value} string storage of {num_files} TXT files: {memory_bytes / 1e6:.1f} MB, "
+                  f"{ingest_time:.1f}s ingestion, {concat_time:.2f}s concat")
+
+
+if __name__ == '__main__':
+    bench_file_reference_memory()
+    bench_document_ingestion()
+    bench_string_storage()
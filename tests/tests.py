@@ -1,17 +1,80 @@
+import errno
+import shutil
 import sys
+import tempfile
+import threading
 import unittest
 import os
+import pickle
+import time
 import warnings
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from typing import Optional
+from unittest import mock
 
+import numpy as np
 from atap_corpus.corpus.corpus import DataFrameCorpus
-from pandas import DataFrame
+from bokeh.document import Document
+from pandas import DataFrame, read_csv, ArrowDtype, merge
+from panel import state as panel_state
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from atap_corpus_loader import CorpusLoader
+from atap_corpus_loader.controller.data_objects import FileReferenceFactory, FileFilter, HeaderStrategy, CorpusHeader, \
+    DataType
+from atap_corpus_loader.controller.data_objects.FileReference import DiskFileReference, RemoteFileReference
+from atap_corpus_loader.controller.data_objects.ZipArchiveIndex import ZipArchiveIndex
+from atap_corpus_loader.controller.file_watcher import (FileChange, FileChangeType, FileWatcher, FileWatcherFactory,
+                                                        InotifyFileWatcher, PollingFileWatcher)
+from atap_corpus_loader.controller.loader_service.ArrowSpillStore import ArrowSpillStore
+from atap_corpus_loader.controller.loader_service.DirectoryIndex import DirectoryIndex
+from atap_corpus_loader.controller.loader_service.FileLoaderService import FileLoaderService
+from atap_corpus_loader.controller.loader_service.FileLoadError import FileLoadError
+from atap_corpus_loader.controller.loader_service.LinkIndex import LinkIndex
+from atap_corpus_loader.controller.loader_service.LoaderService import LoaderService, _no_progress
+from atap_corpus_loader.controller.loader_service.ParsedFileCache import ParsedFileCache
+from atap_corpus_loader.controller.loader_service.file_loader_strategy import FileLoaderFactory
 from atap_corpus_loader.view.gui import FileLoaderWidget, FileSelectorWidget, MetaEditorWidget
 
 
+class DocumentFilesFixture:
+    """
+    Provides a temporary directory, removed after each test, in which single document text files named doc_00.txt,
+    doc_01.txt, ... and a metadata CSV file linking the documents by filename can be written
+    """
+    def setUp(self):
+        super().setUp()
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir: str = temp_dir.name
+
+    def _write_documents(self, num_docs: int) -> list[str]:
+        """
+        Writes num_docs text files, where the file doc_{i:02}.txt holds 'document {i}'
+        :return: the paths of the files in order
+        """
+        filepaths: list[str] = []
+        for i in range(num_docs):
+            filepath: str = os.path.join(self.temp_dir, f'doc_{i:02}.txt')
+            with open(filepath, 'w') as f:
+                f.write(f'document {i}')
+            filepaths.append(filepath)
+        return filepaths
+
+    def _write_meta(self, meta_label: str, meta_values: dict[int, str]) -> str:
+        """
+        Writes meta.csv with a 'filename' column linking to the documents and a meta_label column, with a row for each
+        document number in meta_values
+        :return: the path of the metadata file
+        """
+        meta_path: str = os.path.join(self.temp_dir, 'meta.csv')
+        with open(meta_path, 'w') as f:
+            f.write(f'filename,{meta_label}\n' + ''.join(f'doc_{i:02},{value}\n' for i, value in meta_values.items()))
+        return meta_path
+
+
 class TestFileTypes(unittest.TestCase):
     TEST_DIR: str = str(os.path.join(os.path.dirname(__file__), 'test_data'))
     META_LINKING_HEADER: str = "filename"
@@ -88,7 +151,7 @@ class TestFileTypes(unittest.TestCase):
             header.include = True
 
         # Build the corpus
-        file_loader_widget.build_corpus()
+        self.assertTrue(file_loader_widget.build_corpus().result())
 
         # Compare the resulting DataFrame to the expected DataFrame
         corpus: DataFrameCorpus = self.corpus_loader.get_latest_corpus()
@@ -178,5 +241,1380 @@ class TestFileTypes(unittest.TestCase):
         self._test_file_filter(corpus_filter, meta_filter)
 
 
+class TestMmapFileTypes(TestFileTypes):
+    """
+    Runs the file type tests with disk files memory mapped rather than copied into memory
+    """
+    def setUp(self):
+        super().setUp()
+        self.corpus_loader = CorpusLoader(TestFileTypes.TEST_DIR, use_mmap=True)
+
+    def test_mmap_reused_and_released(self):
+        controller = self.corpus_loader.controller
+        filepath: str = os.path.join(TestFileTypes.TEST_DIR, 'txt_corpus', 'plato.txt')
+        controller.load_corpus_from_filepaths([filepath], include_hidden=False)
+        file_ref = controller.loader_service.file_ref_factory.get_file_ref(filepath)
+
+        first_buf = file_ref.get_content_buffer()
+        content_map = file_ref.content_map
+        self.assertIsNotNone(content_map)
+        second_buf = file_ref.get_content_buffer()
+        self.assertIs(content_map, file_ref.content_map)
+        self.assertEqual(first_buf.read(), second_buf.read())
+
+        first_buf.close()
+        second_buf.close()
+        controller.unload_filepaths([filepath])
+        self.assertIsNone(file_ref.content_map)
+        self.assertTrue(content_map.closed)
+
+
+class TestSpilledFileTypes(DocumentFilesFixture, TestFileTypes):
+    """
+    Runs the file type tests with corpora built out-of-core through a spill directory
+    """
+    def setUp(self):
+        super().setUp()
+        self.spill_dir: str = tempfile.mkdtemp()
+        self.corpus_loader = CorpusLoader(TestFileTypes.TEST_DIR, spill_dir=self.spill_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def test_spilled_corpus_memory_mapped(self):
+        filepaths: list[str] = self._write_documents(25)
+        meta_path: str = self._write_meta('teacher', {i: f'teacher {i % 3}' for i in range(0, 25, 2)})
+
+        controller = CorpusLoader(self.temp_dir, spill_dir=self.spill_dir).controller
+        controller.loader_service.SPILL_CHUNK_ROWS = 4
+        controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        controller.load_meta_from_filepaths([meta_path], include_hidden=False)
+        controller.set_text_header('document')
+        controller.set_corpus_link_header('filename')
+        controller.set_meta_link_header('filename')
+        for header in controller.get_meta_headers():
+            if header.name == 'teacher':
+                header.datatype = DataType.CATEGORY
+        self.assertTrue(controller.build_corpus('spilled'))
+
+        corpus_df: DataFrame = controller.get_latest_corpus().to_dataframe()
+        self.assertEqual(list(corpus_df['document_']), [f'document {i}' for i in range(0, 25, 2)])
+        self.assertEqual(list(corpus_df['teacher']), [f'teacher {i % 3}' for i in range(0, 25, 2)])
+        self.assertEqual(corpus_df['teacher'].dtype, 'category')
+        self.assertIsInstance(corpus_df['filepath'].dtype, ArrowDtype)
+        # Spill files are removed once memory mapped
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_spill_file_closed_once_read(self):
+        spill_store = ArrowSpillStore(self.spill_dir)
+        spill_path: str = spill_store.create_spill_path()
+        spill_store.write_dataframes(spill_path, [DataFrame({'document': ['a', 'b']}, dtype='string'),
+                                                  DataFrame({'document': ['c']}, dtype='string')])
+        memory_map = spill_store.pa.memory_map
+        sources: list = []
+
+        def track_memory_map(path):
+            source = memory_map(path)
+            sources.append(source)
+            return source
+
+        with mock.patch.object(spill_store.pa, 'memory_map', side_effect=track_memory_map):
+            spilled_df: DataFrame = spill_store.read_dataframe(spill_path)
+        self.assertEqual(len(sources), 1)
+        self.assertTrue(sources[0].closed)
+        # The columns remain readable from the mapped region after the file is closed and removed
+        spill_store.remove(spill_path)
+        self.assertEqual(list(spilled_df['document']), ['a', 'b', 'c'])
+
+
+class TestArrowStringFileTypes(TestFileTypes):
+    """
+    Runs the file type tests with text columns stored in Arrow buffers
+    """
+    def setUp(self):
+        super().setUp()
+        self.corpus_loader = CorpusLoader(TestFileTypes.TEST_DIR, string_storage='pyarrow')
+
+    def test_text_columns_arrow_backed(self):
+        controller = self.corpus_loader.controller
+        txt_filepath: str = os.path.join(TestFileTypes.TEST_DIR, 'txt_corpus', 'plato.txt')
+        csv_filepath: str = os.path.join(TestFileTypes.TEST_DIR, 'csv_corpus', 'philosophers.csv')
+        for filepath, text_header in [(txt_filepath, 'document'), (csv_filepath, 'summary')]:
+            controller.unload_all()
+            controller.load_corpus_from_filepaths([filepath], include_hidden=False)
+            controller.set_text_header(text_header)
+            self.assertTrue(controller.build_corpus(text_header))
+
+            corpus_df: DataFrame = controller.get_latest_corpus().to_dataframe()
+            text_columns: list[str] = [col for col, dtype in corpus_df.dtypes.items() if dtype == 'string']
+            self.assertIn('document_', text_columns)
+            for col in text_columns:
+                self.assertEqual(corpus_df[col].dtype.storage, 'pyarrow')
+
+            exported_df: DataFrame = read_csv(controller.export_corpus(text_header, 'csv'))
+            self.assertEqual(list(exported_df['document_']), list(corpus_df['document_']))
+
+    def test_documents_converted_after_corpus_created(self):
+        controller = self.corpus_loader.controller
+        controller.load_corpus_from_filepaths([os.path.join(TestFileTypes.TEST_DIR, 'txt_corpus', 'plato.txt')],
+                                              include_hidden=False)
+        controller.set_text_header('document')
+        from_dataframe = DataFrameCorpus.from_dataframe
+        doc_storages: list[str] = []
+
+        def record_doc_storage(df: DataFrame, col_doc: str, name: Optional[str] = None):
+            doc_storages.append(df[col_doc].dtype.storage)
+            return from_dataframe(df, col_doc, name)
+
+        with mock.patch.object(DataFrameCorpus, 'from_dataframe', side_effect=record_doc_storage):
+            self.assertTrue(controller.build_corpus('plato'))
+
+        self.assertEqual(doc_storages, ['python'])
+        corpus_df: DataFrame = controller.get_latest_corpus().to_dataframe()
+        self.assertEqual(corpus_df['document_'].dtype.storage, 'pyarrow')
+
+    def test_invalid_string_storage(self):
+        with self.assertRaises(ValueError):
+            CorpusLoader(TestFileTypes.TEST_DIR, string_storage='arrow')
+
+
+class TestProcessFileTypes(DocumentFilesFixture, TestFileTypes):
+    """
+    Runs the file type tests with files parsed in parallel by a process pool
+    """
+    def setUp(self):
+        super().setUp()
+        self.corpus_loader = CorpusLoader(TestFileTypes.TEST_DIR, parse_executor='process', max_workers=2)
+
+    def test_parallel_parse_order_and_errors(self):
+        filepaths: list[str] = self._write_documents(30)
+
+        for executor_type in ('thread', 'process'):
+            controller = CorpusLoader(self.temp_dir, parse_executor=executor_type, max_workers=3).controller
+            controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+            controller.set_text_header('document')
+            self.assertTrue(controller.build_corpus(f'corpus-{executor_type}'))
+            corpus_docs: list[str] = list(controller.get_latest_corpus().docs())
+            self.assertEqual(corpus_docs, [f'document {i}' for i in range(30)])
+
+        with open(filepaths[7], 'wb') as f:
+            f.write(b'\xff\xfe invalid')
+        loader_service = CorpusLoader(self.temp_dir, parse_executor='thread', max_workers=3).controller.file_loader_service
+        loader_service.add_corpus_files(filepaths, False, lambda iterable, **_: iterable)
+        headers = loader_service.get_inferred_corpus_headers()
+        with self.assertRaisesRegex(FileLoadError, 'doc_07.txt: file is not UTF-8 encoded'):
+            loader_service.build_corpus('invalid', headers, [], headers[0], None, None,
+                                        lambda iterable, **_: iterable)
+
+    def test_parallel_header_inference(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = []
+            for i in range(20):
+                filepath: str = os.path.join(temp_dir, f'meta_{i:02}.csv')
+                with open(filepath, 'w') as f:
+                    f.write('filename,year\n' if i != 12 else 'filename,author\n')
+                    f.write(f'doc_{i},{2000 + i}\n')
+                filepaths.append(filepath)
+
+            for executor_type in ('thread', 'process'):
+                loader_service = CorpusLoader(temp_dir, parse_executor=executor_type, max_workers=3).controller.file_loader_service
+                loader_service.add_meta_files(filepaths[:12], False, lambda iterable, **_: iterable)
+                self.assertEqual({header.name for header in loader_service.get_inferred_meta_headers()},
+                                 {'filename', 'year'})
+
+                loader_service.add_meta_files(filepaths, False, lambda iterable, **_: iterable)
+                with self.assertRaisesRegex(FileLoadError, 'Incompatible data labels in file: .*meta_12.csv'):
+                    loader_service.get_inferred_meta_headers()
+                loaded_paths: set[str] = {ref.get_path() for ref in loader_service.get_loaded_meta_files()}
+                self.assertNotIn(filepaths[12], loaded_paths)
+                self.assertEqual(len(loaded_paths), 19)
+
+
+class TestHeaderInference(unittest.TestCase):
+    TEST_DIR: str = TestFileTypes.TEST_DIR
+
+    def test_headers_inferred_from_prefix(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepath: str = os.path.join(temp_dir, 'large.csv')
+            long_value: str = '\n'.join(['line of a long quoted value'] * 5000)
+            with open(filepath, 'w') as f:
+                f.write('document,year,teacher\n')
+                f.write(f'"{long_value}",2000,Plato\n')
+                for i in range(100000):
+                    f.write(f'document {i},{i},Socrates\n')
+
+            file_ref = FileReferenceFactory().get_file_ref(filepath)
+            file_loader = FileLoaderFactory.get_file_loader(file_ref)
+            with mock.patch.object(DiskFileReference, 'get_content_prefix', autospec=True,
+                                   side_effect=DiskFileReference.get_content_prefix) as get_content_prefix:
+                headers = file_loader.get_inferred_headers(HeaderStrategy.INFER)
+            prefix_sizes: list[int] = [call.args[1] for call in get_content_prefix.call_args_list]
+
+            self.assertEqual([header.name for header in headers], ['document', 'year', 'teacher'])
+            # The quoted value spans more than the initial prefix, so the prefix grows, but never to the whole file
+            self.assertGreater(len(prefix_sizes), 1)
+            self.assertLess(max(prefix_sizes), os.path.getsize(filepath))
+
+            df: DataFrame = file_loader.get_dataframe(headers, HeaderStrategy.INFER, lambda iterable, **_: iterable)
+            self.assertEqual(len(df), 100001)
+            self.assertEqual(df['document'].iloc[0], long_value)
+
+    def test_prefix_headers_match_full_read(self):
+        factory = FileReferenceFactory()
+        csv_path: str = os.path.join(self.TEST_DIR, 'csv_corpus', 'philosophers.csv')
+        tsv_path: str = os.path.join(self.TEST_DIR, 'tsv_meta', 'philosophers.tsv')
+        zip_ref = [ref for ref in factory.get_zip_file_refs(os.path.join(self.TEST_DIR, 'csv_corpus.zip'))
+                   if ref.get_path().endswith('csv_corpus/philosophers.csv')][0]
+        for file_ref in (factory.get_file_ref(csv_path), factory.get_file_ref(tsv_path), zip_ref):
+            sep: str = '\t' if file_ref.get_extension() == 'tsv' else ','
+            expected_df: DataFrame = read_csv(file_ref.get_content_buffer(), nrows=10, sep=sep)
+            for header_strategy in (HeaderStrategy.INFER, HeaderStrategy.HEADERS):
+                headers = FileLoaderFactory.get_file_loader(file_ref).get_inferred_headers(header_strategy)
+                self.assertEqual([header.name for header in headers], list(expected_df.columns))
+            headers = FileLoaderFactory.get_file_loader(file_ref).get_inferred_headers(HeaderStrategy.NO_HEADERS)
+            self.assertEqual([header.name for header in headers], [f'Data_{i}' for i in range(len(expected_df.columns))])
+
+
+    def test_cached_headers_only_inferred_for_changed_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = []
+            for i in range(60):
+                filepath: str = os.path.join(temp_dir, f'meta_{i:02}.csv')
+                with open(filepath, 'w') as f:
+                    f.write(f'filename,year\ndoc_{i},{2000 + i}\n')
+                filepaths.append(filepath)
+
+            loader_service = CorpusLoader(temp_dir).controller.file_loader_service
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._infer_headers',
+                            side_effect=lambda file_loader, header_strategy: file_loader.get_inferred_headers(header_strategy)) as infer_headers:
+                loader_service.add_meta_files(filepaths[:50], False, lambda iterable, **_: iterable)
+                headers = loader_service.get_inferred_meta_headers()
+                self.assertEqual(infer_headers.call_count, 50)
+                # Modifying the provided headers does not modify the cached headers
+                headers[0].include = False
+
+                loader_service.add_meta_files(filepaths[50:], False, lambda iterable, **_: iterable)
+                headers = loader_service.get_inferred_meta_headers()
+                self.assertEqual(infer_headers.call_count, 60)
+                self.assertTrue(all(header.include for header in headers))
+
+                with open(filepaths[0], 'w') as f:
+                    f.write('filename,author\ndoc_0,Plato\n')
+                os.utime(filepaths[0], ns=(0, 0))
+                with self.assertRaisesRegex(FileLoadError, 'Incompatible data labels'):
+                    loader_service.get_inferred_meta_headers()
+                self.assertEqual(infer_headers.call_count, 61)
+
+                loader_service.set_header_strategy(HeaderStrategy.NO_HEADERS)
+                headers = loader_service.get_inferred_meta_headers()
+                self.assertEqual([header.name for header in headers], ['Data_0', 'Data_1'])
+                self.assertEqual(infer_headers.call_count, 61 + 59)
+
+    def test_header_executor_reused_until_closed(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = []
+            for i in range(10):
+                filepath: str = os.path.join(temp_dir, f'meta_{i:02}.csv')
+                with open(filepath, 'w') as f:
+                    f.write(f'filename,year\ndoc_{i},{2000 + i}\n')
+                filepaths.append(filepath)
+
+            loader_service = FileLoaderService(temp_dir)
+            loader_service.set_executor_type('thread', 2)
+            loader_service.add_meta_files(filepaths, False, lambda iterable, **_: iterable)
+            with mock.patch.object(loader_service, '_create_executor',
+                                   side_effect=loader_service._create_executor) as create_executor:
+                for strategy in (HeaderStrategy.HEADERS, HeaderStrategy.NO_HEADERS, HeaderStrategy.INFER):
+                    loader_service.set_header_strategy(strategy)
+                    self.assertEqual(len(loader_service.get_inferred_meta_headers()), 2)
+                self.assertEqual(create_executor.call_count, 1)
+
+                header_executor = loader_service.header_executor
+                loader_service.close()
+                self.assertIsNone(loader_service.header_executor)
+                with self.assertRaises(RuntimeError):
+                    header_executor.submit(int)
+
+                loader_service.header_cache.clear()
+                self.assertEqual(len(loader_service.get_inferred_meta_headers()), 2)
+                self.assertEqual(create_executor.call_count, 2)
+            loader_service.close()
+
+    def test_zip_member_fingerprint(self):
+        factory = FileReferenceFactory()
+        zip_refs = factory.get_zip_file_refs(os.path.join(self.TEST_DIR, 'txt_corpus.zip'))
+        fingerprints = [ref.get_fingerprint() for ref in zip_refs]
+        self.assertEqual(len(set(fingerprints)), len(zip_refs))
+        self.assertEqual(fingerprints, [ref.get_fingerprint() for ref in zip_refs])
+
+
+class TestDocumentIngestion(DocumentFilesFixture, unittest.TestCase):
+    def test_document_rows_collected_in_order(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ('a', 'b', 'd', 'e'):
+                with open(os.path.join(temp_dir, f'{name}.txt'), 'w') as f:
+                    f.write(f'Document {name}')
+            with open(os.path.join(temp_dir, 'c.csv'), 'w') as f:
+                f.write('document,filename\nDocument c1,c1\nDocument c2,c2\n')
+
+            factory = FileReferenceFactory()
+            file_refs = [factory.get_file_ref(os.path.join(temp_dir, name))
+                         for name in ('a.txt', 'b.txt', 'c.csv', 'd.txt', 'e.txt')]
+            headers = [CorpusHeader('document', DataType.TEXT), CorpusHeader('filename', DataType.TEXT),
+                       CorpusHeader('filepath', DataType.TEXT, include=False)]
+            for executor in (None, ThreadPoolExecutor(max_workers=2)):
+                df: DataFrame = LoaderService._get_concatenated_dataframe(file_refs, headers, HeaderStrategy.HEADERS,
+                                                                          lambda iterable, **_: iterable, "",
+                                                                          executor, 2)
+                self.assertEqual(list(df.columns), ['document', 'filename'])
+                self.assertEqual(list(df['filename']), ['a', 'b', 'c1', 'c2', 'd', 'e'])
+                self.assertEqual(list(df['document']), ['Document a', 'Document b', 'Document c1',
+                                                        'Document c2', 'Document d', 'Document e'])
+                self.assertEqual(list(df.index), list(range(6)))
+                if executor is not None:
+                    executor.shutdown()
+
+            df = LoaderService._get_concatenated_dataframe(file_refs[:2], headers, HeaderStrategy.HEADERS,
+                                                           lambda iterable, **_: iterable, "")
+            self.assertEqual(df['document'].dtype, 'string')
+            self.assertEqual(list(df['filename']), ['a', 'b'])
+
+
+    def test_rebuild_only_parses_changed_files(self):
+        filepaths: list[str] = self._write_documents(30)
+        meta_path: str = self._write_meta('year', {i: str(2000 + i) for i in range(32)})
+
+        controller = CorpusLoader(self.temp_dir, reuse_parsed_files=True).controller
+        with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file',
+                        side_effect=lambda file_loader, headers, header_strategy, tqdm_obj:
+                        file_loader.get_dataframe(headers, header_strategy, tqdm_obj)) as parse_file:
+            controller.load_corpus_from_filepaths(filepaths[:20], include_hidden=False)
+            controller.load_meta_from_filepaths([meta_path], include_hidden=False)
+            controller.set_text_header('document')
+            controller.set_corpus_link_header('filename')
+            controller.set_meta_link_header('filename')
+            self.assertTrue(controller.build_corpus('first'))
+            self.assertEqual(parse_file.call_count, 21)
+
+            controller.load_corpus_from_filepaths(filepaths[20:], include_hidden=False)
+            self.assertTrue(controller.build_corpus('second'))
+            self.assertEqual(parse_file.call_count, 31)
+            corpus_df: DataFrame = controller.get_latest_corpus().to_dataframe()
+            self.assertEqual(list(corpus_df['document_']), [f'document {i}' for i in range(30)])
+            self.assertEqual(list(corpus_df['year']), [str(2000 + i) for i in range(30)])
+
+            with open(filepaths[3], 'w') as f:
+                f.write('changed document')
+            os.utime(filepaths[3], ns=(0, 0))
+            self.assertTrue(controller.build_corpus('third'))
+            self.assertEqual(parse_file.call_count, 32)
+            self.assertEqual(list(controller.get_latest_corpus().docs())[3], 'changed document')
+
+
+class TestLinkIndex(unittest.TestCase):
+    def test_join_matches_merge(self):
+        corpus_df = DataFrame({'document': ['a', 'b', 'c', 'd', 'e'], 'key': ['x', 'y', 'z', 'x', None],
+                               'note': ['1', '2', '3', '4', '5']}, dtype='string')
+        meta_df = DataFrame({'key': ['x', 'y', 'x', 'w'], 'note': ['m1', 'm2', 'm3', 'm4']}, dtype='string')
+        link_index = LinkIndex(meta_df, 'key')
+        self.assertEqual(link_index.key_counts.tolist(), [1, 2, 1])
+
+        joined_df: DataFrame = link_index.join(corpus_df, 'key')
+        self.assertEqual(list(joined_df.columns), ['document', 'key', 'note', 'note_meta'])
+        self.assertEqual(list(joined_df['document']), ['a', 'a', 'b', 'd', 'd'])
+        self.assertEqual(list(joined_df['note_meta']), ['m1', 'm3', 'm2', 'm1', 'm3'])
+        merged_df: DataFrame = merge(corpus_df, meta_df, on='key', how='inner', suffixes=(None, '_meta'))
+        self.assertEqual(sorted(map(tuple, joined_df.values.tolist())), sorted(map(tuple, merged_df.values.tolist())))
+
+        unique_meta_df = meta_df.iloc[[1, 2]].rename(columns={'key': 'meta_key'})
+        joined_df = LinkIndex(unique_meta_df, 'meta_key').join(corpus_df, 'key')
+        merged_df = merge(corpus_df, unique_meta_df, left_on='key', right_on='meta_key', suffixes=(None, '_meta'))
+        self.assertTrue(joined_df.equals(merged_df))
+
+    def test_mismatched_key_types_raise(self):
+        corpus_df = DataFrame({'document': ['a', 'b'], 'key': ['1', '2']}, dtype='string')
+        link_index = LinkIndex(DataFrame({'key': [1, 2], 'note': ['m1', 'm2']}), 'key')
+        with self.assertRaises(FileLoadError):
+            link_index.get_report(corpus_df['key'])
+        with self.assertRaises(FileLoadError):
+            link_index.join(corpus_df, 'key')
+
+        corpus_df['key'] = corpus_df['key'].astype(float)
+        self.assertEqual(link_index.get_report(corpus_df['key']).num_matched_rows, 2)
+
+    @staticmethod
+    def _load_linked_files(temp_dir: str):
+        filepaths: list[str] = []
+        for i in range(4):
+            filepath: str = os.path.join(temp_dir, f'doc_{i}.txt')
+            with open(filepath, 'w') as f:
+                f.write(f'document {i}')
+            filepaths.append(filepath)
+        meta_path: str = os.path.join(temp_dir, 'meta.csv')
+        with open(meta_path, 'w') as f:
+            f.write('filename,year\ndoc_0,2000\ndoc_1,2001\ndoc_1,2011\ndoc_2,2002\n')
+
+        controller = CorpusLoader(temp_dir).controller
+        controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        controller.load_meta_from_filepaths([meta_path], include_hidden=False)
+        controller.set_text_header('document')
+        return controller
+
+    def test_link_report_before_build(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            controller = self._load_linked_files(temp_dir)
+            self.assertIsNone(controller.get_link_report())
+            controller.set_corpus_link_header('filename')
+            controller.set_meta_link_header('filename')
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file',
+                            side_effect=lambda file_loader, headers, header_strategy, tqdm_obj:
+                            file_loader.get_dataframe(headers, header_strategy, tqdm_obj)) as parse_file:
+                link_report = controller.get_link_report()
+                self.assertEqual(link_report.num_corpus_rows, 4)
+                self.assertEqual(link_report.num_matched_rows, 3)
+                self.assertEqual(link_report.get_match_rate(), 0.75)
+                self.assertEqual(link_report.num_meta_keys, 3)
+                self.assertEqual(link_report.num_duplicate_meta_keys, 1)
+                self.assertFalse(link_report.is_one_to_one())
+                self.assertEqual(link_report.num_linked_rows, 4)
+                self.assertEqual(parse_file.call_count, 5)
+
+                # The build reuses the link index rather than parsing the metadata again
+                self.assertTrue(controller.build_corpus('linked'))
+                self.assertEqual(parse_file.call_count, 9)
+            corpus_df: DataFrame = controller.get_latest_corpus().to_dataframe()
+            self.assertEqual(list(corpus_df['document_']), ['document 0', 'document 1', 'document 1', 'document 2'])
+            self.assertEqual(list(corpus_df['year']), ['2000', '2001', '2011', '2002'])
+
+    def test_mismatched_link_types_reported(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            controller = self._load_linked_files(temp_dir)
+            controller.set_corpus_link_header('filename')
+            controller.set_meta_link_header('year')
+            controller.update_meta_header(controller.meta_link_header, None, 'INTEGER')
+            with mock.patch.object(controller, 'display_error') as display_error:
+                self.assertIsNone(controller.get_link_report())
+                display_error.assert_called_once()
+                self.assertIn('Select the same datatype', display_error.call_args.args[0])
+
+    def test_link_report_requested_off_thread(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            controller = self._load_linked_files(temp_dir)
+            controller.set_corpus_link_header('filename')
+            controller.set_meta_link_header('filename')
+            reports: list = []
+            report_threads: list = []
+
+            def on_report(link_report):
+                reports.append(link_report)
+                report_threads.append(threading.current_thread())
+
+            superseded = mock.Mock()
+            controller.request_link_report(superseded)
+            controller.request_link_report(on_report).result(timeout=60)
+            superseded.assert_not_called()
+            self.assertEqual(len(reports), 1)
+            self.assertEqual(reports[0].num_matched_rows, 3)
+            self.assertIsNot(report_threads[0], threading.current_thread())
+
+            # Changing only the metadata link header indexes the parsed metadata again without parsing it again
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file') as parse_file:
+                controller.set_meta_link_header('year')
+                controller.request_link_report(on_report).result(timeout=60)
+                parse_file.assert_not_called()
+            self.assertEqual(reports[1].num_matched_rows, 0)
+
+    def test_link_report_uses_selections_at_request(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            controller = self._load_linked_files(temp_dir)
+            controller.set_corpus_link_header('filename')
+            controller.set_meta_link_header('filename')
+            reports: list = []
+
+            report_future = controller.request_link_report(reports.append)
+            # Selections changed by the caller after the request do not change the requested report
+            controller.set_meta_link_header('year')
+            controller.unload_filepaths([os.path.join(temp_dir, 'doc_3.txt')])
+            report_future.result(timeout=60)
+            self.assertEqual(len(reports), 1)
+            self.assertEqual(reports[0].num_corpus_rows, 4)
+            self.assertEqual(reports[0].num_matched_rows, 3)
+
+
+class TestAsyncBuild(unittest.TestCase):
+    def _load_documents(self, temp_dir: str, num_docs: int) -> CorpusLoader:
+        filepaths: list[str] = []
+        for i in range(num_docs):
+            filepath: str = os.path.join(temp_dir, f'doc_{i}.txt')
+            with open(filepath, 'w') as f:
+                f.write(f'document {i}')
+            filepaths.append(filepath)
+        corpus_loader = CorpusLoader(temp_dir)
+        corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        corpus_loader.controller.set_text_header('document')
+        return corpus_loader
+
+    def test_async_build_triggers_build_event(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, 3)
+            build_threads: list[str] = []
+            corpus_loader.register_event_callback('build', lambda corpus: build_threads.append(threading.current_thread().name))
+
+            self.assertTrue(corpus_loader.build_corpus_async('async').result())
+            self.assertFalse(corpus_loader.is_building())
+            self.assertEqual(len(build_threads), 1)
+            self.assertNotEqual(build_threads[0], threading.current_thread().name)
+            self.assertEqual(list(corpus_loader.get_corpus('async').docs()), ['document 0', 'document 1', 'document 2'])
+
+    def test_cancel_build_keeps_loaded_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, 5)
+            loaded_files = set(corpus_loader.controller.get_loaded_corpus_files())
+
+            def cancel_after_first_file(file_loader, headers, header_strategy, tqdm_obj):
+                corpus_loader.cancel_build()
+                return file_loader.get_row_values(['document'])
+
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file',
+                            side_effect=cancel_after_first_file) as parse_file:
+                self.assertFalse(corpus_loader.build_corpus_async('cancelled').result())
+                self.assertEqual(parse_file.call_count, 1)
+            self.assertFalse(corpus_loader.cancel_build())
+            self.assertIsNone(corpus_loader.get_corpus('cancelled'))
+            self.assertEqual(corpus_loader.controller.get_loaded_corpus_files(), loaded_files)
+
+            self.assertTrue(corpus_loader.build_corpus_async('rebuilt').result())
+            self.assertEqual(len(corpus_loader.get_corpus('rebuilt')), 5)
+
+    def test_build_refused_while_building(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, 3)
+            controller = corpus_loader.controller
+            sync_build_results: list[bool] = []
+
+            def build_during_parse(file_loader, headers, header_strategy, tqdm_obj):
+                if len(sync_build_results) == 0:
+                    sync_build_results.append(controller.build_corpus('concurrent'))
+                return file_loader.get_row_values(['document'])
+
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file',
+                            side_effect=build_during_parse), \
+                    mock.patch.object(controller, 'display_error') as display_error:
+                self.assertTrue(corpus_loader.build_corpus_async('async').result())
+            self.assertEqual(sync_build_results, [False])
+            display_error.assert_called_once()
+            self.assertIsNone(corpus_loader.get_corpus('concurrent'))
+
+    def test_files_kept_while_building(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, 3)
+            controller = corpus_loader.controller
+            file_loader: FileLoaderWidget = corpus_loader.view.file_loader
+            file_loader.update_displays()
+            loaded_files = set(controller.get_loaded_corpus_files())
+            parse_started = threading.Event()
+            finish_parse = threading.Event()
+
+            def wait_during_parse(file_loader, headers, header_strategy, tqdm_obj):
+                parse_started.set()
+                finish_parse.wait(timeout=60)
+                return file_loader.get_row_values(['document'])
+
+            with mock.patch('atap_corpus_loader.controller.loader_service.LoaderService._parse_file',
+                            side_effect=wait_during_parse), \
+                    mock.patch.object(controller, 'display_error') as display_error:
+                build_future = file_loader.build_corpus()
+                self.assertTrue(parse_started.wait(timeout=60))
+                with self.assertRaises(FileLoadError):
+                    controller.unload_all()
+                with self.assertRaises(FileLoadError):
+                    controller.unload_filepaths([ref.get_path() for ref in loaded_files])
+                self.assertFalse(controller.load_meta_from_filepaths([os.path.join(temp_dir, 'doc_0.txt')], False))
+                file_loader.unload_all()
+                self.assertEqual(display_error.call_count, 2)
+                self.assertEqual(controller.get_loaded_corpus_files(), loaded_files)
+
+                # Operations finishing during the build leave the controls disabled
+                file_loader.load_as_corpus()
+                self.assertTrue(file_loader.build_button.disabled)
+                self.assertTrue(file_loader.unload_all_button.disabled)
+                self.assertTrue(file_loader.meta_editor.text_header_dropdown.disabled)
+                finish_parse.set()
+                self.assertTrue(build_future.result(timeout=60))
+            # The controls are enabled by a callback of the build that may still be running once the result is set
+            deadline: float = time.monotonic() + 60
+            while file_loader.build_button.disabled and (time.monotonic() < deadline):
+                time.sleep(0.05)
+            self.assertFalse(file_loader.build_button.disabled)
+            self.assertFalse(file_loader.meta_editor.is_disabled)
+
+    def test_async_build_runs_in_calling_session(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, 3)
+            build_docs: list = []
+            corpus_loader.register_event_callback('build', lambda corpus: build_docs.append(panel_state.curdoc))
+
+            session_doc = Document()
+            panel_state.curdoc = session_doc
+            try:
+                self.assertTrue(corpus_loader.build_corpus_async('async').result())
+            finally:
+                panel_state.curdoc = None
+            self.assertEqual(len(build_docs), 1)
+            self.assertIs(build_docs[0], session_doc)
+
+
+class TestBuildMetrics(unittest.TestCase):
+    def _build_documents(self, temp_dir: str, parse_executor: str) -> CorpusLoader:
+        filepaths: list[str] = []
+        for i in range(4):
+            filepath: str = os.path.join(temp_dir, f'doc_{i}.txt')
+            with open(filepath, 'w') as f:
+                f.write(f'document {i}')
+            filepaths.append(filepath)
+        corpus_loader = CorpusLoader(temp_dir, parse_executor=parse_executor)
+        corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        corpus_loader.controller.set_text_header('document')
+        self.assertTrue(corpus_loader.controller.build_corpus('metrics'))
+        return corpus_loader
+
+    def test_metrics_recorded_for_each_executor(self):
+        for parse_executor in ['serial', 'thread']:
+            with self.subTest(parse_executor=parse_executor), tempfile.TemporaryDirectory() as temp_dir:
+                corpus_loader: CorpusLoader = self._build_documents(temp_dir, parse_executor)
+                build_metrics: dict = corpus_loader.get_build_metrics()
+
+                for stage in ['parse_files', 'rename', 'create_corpus']:
+                    self.assertIn(stage, build_metrics['stages'])
+                self.assertEqual(build_metrics['files_read'], 4)
+                self.assertEqual(build_metrics['bytes_read'], 4 * len('document 0'))
+                self.assertEqual(build_metrics['rows_produced'], 4)
+                self.assertIsNotNone(build_metrics['files_per_second'])
+                self.assertGreaterEqual(build_metrics['total_seconds'], build_metrics['stages']['create_corpus']['seconds'])
+
+    def test_dtypes_stage_recorded_for_tabular_files(self):
+        corpus_loader = CorpusLoader(TestFileTypes.TEST_DIR)
+        self.assertIsNone(corpus_loader.get_build_metrics())
+        csv_filepath: str = os.path.join(TestFileTypes.TEST_DIR, 'csv_corpus', 'philosophers.csv')
+        corpus_loader.controller.load_corpus_from_filepaths([csv_filepath], include_hidden=False)
+        corpus_loader.controller.set_text_header('summary')
+        self.assertTrue(corpus_loader.controller.build_corpus('metrics'))
+
+        self.assertIn('dtypes', corpus_loader.get_build_metrics()['stages'])
+
+
+class TestMemoryBudget(unittest.TestCase):
+    def _load_documents(self, temp_dir: str, **loader_kwargs) -> CorpusLoader:
+        filepaths: list[str] = []
+        for i in range(3):
+            filepath: str = os.path.join(temp_dir, f'doc_{i}.txt')
+            with open(filepath, 'w') as f:
+                f.write(f'document {i} ' * 100)
+            filepaths.append(filepath)
+        corpus_loader = CorpusLoader(temp_dir, **loader_kwargs)
+        corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        corpus_loader.controller.set_text_header('document')
+        return corpus_loader
+
+    def test_memory_usage_tracked_per_corpus(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir)
+            self.assertTrue(corpus_loader.controller.build_corpus('first'))
+            memory_bytes: int = corpus_loader.get_memory_usage()['first']
+            self.assertGreater(memory_bytes, 3 * len('document 0 ' * 100))
+            self.assertEqual(corpus_loader.controller.get_corpora_info()[0].memory_bytes, memory_bytes)
+
+            corpus_loader.get_corpus('first').rename('renamed')
+            self.assertEqual(corpus_loader.get_memory_usage(), {'renamed': memory_bytes})
+
+    def test_build_over_budget_refused(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, memory_budget=1)
+
+            self.assertFalse(corpus_loader.controller.build_corpus('refused'))
+            self.assertIsNone(corpus_loader.get_corpus('refused'))
+
+    def test_build_over_budget_spilled(self):
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as spill_dir:
+            for memory_budget, expect_spilled in [(10 ** 9, False), (1, True)]:
+                corpus_loader: CorpusLoader = self._load_documents(temp_dir, memory_budget=memory_budget,
+                                                                   spill_dir=spill_dir)
+                with mock.patch.object(LoaderService, '_build_dataframe_out_of_core', autospec=True,
+                                       side_effect=LoaderService._build_dataframe_out_of_core) as build_out_of_core:
+                    self.assertTrue(corpus_loader.controller.build_corpus('budgeted'))
+                self.assertEqual(build_out_of_core.called, expect_spilled)
+                self.assertEqual(len(corpus_loader.get_corpus('budgeted')), 3)
+
+    def test_reused_parsed_files_counted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir)
+            self.assertTrue(corpus_loader.controller.build_corpus('uncached'))
+            self.assertNotIn('_parsed_file_cache', corpus_loader.get_memory_usage())
+
+            corpus_loader = self._load_documents(temp_dir, reuse_parsed_files=True)
+            loader_service = corpus_loader.controller.loader_service
+            uncached_estimate: int = loader_service.estimate_build_memory()
+            self.assertTrue(corpus_loader.controller.build_corpus('cached'))
+            self.assertGreater(corpus_loader.get_memory_usage()['_parsed_file_cache'], 3 * len('document 0 ' * 100))
+            # Once cached, the kept contents are counted by the cache rather than the estimate
+            self.assertLess(loader_service.estimate_build_memory(), uncached_estimate)
+
+    def test_parsed_file_cache_drops_least_recently_used(self):
+        values: dict[str, tuple[str, ...]] = {key: (key * 1000,) for key in ('a', 'b', 'c')}
+        entry_size: int = ParsedFileCache._get_entry_memory_usage(values['a'])
+        parsed_file_cache = ParsedFileCache(max_bytes=2 * entry_size)
+        parsed_file_cache.start_build()
+        for key, value in values.items():
+            parsed_file_cache.add(key, value)
+        parsed_file_cache.finish_build(True)
+        self.assertEqual(list(parsed_file_cache.entries), ['b', 'c'])
+
+        # Entries used by a failed build are kept as the most recently used
+        parsed_file_cache.start_build()
+        self.assertIsNotNone(parsed_file_cache.get('b'))
+        parsed_file_cache.add('a', values['a'])
+        parsed_file_cache.finish_build(False)
+        self.assertEqual(list(parsed_file_cache.entries), ['b', 'a'])
+        self.assertEqual(parsed_file_cache.get_memory_usage(), 2 * entry_size)
+
+        parsed_file_cache.trim(entry_size)
+        self.assertEqual(list(parsed_file_cache.entries), ['a'])
+
+    def test_reused_parsed_files_within_budget(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_loader: CorpusLoader = self._load_documents(temp_dir, reuse_parsed_files=True, memory_budget=10 ** 9)
+            self.assertTrue(corpus_loader.controller.build_corpus('first'))
+            memory_usage: dict[str, int] = corpus_loader.get_memory_usage()
+            first_cache_usage: int = memory_usage['_parsed_file_cache']
+            self.assertGreater(first_cache_usage, 0)
+
+            # A build whose corpus uses more memory than estimated leaves less of the budget for the kept files
+            budget: int = sum(memory_usage.values()) + memory_usage['first'] // 2
+            corpus_loader.controller.memory_budget = budget
+            loader_service = corpus_loader.controller.loader_service
+            with mock.patch.object(loader_service, 'estimate_build_memory', return_value=0):
+                self.assertTrue(corpus_loader.controller.build_corpus('second'))
+            memory_usage = corpus_loader.get_memory_usage()
+            cache_usage: int = memory_usage.pop('_parsed_file_cache')
+            self.assertLessEqual(cache_usage, budget - sum(memory_usage.values()))
+            self.assertLess(cache_usage, first_cache_usage)
+
+
+class TestDeduplication(unittest.TestCase):
+    def _write_files(self, temp_dir: str, contents: list[str], extension: str = 'txt') -> list[str]:
+        filepaths: list[str] = []
+        for i, content in enumerate(contents):
+            filepath: str = os.path.join(temp_dir, f'doc_{i}.{extension}')
+            with open(filepath, 'w') as f:
+                f.write(content)
+            filepaths.append(filepath)
+        return filepaths
+
+    def _build(self, temp_dir: str, filepaths: list[str], **loader_kwargs) -> CorpusLoader:
+        corpus_loader = CorpusLoader(temp_dir, **loader_kwargs)
+        corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        corpus_loader.controller.set_text_header('document')
+        self.assertTrue(corpus_loader.controller.build_corpus('deduplicated'))
+        return corpus_loader
+
+    def test_duplicate_files_dropped_before_parsing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = self._write_files(temp_dir, ['first', 'second', 'first', 'other', 'first'])
+            corpus_loader: CorpusLoader = self._build(temp_dir, filepaths, deduplication='drop')
+
+            corpus_df: DataFrame = corpus_loader.get_corpus('deduplicated').to_dataframe()
+            self.assertEqual(sorted(corpus_df['document_']), ['first', 'other', 'second'])
+            self.assertEqual(corpus_loader.get_deduplication_report(),
+                             {'mode': 'drop', 'duplicate_files': 2, 'duplicate_rows': 0})
+            self.assertEqual(corpus_loader.get_build_metrics()['files_read'], 3)
+
+    def test_duplicate_rows_dropped(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = self._write_files(temp_dir, ['document,year\na,1\nb,2\na,3\n',
+                                                                'document,year\nb,4\nc,5\n'], 'csv')
+            corpus_loader: CorpusLoader = self._build(temp_dir, filepaths, deduplication='drop')
+
+            corpus_df: DataFrame = corpus_loader.get_corpus('deduplicated').to_dataframe()
+            self.assertEqual(list(corpus_df['document_']), ['a', 'b', 'c'])
+            self.assertEqual(list(corpus_df['year'].astype(str)), ['1', '2', '5'])
+            self.assertEqual(corpus_loader.get_deduplication_report()['duplicate_rows'], 2)
+
+    def test_duplicates_flagged(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = self._write_files(temp_dir, ['first', 'second', 'first'])
+            corpus_loader: CorpusLoader = self._build(temp_dir, filepaths, deduplication='flag')
+
+            corpus_df: DataFrame = corpus_loader.get_corpus('deduplicated').to_dataframe()
+            self.assertEqual(list(corpus_df['document_']), ['first', 'second', 'first'])
+            self.assertEqual(list(corpus_df['duplicate']), [False, False, True])
+            self.assertEqual(corpus_loader.get_deduplication_report(),
+                             {'mode': 'flag', 'duplicate_files': 0, 'duplicate_rows': 1})
+
+    def test_duplicates_dropped_across_spilled_chunks(self):
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as spill_dir:
+            filepaths: list[str] = self._write_files(temp_dir, ['document\na\nb\n', 'document\nb\nc\na\n'], 'csv')
+            corpus_loader = CorpusLoader(temp_dir, spill_dir=spill_dir, deduplication='drop')
+            corpus_loader.controller.loader_service.SPILL_CHUNK_ROWS = 2
+            corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+            corpus_loader.controller.set_text_header('document')
+            self.assertTrue(corpus_loader.controller.build_corpus('spilled'))
+
+            corpus_df: DataFrame = corpus_loader.get_corpus('spilled').to_dataframe()
+            self.assertEqual(list(corpus_df['document_']), ['a', 'b', 'c'])
+            self.assertEqual(corpus_loader.get_deduplication_report()['duplicate_rows'], 2)
+
+    def test_no_report_without_deduplication(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            filepaths: list[str] = self._write_files(temp_dir, ['first', 'first'])
+            corpus_loader: CorpusLoader = self._build(temp_dir, filepaths)
+
+            self.assertEqual(len(corpus_loader.get_corpus('deduplicated')), 2)
+            self.assertIsNone(corpus_loader.get_deduplication_report())
+
+    def test_invalid_deduplication_mode(self):
+        with self.assertRaises(ValueError):
+            CorpusLoader('tests/test_data', deduplication='remove')
+
+
+class TestBuildPreview(DocumentFilesFixture, unittest.TestCase):
+    def test_document_files_sampled(self):
+        filepaths: list[str] = self._write_documents(20)
+        corpus_loader = CorpusLoader(self.temp_dir)
+        corpus_loader.controller.load_corpus_from_filepaths(filepaths, include_hidden=False)
+        corpus_loader.controller.set_text_header('document')
+
+        first_preview: DataFrameCorpus = corpus_loader.build_preview(sample_files=5)
+        second_preview: DataFrameCorpus = corpus_loader.build_preview(sample_files=5)
+        first_documents: list[str] = list(first_preview.to_dataframe()['document_'])
+        self.assertEqual(len(first_documents), 5)
+        self.assertEqual(first_documents, list(second_preview.to_dataframe()['document_']))
+        self.assertEqual(corpus_loader.get_corpora(), {})
+
+    def test_tabular_rows_sampled_and_linked(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_path: str = os.path.join(temp_dir, 'corpus.csv')
+            with open(corpus_path, 'w') as f:
+                f.write('document,id\n' + ''.join(f'document {i},{i}\n' for i in range(50)))
+            meta_path: str = os.path.join(temp_dir, 'meta.csv')
+            with open(meta_path, 'w') as f:
+                f.write('id,teacher\n' + ''.join(f'{i},teacher {i}\n' for i in range(50)))
+            controller = CorpusLoader(temp_dir).controller
+            controller.load_corpus_from_filepaths([corpus_path], include_hidden=False)
+            controller.load_meta_from_filepaths([meta_path], include_hidden=False)
+            controller.set_text_header('document')
+            controller.set_corpus_link_header('id')
+            controller.set_meta_link_header('id')
+
+            preview_df: DataFrame = controller.build_preview(sample_rows=5, sample_files=5).to_dataframe()
+            self.assertEqual(list(preview_df['document_']), [f'document {i}' for i in range(5)])
+            self.assertEqual(list(preview_df['teacher']), [f'teacher {i}' for i in range(5)])
+
+            self.assertTrue(controller.build_corpus('full'))
+            self.assertEqual(len(controller.get_corpus('full')), 50)
+
+    def test_invalid_datatype_reported(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            corpus_path: str = os.path.join(temp_dir, 'corpus.csv')
+            with open(corpus_path, 'w') as f:
+                f.write('document,year\n' + ''.join(f'document {i},year {i}\n' for i in range(20)))
+            controller = CorpusLoader(temp_dir).controller
+            controller.load_corpus_from_filepaths([corpus_path], include_hidden=False)
+            controller.set_text_header('document')
+            for header in controller.get_corpus_headers():
+                if header.name == 'year':
+                    header.datatype = DataType.INTEGER
+
+            with mock.patch.object(controller, 'display_error') as display_error:
+                self.assertIsNone(controller.build_preview(sample_rows=5, sample_files=5))
+            display_error.assert_called_once()
+
+
+class TestHeaderRenaming(unittest.TestCase):
+    def test_wide_frame_renamed_without_copying(self):
+        columns: list[str] = ['document'] + [f'meta {i}' for i in range(300)] + ['meta_0', '1st', 'class']
+        wide_df = DataFrame(np.arange(4 * len(columns)).reshape(4, len(columns)), columns=columns)
+
+        renamed_df, col_doc = LoaderService._rename_headers(wide_df, 'document')
+        self.assertEqual(col_doc, 'document')
+        self.assertEqual(list(renamed_df.columns[:3]), ['document', 'meta_0_1', 'meta_1'])
+        self.assertEqual(list(renamed_df.columns[-3:]), ['meta_0', 'M_1st', 'M_class'])
+        self.assertEqual(list(wide_df.columns), columns)
+        for column, renamed_column in zip(columns, renamed_df.columns):
+            self.assertTrue(np.shares_memory(wide_df[column].to_numpy(), renamed_df[renamed_column].to_numpy()))
+
+        valid_df, _ = LoaderService._rename_headers(renamed_df, 'document')
+        self.assertIs(valid_df, renamed_df)
+
+
+class TestFileReferenceFactory(unittest.TestCase):
+    TEST_DIR: str = TestFileTypes.TEST_DIR
+
+    def test_lru_eviction_skips_pinned(self):
+        pinned_paths: set[str] = set()
+        factory = FileReferenceFactory(max_cache_size=2, is_pinned=lambda ref: ref.get_path() in pinned_paths)
+        paths: list[str] = [os.path.join(self.TEST_DIR, 'txt_corpus', f'{name}.txt')
+                            for name in ('aristotle', 'heraclitus', 'plato', 'socrates')]
+        pinned_paths.add(paths[0])
+
+        pinned_ref = factory.get_file_ref(paths[0])
+        factory.get_file_ref(paths[1])
+        factory.get_file_ref(paths[1])
+        factory.get_file_ref(paths[2])
+        factory.get_file_ref(paths[3])
+
+        self.assertIn(paths[0], factory.file_ref_cache)
+        self.assertIs(pinned_ref, factory.get_file_ref(paths[0]))
+        stats = factory.get_cache_stats()
+        self.assertEqual(stats['size'], 2)
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_evicted_zip_ref_recreated(self):
+        zip_path: str = os.path.join(self.TEST_DIR, 'txt_corpus.zip')
+        factory = FileReferenceFactory(max_cache_size=0)
+        zip_ref = factory.get_zip_file_refs(zip_path)[0]
+        self.assertNotIn(zip_ref.get_path(), factory.file_ref_cache)
+
+        recreated_ref = factory.get_file_ref(zip_ref.get_path())
+        self.assertTrue(recreated_ref.is_zipped())
+        self.assertEqual(zip_ref, recreated_ref)
+        self.assertEqual(zip_ref.get_content_buffer().read(), recreated_ref.get_content_buffer().read())
+
+    def test_zip_index_reused_until_archive_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path: str = os.path.join(temp_dir, 'corpus.zip')
+            shutil.copy(os.path.join(self.TEST_DIR, 'txt_corpus.zip'), zip_path)
+            factory = FileReferenceFactory()
+
+            archive_index = factory.get_zip_archive_index(zip_path)
+            zip_handle = archive_index.zip_file
+            num_members: int = len(factory.get_zip_file_refs(zip_path))
+            self.assertIs(zip_handle, factory.get_zip_archive_index(zip_path).zip_file)
+
+            with zipfile.ZipFile(zip_path, 'a') as zip_file:
+                zip_file.writestr('added.txt', 'An added document')
+            os.utime(zip_path, ns=(0, 0))
+
+            self.assertIsNot(zip_handle, factory.get_zip_archive_index(zip_path).zip_file)
+            self.assertIsNone(zip_handle.fp)
+            self.assertEqual(len(factory.get_zip_file_refs(zip_path)), num_members + 1)
+            factory.clear_cache()
+
+    def test_concurrent_zip_member_reads(self):
+        zip_path: str = os.path.join(self.TEST_DIR, 'txt_corpus.zip')
+        factory = FileReferenceFactory()
+        zip_refs = factory.get_zip_file_refs(zip_path)
+        expected: dict[str, bytes] = {ref.get_path(): ref.get_content_buffer().read() for ref in zip_refs}
+
+        num_workers: int = 4
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            results = list(executor.map(lambda ref: (ref.get_path(), ref.get_content_buffer().read()), zip_refs * 50))
+
+        for path, content in results:
+            self.assertEqual(expected[path], content)
+        self.assertLessEqual(factory.get_zip_archive_index(zip_path).get_pool_size(), num_workers + 1)
+        factory.clear_cache()
+
+    def test_zip_handles_returned_when_threads_end(self):
+        zip_path: str = os.path.join(self.TEST_DIR, 'txt_corpus.zip')
+        factory = FileReferenceFactory()
+        zip_refs = factory.get_zip_file_refs(zip_path)
+        archive_index = factory.get_zip_archive_index(zip_path)
+        for _ in range(20):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                list(executor.map(lambda ref: ref.get_content_buffer().read(), zip_refs * 5))
+        self.assertLessEqual(archive_index.get_pool_size(), 3)
+        self.assertEqual(len(archive_index.free_handles), archive_index.get_pool_size())
+
+        with mock.patch.object(ZipArchiveIndex, 'MAX_FREE_HANDLES', 1):
+            barrier = threading.Barrier(4)
+
+            def read_together(ref):
+                content: bytes = ref.get_content_buffer().read()
+                barrier.wait()
+                return content
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(read_together, zip_refs[:4]))
+            # The handle holding the central directory may be kept in addition to the free handles
+            self.assertLessEqual(archive_index.get_pool_size(), 2)
+        factory.clear_cache()
+
+    def test_member_checksum_follows_rewritten_archive(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            zip_path: str = os.path.join(temp_dir, 'corpus.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zip_file:
+                zip_file.writestr('doc.txt', 'first version')
+            factory = FileReferenceFactory()
+            archive_index = factory.get_zip_archive_index(zip_path)
+            self.assertEqual(archive_index.get_member_checksum('doc.txt'), (13, zipfile.crc32(b'first version')))
+            self.assertEqual(archive_index.open_member('doc.txt').read(), b'first version')
+
+            with zipfile.ZipFile(zip_path, 'w') as zip_file:
+                zip_file.writestr('doc.txt', 'the second version')
+            os.utime(zip_path, ns=(0, 0))
+
+            get_thread_handle = archive_index._get_thread_handle
+            handle_locked: list[bool] = []
+
+            def get_tracked_handle():
+                handle_locked.append(archive_index.lock._is_owned())
+                return get_thread_handle()
+
+            with mock.patch.object(archive_index, '_get_thread_handle', side_effect=get_tracked_handle):
+                self.assertEqual(archive_index.get_member_checksum('doc.txt'),
+                                 (18, zipfile.crc32(b'the second version')))
+            self.assertEqual(handle_locked, [True])
+            self.assertEqual(archive_index.open_member('doc.txt').read(), b'the second version')
+            factory.clear_cache()
+
+    def test_pickled_disk_reference_drops_memory_map(self):
+        file_ref = DiskFileReference(os.path.join(self.TEST_DIR, 'all_data_types.csv'), use_mmap=True)
+        expected: bytes = file_ref.get_content_buffer().read()
+        self.assertIsNotNone(file_ref.content_map)
+
+        unpickled_ref: DiskFileReference = pickle.loads(pickle.dumps(file_ref))
+        self.assertEqual(unpickled_ref, file_ref)
+        self.assertTrue(unpickled_ref.use_mmap)
+        self.assertIsNone(unpickled_ref.content_map)
+        self.assertIsNone(unpickled_ref.content_map_stat)
+        self.assertEqual(unpickled_ref.get_content_buffer().read(), expected)
+        file_ref.release()
+        unpickled_ref.release()
+
+    @staticmethod
+    def _read_stream(file_ref) -> bytes:
+        # Reads in small chunks so that streams are not consumed by a single read
+        chunks: list[bytes] = []
+        with file_ref.open_stream() as stream:
+            for chunk in iter(lambda: stream.read(1000), b''):
+                chunks.append(chunk)
+        return b''.join(chunks)
+
+    def test_open_stream_matches_content_buffer(self):
+        disk_path: str = os.path.join(self.TEST_DIR, 'all_data_types.csv')
+        zip_path: str = os.path.join(self.TEST_DIR, 'csv_corpus.zip')
+        factory = FileReferenceFactory()
+        remote_ref = RemoteFileReference('remote/all_data_types.csv')
+        with open(disk_path, 'rb') as f:
+            remote_ref.set_content_buffer(BytesIO(f.read()))
+        file_refs: dict = {
+            'disk': DiskFileReference(disk_path),
+            'mmap': DiskFileReference(disk_path, use_mmap=True),
+            'zip': next(ref for ref in factory.get_zip_file_refs(zip_path) if ref.get_extension() == 'csv'),
+            'remote': remote_ref,
+            'remote_unretrieved': RemoteFileReference('remote/missing.csv')
+        }
+
+        for ref_type, file_ref in file_refs.items():
+            with self.subTest(ref_type):
+                expected: bytes = file_ref.get_content_buffer().read()
+                if ref_type != 'remote_unretrieved':
+                    self.assertGreater(len(expected), 0)
+                self.assertEqual(self._read_stream(file_ref), expected)
+                # Streams can be opened again after the previous stream is closed
+                self.assertEqual(self._read_stream(file_ref), expected)
+        file_refs['mmap'].release()
+        factory.clear_cache()
+
+    def test_zipped_csv_decompressed_once(self):
+        zip_path: str = os.path.join(self.TEST_DIR, 'csv_corpus.zip')
+        factory = FileReferenceFactory()
+        zip_ref = next(ref for ref in factory.get_zip_file_refs(zip_path) if ref.get_extension() == 'csv')
+        file_loader = FileLoaderFactory.get_file_loader(zip_ref)
+        headers: list[CorpusHeader] = file_loader.get_inferred_headers(HeaderStrategy.HEADERS)
+
+        open_member = zip_ref.archive_index.open_member
+        seek_calls: list[tuple] = []
+
+        def open_tracked_member(internal_path: str):
+            stream = open_member(internal_path)
+            original_seek = stream.seek
+            stream.seek = lambda *args: seek_calls.append(args) or original_seek(*args)
+            return stream
+
+        with mock.patch.object(zip_ref.archive_index, 'open_member', side_effect=open_tracked_member) as opened:
+            df: DataFrame = file_loader.get_dataframe(headers, HeaderStrategy.HEADERS, _no_progress)
+        self.assertEqual(opened.call_count, 1)
+        self.assertNotIn((0,), seek_calls)
+        self.assertEqual(len(df), len(read_csv(zip_ref.get_content_buffer())))
+        factory.clear_cache()
+
+
+class TestDirectoryIndex(unittest.TestCase):
+    def test_only_changed_directories_rescanned(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for dir_name in ('a', 'b', '.hidden'):
+                os.mkdir(os.path.join(temp_dir, dir_name))
+                with open(os.path.join(temp_dir, dir_name, 'doc.txt'), 'w') as f:
+                    f.write(dir_name)
+            index = DirectoryIndex(temp_dir)
+
+            self.assertTrue(index.refresh())
+            self.assertEqual(index.get_file_paths(), [os.path.join(temp_dir, 'a', 'doc.txt'),
+                                                      os.path.join(temp_dir, 'b', 'doc.txt')])
+            self.assertFalse(index.refresh())
+
+            unchanged_entry = index.dir_entries[os.path.join(temp_dir, 'a')]
+            new_path: str = os.path.join(temp_dir, 'b', 'added.txt')
+            with open(new_path, 'w') as f:
+                f.write('added')
+            os.utime(os.path.join(temp_dir, 'b'), ns=(0, 0))
+
+            self.assertTrue(index.refresh())
+            self.assertIn(new_path, index.get_file_paths())
+            self.assertEqual(index.get_file_paths(), sorted(index.get_file_paths()))
+            self.assertIs(unchanged_entry, index.dir_entries[os.path.join(temp_dir, 'a')])
+
+    def test_watched_index_rescans_changed_directories(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            os.mkdir(os.path.join(temp_dir, 'a'))
+            index = DirectoryIndex(temp_dir)
+            index.set_watched(True)
+            self.assertTrue(index.refresh())
+            self.assertEqual(index.get_file_paths(), [])
+
+            new_path: str = os.path.join(temp_dir, 'a', 'added.txt')
+            with open(new_path, 'w') as f:
+                f.write('added')
+            # Watched directories are not checked until a change is applied
+            self.assertFalse(index.refresh())
+
+            index.apply_changes([FileChange(new_path, FileChangeType.ADDED)])
+            self.assertTrue(index.refresh())
+            self.assertEqual(index.get_file_paths(), [new_path])
+
+
+class TestFileListing(unittest.TestCase):
+    def test_pages_match_full_listing(self):
+        loader_service = FileLoaderService('tests/test_data')
+        for expand_archived in (False, True):
+            all_refs = loader_service.get_all_files(expand_archived)
+            self.assertEqual(list(loader_service.iter_files(expand_archived)), all_refs)
+            self.assertEqual(loader_service.directory_index.get_file_paths(),
+                             list(loader_service.directory_index.iter_file_paths()))
+
+            pages = [loader_service.get_files_page(expand_archived, offset, 7) for offset in range(0, len(all_refs), 7)]
+            self.assertEqual([ref for page in pages for ref in page], all_refs)
+            self.assertEqual(loader_service.get_files_page(expand_archived, len(all_refs), 7), [])
+
+    def test_filters_pushed_down(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for filename in ('a.txt', 'b.csv', 'c.TXT', 'a-z.txt'):
+                with open(os.path.join(temp_dir, filename), 'w') as f:
+                    f.write(filename)
+            zip_path: str = os.path.join(temp_dir, 'a.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zip_f:
+                zip_f.writestr('doc.txt', 'zipped')
+                zip_f.writestr('.hidden.txt', 'hidden')
+            loader_service = FileLoaderService(temp_dir)
+
+            file_filter = FileFilter(file_types=['txt'], include_hidden=False)
+            file_names = [ref.get_path()[len(temp_dir) + 1:] for ref in loader_service.iter_files(True, file_filter)]
+            # Zipped files are merged into the listing in sorted order
+            self.assertEqual(file_names, ['a-z.txt', 'a.txt', os.path.join('a.zip', 'doc.txt'), 'c.TXT'])
+
+            file_filter = FileFilter(include_hidden=True, glob_pattern='*a*')
+            file_names = [ref.get_path()[len(temp_dir) + 1:] for ref in loader_service.get_files_page(False, 1, 2, file_filter)]
+            self.assertEqual(file_names, ['a.txt', 'a.zip'])
+
+    def test_select_all_beyond_displayed_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(5):
+                with open(os.path.join(temp_dir, f'doc_{i}.txt'), 'w') as f:
+                    f.write(f'document {i}')
+            with open(os.path.join(temp_dir, 'other.txt'), 'w') as f:
+                f.write('other')
+            corpus_loader = CorpusLoader(temp_dir)
+            file_selector: FileSelectorWidget = corpus_loader.view.file_loader.file_selector
+            file_selector.MAX_DISPLAYED_FILES = 2
+            file_selector.filter_input.value = 'doc'
+            self.assertTrue(file_selector.truncated_msg.visible)
+            self.assertEqual(len(file_selector.selector_widget.options), 2)
+
+            file_selector.select_all()
+            expected_paths: list[str] = [os.path.join(temp_dir, f'doc_{i}.txt') for i in range(5)]
+            self.assertEqual(file_selector.get_selector_value(), expected_paths)
+            self.assertIn('All 5 files', file_selector.truncated_msg.object)
+            corpus_loader.view.file_loader.load_as_corpus()
+            self.assertEqual(sorted(ref.get_path() for ref in corpus_loader.controller.get_loaded_corpus_files()),
+                             expected_paths)
+
+            # Changing the selection selects only the files chosen
+            file_selector.selector_widget.value = [expected_paths[1]]
+            self.assertEqual(file_selector.get_selector_value(), [expected_paths[1]])
+            file_selector.select_all()
+            file_selector.filter_input.value = 'doc_1'
+            self.assertFalse(file_selector.truncated_msg.visible)
+            self.assertEqual(file_selector.get_selector_value(), file_selector.selector_widget.value)
+
+
+class TestPersistentFileIndex(unittest.TestCase):
+    def test_new_session_seeded_from_index(self):
+        with tempfile.TemporaryDirectory() as temp_dir, tempfile.TemporaryDirectory() as cache_dir:
+            os.mkdir(os.path.join(temp_dir, 'sub'))
+            with open(os.path.join(temp_dir, 'sub', 'doc.txt'), 'w') as f:
+                f.write('document')
+            zip_path: str = os.path.join(temp_dir, 'docs.zip')
+            with zipfile.ZipFile(zip_path, 'w') as zip_f:
+                zip_f.writestr('zipped.txt', 'zipped document')
+
+            first_service = FileLoaderService(temp_dir, index_cache_dir=cache_dir)
+            expected_paths: list[str] = [ref.get_path() for ref in first_service.get_all_files(True)]
+            first_service.persistent_index.close()
+
+            second_service = FileLoaderService(temp_dir, index_cache_dir=cache_dir)
+            self.assertEqual(len(second_service.directory_index.dir_entries), 2)
+            self.assertFalse(second_service.directory_index.refresh())
+            all_refs = second_service.get_all_files(True)
+            self.assertEqual([ref.get_path() for ref in all_refs], expected_paths)
+            # The zip member listing was seeded, so the archive is only opened once a member is read
+            archive_index = second_service.file_ref_factory.get_zip_archive_index(zip_path)
+            self.assertIsNone(archive_index.zip_file)
+            zipped_ref = [ref for ref in all_refs if ref.is_zipped()][0]
+            self.assertEqual(zipped_ref.get_content_buffer().read(), b'zipped document')
+
+            new_path: str = os.path.join(temp_dir, 'sub', 'added.txt')
+            with open(new_path, 'w') as f:
+                f.write('added')
+            os.utime(os.path.join(temp_dir, 'sub'), ns=(0, 0))
+            self.assertIn(new_path, [ref.get_path() for ref in second_service.get_all_files(False)])
+            second_service.persistent_index.close()
+
+            third_service = FileLoaderService(temp_dir, index_cache_dir=cache_dir)
+            self.assertIn(new_path, third_service.directory_index.dir_entries[os.path.join(temp_dir, 'sub')].file_paths)
+            third_service.persistent_index.close()
+
+
+class TestFileWatcher(unittest.TestCase):
+    @staticmethod
+    def _wait_for_changes(watcher: FileWatcher, expected: set[FileChange], timeout: float = 10.0) -> set[FileChange]:
+        changes: set[FileChange] = set()
+        end_time: float = time.monotonic() + timeout
+        while (not expected.issubset(changes)) and (time.monotonic() < end_time):
+            changes.update(watcher.get_changes())
+            time.sleep(0.02)
+        return changes
+
+    def _check_watcher_changes(self, watcher: FileWatcher, temp_dir: str):
+        watcher.start()
+        try:
+            file_path: str = os.path.join(temp_dir, 'doc.txt')
+            with open(file_path, 'w') as f:
+                f.write('document')
+            added = FileChange(file_path, FileChangeType.ADDED)
+            self.assertIn(added, self._wait_for_changes(watcher, {added}))
+
+            with open(os.path.join(temp_dir, '.hidden.txt'), 'w') as f:
+                f.write('hidden')
+            os.remove(file_path)
+            removed = FileChange(file_path, FileChangeType.REMOVED)
+            changes: set[FileChange] = self._wait_for_changes(watcher, {removed})
+            self.assertIn(removed, changes)
+            self.assertFalse(any(change.path.endswith('.hidden.txt') for change in changes))
+        finally:
+            watcher.stop()
+        self.assertFalse(watcher.is_running())
+
+    def test_polling_watcher_reports_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._check_watcher_changes(PollingFileWatcher(temp_dir, poll_interval=0.05), temp_dir)
+
+    def test_platform_watcher_reports_changes(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self._check_watcher_changes(FileWatcherFactory.get_file_watcher(temp_dir), temp_dir)
+
+    def test_watched_loader_lists_new_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader = CorpusLoader(temp_dir, watch_files=True)
+            loader_service = loader.controller.file_loader_service
+            try:
+                self.assertEqual(loader.controller.retrieve_all_files(False), [])
+                file_path: str = os.path.join(temp_dir, 'doc.txt')
+                with open(file_path, 'w') as f:
+                    f.write('document')
+
+                end_time: float = time.monotonic() + 10.0
+                while (not loader.controller.has_file_changes()) and (time.monotonic() < end_time):
+                    time.sleep(0.02)
+                file_paths: list[str] = [ref.get_path() for ref in loader.controller.retrieve_all_files(False)]
+                self.assertEqual(file_paths, [file_path])
+            finally:
+                loader_service.stop_watching()
+
+    def test_watched_loader_follows_renamed_directory(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            old_dir: str = os.path.join(temp_dir, 'A')
+            os.mkdir(old_dir)
+            with open(os.path.join(old_dir, 'a.txt'), 'w') as f:
+                f.write('document a')
+            loader_service = FileLoaderService(temp_dir, watch_files=True)
+            try:
+                self.assertEqual(len(loader_service.get_all_files(False)), 1)
+                new_dir: str = os.path.join(temp_dir, 'B')
+                os.rename(old_dir, new_dir)
+                renamed_path: str = os.path.join(new_dir, 'a.txt')
+                end_time: float = time.monotonic() + 10.0
+                while (time.monotonic() < end_time) and \
+                        ([ref.get_path() for ref in loader_service.get_all_files(False)] != [renamed_path]):
+                    time.sleep(0.05)
+                # Files created after the rename is applied are only seen if the renamed directory is still watched
+                with open(os.path.join(new_dir, 'new.txt'), 'w') as f:
+                    f.write('document new')
+
+                expected_paths: list[str] = [renamed_path, os.path.join(new_dir, 'new.txt')]
+                file_paths: list[str] = []
+                end_time = time.monotonic() + 10.0
+                while (file_paths != expected_paths) and (time.monotonic() < end_time):
+                    time.sleep(0.05)
+                    file_paths = sorted(ref.get_path() for ref in loader_service.get_all_files(False))
+                self.assertEqual(file_paths, expected_paths)
+            finally:
+                loader_service.stop_watching()
+
+    @staticmethod
+    def _fail_watches(watcher: InotifyFileWatcher):
+        libc = watcher.libc
+        watcher.libc = mock.Mock(wraps=libc)
+        watcher.libc.inotify_add_watch.side_effect = lambda fd, path, mask: -1
+        return mock.patch('ctypes.get_errno', return_value=errno.ENOSPC)
+
+    @unittest.skipUnless(InotifyFileWatcher.is_available(), "inotify is not available")
+    def test_loader_polls_when_watch_fails_on_start(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            loader_service = FileLoaderService(temp_dir)
+            watcher = InotifyFileWatcher(temp_dir)
+            with self._fail_watches(watcher), self.assertLogs(FileWatcher.LOGGER_NAME, level='WARNING'):
+                watcher.start()
+            self.assertFalse(watcher.is_running())
+            self.assertIsInstance(watcher.watch_error, OSError)
+
+            loader_service.file_watcher = watcher
+            loader_service.directory_index.set_watched(True)
+            self.assertEqual(loader_service.get_all_files(False), [])
+            self.assertFalse(loader_service.directory_index.watched)
+            file_path: str = os.path.join(temp_dir, 'doc.txt')
+            with open(file_path, 'w') as f:
+                f.write('document')
+            self.assertTrue(loader_service.has_file_changes())
+            self.assertEqual([ref.get_path() for ref in loader_service.get_all_files(False)], [file_path])
+
+    @unittest.skipUnless(InotifyFileWatcher.is_available(), "inotify is not available")
+    def test_watch_failure_while_running_requests_rescan(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            watcher = InotifyFileWatcher(temp_dir)
+            watcher.start()
+            try:
+                with self._fail_watches(watcher), self.assertLogs(FileWatcher.LOGGER_NAME, level='WARNING'):
+                    os.mkdir(os.path.join(temp_dir, 'subdir'))
+                    rescan = FileChange(temp_dir, FileChangeType.MODIFIED, is_dir=True)
+                    self.assertIn(rescan, self._wait_for_changes(watcher, {rescan}))
+                    watcher.thread.join(10.0)
+                self.assertFalse(watcher.is_running())
+            finally:
+                watcher.stop()
+
+
 if __name__ == '__main__':
     unittest.main()